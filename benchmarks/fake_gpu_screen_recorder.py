@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Stand-in for gpu-screen-recorder used by the benchmarks.
+
+Behaviour is configured through environment variables:
+    FAKE_GSR_MONITORS        Monitors listed by --list-capture-options (default 2)
+    FAKE_GSR_AUDIO_DEVICES   Devices listed by --list-audio-devices (default 4)
+    FAKE_GSR_APPS            Apps listed by --list-application-audio (default 4)
+    FAKE_GSR_PROBE_MS        Delay before answering a --list-* probe (default 0)
+    FAKE_GSR_LINE_RATE       Extra verbose lines per second while recording (default 0)
+    FAKE_GSR_STARTUP_MS      Delay before the first output (default 0)
+    FAKE_GSR_SAVE_MS         Delay between SIGUSR1 and the replay file (default 0)
+    FAKE_GSR_SAVE_BYTES      Size of a saved replay (default 1 MiB)
+    FAKE_GSR_SAVE_WRITE_MS   Time spent writing a saved replay before printing its path (default 0)
+    FAKE_GSR_BITRATE_KBPS    Growth rate of a regular recording (default 8000)
+    FAKE_GSR_FINALIZE_MS     Time spent finalizing after SIGTERM (default 0)
+    FAKE_GSR_CRASH_AFTER_MS  Exit with status 1 after this long (default never)
+"""
+
+import os
+import signal
+import struct
+import sys
+import time
+
+def env_int(name, default):
+    return int(os.environ.get(name, default))
+
+def mp4_header(duration, width=1920, height=1080):
+    """ftyp and a moov with just enough (mvhd, tkhd) for a probe to read"""
+    def box(kind, body):
+        return struct.pack(">I4s", 8 + len(body), kind) + body
+    mvhd = struct.pack(">4xIIII", 0, 0, 1000, int(duration * 1000)) + bytes(80)
+    tkhd = struct.pack(">IIII4xI8x8x36xII", 3, 0, 0, 1, int(duration * 1000), width << 16, height << 16)
+    return box(b"ftyp", b"isom\0\0\2\0isom") + box(b"moov", box(b"mvhd", mvhd) + box(b"trak", box(b"tkhd", tkhd)))
+
+def list_probe(kind):
+    time.sleep(env_int("FAKE_GSR_PROBE_MS", 0) / 1000)
+    if kind == "--list-capture-options":
+        for i in range(env_int("FAKE_GSR_MONITORS", 2)):
+            print(f"DP-{i + 1}|1920x1080")
+    elif kind == "--list-audio-devices":
+        for i in range(env_int("FAKE_GSR_AUDIO_DEVICES", 4)):
+            print(f"alsa_output.fake{i}.analog-stereo|Fake Output {i}")
+    elif kind == "--list-application-audio":
+        for i in range(env_int("FAKE_GSR_APPS", 4)):
+            print(f"fake-app-{i}")
+
+def parse_args(argv):
+    options = {}
+    i = 0
+    while i < len(argv):
+        if argv[i].startswith("-") and i + 1 < len(argv):
+            options[argv[i]] = argv[i + 1]
+            i += 2
+        else:
+            i += 1
+    return options
+
+class FakeRecorder:
+    def __init__(self, options):
+        self.options = options
+        self.fps = int(options.get("-f", 60))
+        self.verbose = options.get("-v", "yes") == "yes"
+        self.replay = "-r" in options
+        self.container = options.get("-c", "mp4")
+        self.output = options.get("-o", "")
+        self.paused = False
+        self.running = True
+        self.save_requests = []
+
+        signal.signal(signal.SIGUSR1, lambda *args: self.save_requests.append(time.monotonic()))
+        signal.signal(signal.SIGUSR2, self.toggle_pause)
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+
+    def toggle_pause(self, *args):
+        self.paused = not self.paused
+
+    def stop(self, *args):
+        self.running = False
+
+    def save_replay(self):
+        directory = self.output
+        if self.options.get("-df") == "yes":
+            directory = os.path.join(directory, time.strftime("%Y-%m-%d"))
+            os.makedirs(directory, exist_ok=True)
+        name = f"Replay_{time.strftime('%Y-%m-%d_%H-%M-%S')}_{time.time_ns() % 1000000:06d}.{self.container}"
+        path = os.path.join(directory, name)
+        header = mp4_header(float(self.options.get("-r", 30))) if self.container == "mp4" else b""
+        size = max(0, env_int("FAKE_GSR_SAVE_BYTES", 1024 * 1024) - len(header))
+        chunks = 10
+        write_delay = env_int("FAKE_GSR_SAVE_WRITE_MS", 0) / 1000 / chunks
+        with open(path, "wb") as f:
+            f.write(header)
+            for _ in range(chunks):
+                f.write(b"\0" * (size // chunks))
+                f.flush()
+                time.sleep(write_delay)
+        print(path, flush=True)
+
+    def run(self):
+        time.sleep(env_int("FAKE_GSR_STARTUP_MS", 0) / 1000)
+        line_rate = env_int("FAKE_GSR_LINE_RATE", 0)
+        save_delay = env_int("FAKE_GSR_SAVE_MS", 0) / 1000
+        crash_after = env_int("FAKE_GSR_CRASH_AFTER_MS", 0) / 1000
+        bytes_per_second = env_int("FAKE_GSR_BITRATE_KBPS", 8000) * 1000 // 8
+
+        recording = None
+        if not self.replay and self.output:
+            recording = open(self.output, "wb")
+
+        if self.verbose:
+            print(f"gsr info: fake recorder started, pid {os.getpid()}", file=sys.stderr, flush=True)
+
+        started = time.monotonic()
+        last_fps = started
+        last_tick = started
+        lines_sent = 0
+        while self.running:
+            now = time.monotonic()
+            if crash_after and now - started >= crash_after:
+                print("gsr error: fake crash", file=sys.stderr, flush=True)
+                sys.exit(1)
+
+            while self.save_requests and now - self.save_requests[0] >= save_delay:
+                self.save_requests.pop(0)
+                if self.replay:
+                    self.save_replay()
+
+            if recording and not self.paused:
+                recording.write(b"\0" * int(bytes_per_second * (now - last_tick)))
+                recording.flush()
+            last_tick = now
+
+            if self.verbose and now - last_fps >= 1.0:
+                last_fps = now
+                fps = 0 if self.paused else self.fps
+                print(f"update fps: {fps}, damage fps: {fps}", file=sys.stderr, flush=True)
+
+            if line_rate:
+                due = int((now - started) * line_rate)
+                if due > lines_sent:
+                    sys.stderr.write("".join(
+                        f"gsr debug: filler line {n}\n" for n in range(lines_sent, due)
+                    ))
+                    sys.stderr.flush()
+                    lines_sent = due
+
+            time.sleep(0.005)
+
+        time.sleep(env_int("FAKE_GSR_FINALIZE_MS", 0) / 1000)
+        if recording:
+            recording.close()
+
+def main():
+    argv = sys.argv[1:]
+    if argv and argv[0].startswith("--list-"):
+        list_probe(argv[0])
+        return
+    FakeRecorder(parse_args(argv)).run()
+
+if __name__ == "__main__":
+    main()
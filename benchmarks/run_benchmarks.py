@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Benchmarks for the GPU Screen Recorder GUI's own overhead.
+
+Runs headless (offscreen Qt platform) against fake_gpu_screen_recorder.py,
+which is put on PATH as gpu-screen-recorder, with a throwaway config
+directory so real settings are never touched.
+
+Usage:
+    python benchmarks/run_benchmarks.py [--repeat N] [--devices N]
+                                        [--lines N] [--saves N] [--clips N]
+                                        [--presses N] [--json FILE]
+"""
+
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+STUB = os.path.join(ROOT, "benchmarks", "fake_gpu_screen_recorder.py")
+
+def setup_environment(workdir):
+    """Put the stub on PATH and isolate Qt settings, before Qt is imported"""
+    bin_dir = os.path.join(workdir, "bin")
+    os.makedirs(bin_dir)
+    os.symlink(STUB, os.path.join(bin_dir, "gpu-screen-recorder"))
+    os.environ["PATH"] = bin_dir + os.pathsep + os.environ.get("PATH", "")
+    os.environ["XDG_CONFIG_HOME"] = os.path.join(workdir, "config")
+    os.environ["XDG_RUNTIME_DIR"] = workdir
+    os.environ["QT_QPA_PLATFORM"] = "offscreen"
+    sys.path.insert(0, ROOT)
+
+def wait_for(app, predicate, timeout=10.0):
+    """Spin the event loop until predicate() is true"""
+    from PyQt6.QtCore import QEventLoop
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            raise TimeoutError("benchmark condition not reached")
+        app.processEvents(QEventLoop.ProcessEventsFlag.AllEvents, 5)
+        time.sleep(0.0005)
+
+def summarize(samples_ms):
+    return {
+        "runs": len(samples_ms),
+        "median_ms": round(statistics.median(samples_ms), 3),
+        "min_ms": round(min(samples_ms), 3),
+        "max_ms": round(max(samples_ms), 3),
+    }
+
+def bench_startup(repeat):
+    """Fresh interpreter: imports, window construction and first paint"""
+    script = (
+        "import sys, time; t0 = time.perf_counter();"
+        "from PyQt6.QtWidgets import QApplication;"
+        "app = QApplication(sys.argv);"
+        "app.setOrganizationName('GPUScreenRecorderBench'); app.setApplicationName('bench');"
+        "from src.MainWindow import GPUScreenRecorderGUI;"
+        "w = GPUScreenRecorderGUI(); w.show(); app.processEvents();"
+        "print((time.perf_counter() - t0) * 1000)"
+    )
+    samples = []
+    for _ in range(repeat):
+        result = subprocess.run(
+            [sys.executable, "-c", script], cwd=ROOT,
+            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True, check=True
+        )
+        samples.append(float(result.stdout.strip().splitlines()[-1]))
+    return summarize(samples)
+
+def bench_build_command(window, repeat):
+    """The main window's command for the current settings"""
+    loops = 200
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(loops):
+            window.build_command()
+        samples.append((time.perf_counter() - start) * 1000 / loops)
+    return summarize(samples)
+
+def bench_config_argv(repeat):
+    """RecorderConfig.to_argv without Qt: rebuilt after a change, and cached"""
+    from src.RecorderConfig import RecorderConfig
+    loops = 10000
+    config = RecorderConfig()
+    rebuilt = []
+    cached = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for i in range(loops):
+            config.fps = 30 + i % 2
+            config.to_argv()
+        rebuilt.append((time.perf_counter() - start) * 1000 / loops)
+        start = time.perf_counter()
+        for _ in range(loops):
+            config.to_argv()
+        cached.append((time.perf_counter() - start) * 1000 / loops)
+    return {
+        "rebuilt_us": round(statistics.median(rebuilt) * 1000, 3),
+        "cached_us": round(statistics.median(cached) * 1000, 3),
+    }
+
+def bench_log_ingestion(app, window, lines):
+    """Recorder lines through framing, metrics, batching and the log view"""
+    from src.RecorderProcess import LineFramer
+
+    # Mostly chatter, with the periodic fps line the metrics parser picks up
+    payload = "".join(
+        "update fps: 60, damage fps: 60\n" if i % 100 == 0 else f"gsr debug: verbose line {i} ä€\n"
+        for i in range(lines)
+    ).encode()
+    chunks = [payload[i:i + 4096] for i in range(0, len(payload), 4096)]
+    model = window.log_tab.log_model
+    model.clear()
+    framer = LineFramer()
+
+    start = time.perf_counter()
+    delivered = 0
+    for chunk in chunks:
+        for line in framer.feed(chunk):
+            window.on_recorder_line("stderr", line, time.monotonic_ns())
+            delivered += 1
+    window.log_batcher.flush()
+    wait_for(app, lambda: model.rowCount() >= min(lines, model.max_lines))
+    elapsed = time.perf_counter() - start
+    return {
+        "lines": delivered,
+        "elapsed_ms": round(elapsed * 1000, 3),
+        "lines_per_second": round(delivered / elapsed),
+    }
+
+def bench_discovery(app, window, repeat):
+    """Forced refresh of all --list-* probes"""
+    tab = window.record_tab
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        tab.refresh_capture_sources()
+        tab.refresh_audio_sources()
+        wait_for(app, lambda: not tab.discovery.is_running())
+        samples.append((time.perf_counter() - start) * 1000)
+    return summarize(samples)
+
+def bench_save_replay(app, window, saves, output_dir):
+    """Save Replay request until the clip is on disk, through the stub"""
+    window.replay_tab.enable_replay_checkbox.setChecked(True)
+    window.replay_tab.output_dir_edit.setText(output_dir)
+    window.start_recording()
+    wait_for(app, lambda: window.recorder.process.state().name == "Running")
+    time.sleep(0.2)
+
+    tracker = window.save_tracker
+    tracker.histogram.clear()
+    for i in range(saves):
+        window.save_replay("benchmark")
+        wait_for(app, lambda: tracker.histogram.total > i)
+
+    window.stop_recording()
+    wait_for(app, lambda: window.recorder.process.state().name == "NotRunning")
+    return tracker.histogram.summary()
+
+def bench_shortcuts(app, window, presses, output_dir):
+    """
+    Save Replay shortcut to completed action, with the replay buffer running
+    and the recorder logging 2000 lines a second. Every press is followed by
+    a repeat, which the cooldown must drop.
+    """
+    os.environ["FAKE_GSR_LINE_RATE"] = "2000"
+    window.replay_tab.enable_replay_checkbox.setChecked(True)
+    window.replay_tab.output_dir_edit.setText(output_dir)
+    window.start_recording()
+    wait_for(app, lambda: window.recorder.process.state().name == "Running")
+    time.sleep(0.2)
+
+    dispatcher = window.shortcut_dispatcher
+    dispatcher.add("save_replay", lambda: window.save_replay("benchmark"), cooldown_ms=100)
+    histogram = dispatcher.histograms["save_replay"]
+    histogram.clear()
+    dropped = dispatcher.drops["save_replay"]
+    for i in range(presses):
+        dispatcher.trigger("save_replay")
+        dispatcher.trigger("save_replay")  # Key repeat
+        wait_for(app, lambda: histogram.total > i)
+        time.sleep(0.11)
+
+    window.stop_recording()
+    wait_for(app, lambda: window.recorder.process.state().name == "NotRunning")
+    os.environ.pop("FAKE_GSR_LINE_RATE")
+    frame_ms = 1000 / window.config.fps
+    summary = histogram.summary()
+    summary["repeats_dropped"] = dispatcher.drops["save_replay"] - dropped
+    summary["frame_ms"] = round(frame_ms, 3)
+    summary["within_frame"] = round(dispatcher.within(frame_ms), 3)
+    return summary
+
+def bench_library_scan(app, clips, workdir):
+    """Replay library: first index of a tree of date folders, a rescan with nothing changed, one page"""
+    from src.ReplayLibrary import ReplayLibrary
+    root = os.path.join(workdir, "library")
+    per_folder = 250
+    for i in range(clips):
+        folder = os.path.join(root, f"2025-{i // per_folder:04d}")
+        if i % per_folder == 0:
+            os.makedirs(folder)
+        open(os.path.join(folder, f"Replay_{i:06d}.mp4"), "wb").close()
+
+    library = ReplayLibrary(db_path=os.path.join(workdir, "library.sqlite"))
+    passes = []
+    library.scan_finished.connect(passes.append)
+    library.set_roots([root])
+    wait_for(app, lambda: passes, timeout=120.0)
+    library.scan()
+    wait_for(app, lambda: len(passes) > 1)
+    start = time.perf_counter()
+    library.page(clips // 2, 200, "name", False)
+    page_ms = (time.perf_counter() - start) * 1000
+    library.close()
+    return {
+        "clips": clips,
+        "first_scan_ms": round(passes[0], 3),
+        "rescan_ms": round(passes[1], 3),
+        "page_ms": round(page_ms, 3),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per timed benchmark")
+    parser.add_argument("--devices", type=int, default=200, help="Synthetic devices per --list-* probe")
+    parser.add_argument("--lines", type=int, default=100000, help="Log lines to ingest")
+    parser.add_argument("--saves", type=int, default=20, help="Save Replay round trips")
+    parser.add_argument("--clips", type=int, default=20000, help="Clips in the replay library benchmark")
+    parser.add_argument("--presses", type=int, default=50, help="Save Replay shortcut presses")
+    parser.add_argument("--json", help="Write results to this file")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="gsr-bench-")
+    try:
+        setup_environment(workdir)
+        os.environ["FAKE_GSR_MONITORS"] = str(args.devices)
+        os.environ["FAKE_GSR_AUDIO_DEVICES"] = str(args.devices)
+        os.environ["FAKE_GSR_APPS"] = str(args.devices)
+
+        from PyQt6.QtWidgets import QApplication
+        app = QApplication(sys.argv)
+        app.setOrganizationName("GPUScreenRecorderBench")
+        app.setApplicationName("bench")
+
+        results = {"startup": bench_startup(args.repeat)}
+
+        from src.MainWindow import GPUScreenRecorderGUI
+        window = GPUScreenRecorderGUI()
+        window.show()
+        app.processEvents()
+
+        replay_dir = os.path.join(workdir, "replays")
+        os.makedirs(replay_dir)
+        window.replay_tab.enable_replay_checkbox.setChecked(True)
+        window.replay_tab.output_dir_edit.setText(replay_dir)
+
+        results["config_argv"] = bench_config_argv(args.repeat)
+        results["build_command"] = bench_build_command(window, args.repeat)
+        results["log_ingestion"] = bench_log_ingestion(app, window, args.lines)
+        results["discovery_refresh"] = bench_discovery(app, window, args.repeat)
+        results["save_replay"] = bench_save_replay(app, window, args.saves, replay_dir)
+        results["shortcuts"] = bench_shortcuts(app, window, args.presses, replay_dir)
+        results["library_scan"] = bench_library_scan(app, args.clips, workdir)
+
+        for name, result in results.items():
+            print(f"{name}:")
+            for key, value in result.items():
+                if key != "buckets":
+                    print(f"    {key}: {value}")
+
+        if args.json:
+            with open(args.json, "w") as f:
+                json.dump(results, f, indent=2)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import time
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+
+from .RecorderMetrics import TimeSeries
+
+class BitrateSampler(QObject):
+    """
+    Measures the bitrate the encoder actually produces.
+
+    A regular recording is sampled with one os.stat of the output file per
+    interval_ms: the growth since the last sample is the instantaneous
+    bitrate, the size over the time since start the average. A replay
+    buffer only writes when a clip is saved, so each saved clip gives one
+    sample instead (its size over the replay length).
+
+    inotify is not used: it reports every write the recorder makes, far
+    more often than the one stat a second this needs, and saved clips are
+    already reported by the SaveQueue.
+
+    Both rates, in kbps, go into fixed-size TimeSeries.
+    """
+
+    sampled = pyqtSignal(dict)  # The latest sample
+
+    def __init__(self, interval_ms=1000, capacity=120, parent=None):
+        super().__init__(parent)
+        self.instant = TimeSeries(capacity)
+        self.average = TimeSeries(capacity)
+
+        self.timer = QTimer(self)
+        self.timer.setInterval(interval_ms)
+        self.timer.timeout.connect(self.sample)
+
+        self.path = None
+        self.replay_mode = False
+        self.clip_seconds = 0
+        self.reset()
+
+    def reset(self):
+        self.instant.clear()
+        self.average.clear()
+        self.started = time.monotonic_ns()
+        self.size = None
+        self.last_size = None
+        self.last_time = None
+        self.clips = 0
+        self.clip_bytes = None  # Size of the last saved clip
+        self.total_bytes = 0  # Every saved clip together
+
+    def start(self, path, replay_mode=False, clip_seconds=0):
+        """
+        Start measuring a recording.
+
+        Args:
+            path (str): Output file, or the replay output directory
+            replay_mode (bool): Whether the recorder runs a replay buffer
+            clip_seconds (int): Length of a saved replay
+        """
+        self.reset()
+        self.path = path
+        self.replay_mode = replay_mode
+        self.clip_seconds = clip_seconds
+        if not replay_mode:
+            self.timer.start()
+
+    def stop(self):
+        self.timer.stop()
+
+    def clip_saved(self, path):
+        """Take a sample from a replay that was just saved"""
+        if not self.replay_mode or self.clip_seconds <= 0:
+            return
+        try:
+            size = os.path.getsize(path)
+        except OSError:
+            return
+        now = time.monotonic_ns()
+        self.clips += 1
+        self.clip_bytes = size
+        self.total_bytes += size
+        self.instant.append(now, size / self.clip_seconds / 125)
+        self.average.append(now, self.total_bytes / (self.clips * self.clip_seconds) / 125)
+        self._emit(path)
+
+    def sample(self):
+        """Stat the output file and add a sample if it has grown"""
+        if self.path is None or self.replay_mode:
+            return
+        try:
+            size = os.path.getsize(self.path)
+        except OSError:
+            # Not created yet
+            return
+        now = time.monotonic_ns()
+        self.size = size
+        if self.last_size is not None and now > self.last_time:
+            self.instant.append(now, max(0, size - self.last_size) / ((now - self.last_time) / 1e9) / 125)
+            self.average.append(now, size / ((now - self.started) / 1e9) / 125)
+            self._emit(self.path)
+        self.last_size = size
+        self.last_time = now
+
+    def snapshot(self):
+        """The latest rates as a plain dict"""
+        return {
+            "path": self.path,
+            "instant_kbps": self.instant.last(),
+            "average_kbps": self.average.last(),
+            "peak_kbps": max(self.instant.values(), default=None),
+            "size_bytes": self.size,
+            "clips": self.clips,
+            "clip_bytes": self.clip_bytes,
+        }
+
+    def _emit(self, path):
+        sample = self.snapshot()
+        sample["path"] = path
+        self.sampled.emit(sample)
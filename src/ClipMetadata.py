@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Metadata and thumbnail extractors for saved clips.
+
+Everything here runs inside worker processes, so this module must not
+import Qt. An extractor has a name, probe(path) returning a metadata dict
+(duration in seconds, width, height, codecs; missing keys are unknown),
+thumbnail(path, output, width) returning True once it wrote a JPEG, and
+makes_thumbnails telling whether thumbnail() can ever succeed.
+"""
+
+import json
+import os
+import shutil
+import struct
+import subprocess
+import time
+
+class FFmpegExtractor:
+    """Probes with ffprobe and grabs a frame with ffmpeg"""
+
+    name = "ffmpeg"
+    makes_thumbnails = True
+
+    def __init__(self, timeout=30):
+        self.timeout = timeout
+
+    @staticmethod
+    def available():
+        return shutil.which("ffprobe") is not None and shutil.which("ffmpeg") is not None
+
+    def probe(self, path):
+        result = subprocess.run(
+            ["ffprobe", "-v", "error", "-print_format", "json",
+             "-show_entries", "format=duration:stream=codec_type,codec_name,width,height", path],
+            capture_output=True, text=True, timeout=self.timeout
+        )
+        if result.returncode != 0:
+            raise RuntimeError(result.stderr.strip() or f"ffprobe exited with {result.returncode}")
+        info = json.loads(result.stdout)
+        metadata = {}
+        duration = info.get("format", {}).get("duration")
+        if duration not in (None, "N/A"):
+            metadata["duration"] = float(duration)
+        for stream in info.get("streams", []):
+            if stream.get("codec_type") == "video" and "width" not in metadata:
+                metadata.update(width=stream.get("width"), height=stream.get("height"),
+                                video_codec=stream.get("codec_name"))
+            elif stream.get("codec_type") == "audio" and "audio_codec" not in metadata:
+                metadata["audio_codec"] = stream.get("codec_name")
+        return metadata
+
+    def thumbnail(self, path, output, width, at=None):
+        # Seeking before -i jumps straight to the nearest keyframe
+        result = subprocess.run(
+            ["ffmpeg", "-v", "error", "-ss", str(at or 1.0), "-i", path, "-frames:v", "1",
+             "-vf", f"scale={width}:-2", "-y", output],
+            capture_output=True, text=True, timeout=self.timeout
+        )
+        if result.returncode != 0 and at is None:
+            # Shorter than a second
+            return self.thumbnail(path, output, width, at=0)
+        return result.returncode == 0 and os.path.exists(output)
+
+class PythonExtractor:
+    """
+    Reads duration and resolution straight from MP4 and Matroska/WebM
+    headers without any external tool. It cannot decode video, so it never
+    makes thumbnails; it stands in when ffmpeg is not installed.
+    """
+
+    name = "python"
+    makes_thumbnails = False
+
+    @staticmethod
+    def available():
+        return True
+
+    def probe(self, path):
+        with open(path, "rb") as f:
+            head = f.read(8)
+            f.seek(0)
+            if head[4:8] == b"ftyp":
+                return read_mp4(f)
+            if head[:4] == b"\x1a\x45\xdf\xa3":
+                return read_matroska(f)
+        raise ValueError("Unsupported container")
+
+    def thumbnail(self, path, output, width):
+        return False
+
+EXTRACTORS = {
+    "ffmpeg": FFmpegExtractor,
+    "python": PythonExtractor,
+}
+
+def get_extractor(name="auto"):
+    """
+    Pick an extractor by name, or the best one installed for "auto".
+
+    Raises:
+        ValueError: If the name is unknown
+    """
+    if name == "auto":
+        return FFmpegExtractor() if FFmpegExtractor.available() else PythonExtractor()
+    if name not in EXTRACTORS:
+        raise ValueError(f"Unknown extractor: {name}")
+    return EXTRACTORS[name]()
+
+def lower_priority():
+    """Worker initializer: stay out of the way of a running game"""
+    try:
+        os.nice(10)
+    except OSError:
+        pass
+
+def extract(extractor, path, thumbnail_path=None, width=320):
+    """
+    Worker entry point: probe a clip and optionally make its thumbnail.
+
+    Returns:
+        dict: path, metadata, thumbnail (bool), elapsed_ms and error (str or None)
+    """
+    start = time.perf_counter()
+    result = {"path": path, "metadata": {}, "thumbnail": False, "error": None}
+    try:
+        result["metadata"] = extractor.probe(path)
+        if thumbnail_path:
+            result["thumbnail"] = extractor.thumbnail(path, thumbnail_path, width)
+    except Exception as e:
+        result["error"] = f"{type(e).__name__}: {e}"
+    result["elapsed_ms"] = (time.perf_counter() - start) * 1000
+    return result
+
+# MP4: the moov box holds mvhd (movie duration) and one tkhd per track
+
+def _mp4_boxes(f, end):
+    while f.tell() + 8 <= end:
+        start = f.tell()
+        size, kind = struct.unpack(">I4s", f.read(8))
+        header = 8
+        if size == 1:
+            size = struct.unpack(">Q", f.read(8))[0]
+            header = 16
+        elif size == 0:
+            size = end - start
+        if size < header:
+            return
+        yield kind, start + header, start + size
+        f.seek(start + size)
+
+def read_mp4(f):
+    f.seek(0, os.SEEK_END)
+    end = f.tell()
+    f.seek(0)
+    metadata = {}
+    for kind, body, box_end in _mp4_boxes(f, end):
+        if kind != b"moov":
+            continue
+        f.seek(body)
+        for child, child_body, child_end in _mp4_boxes(f, box_end):
+            position = f.tell()
+            if child == b"mvhd":
+                f.seek(child_body)
+                version = f.read(1)[0]
+                f.seek(child_body + (20 if version == 1 else 12))
+                if version == 1:
+                    timescale, duration = struct.unpack(">IQ", f.read(12))
+                else:
+                    timescale, duration = struct.unpack(">II", f.read(8))
+                if timescale:
+                    metadata["duration"] = duration / timescale
+            elif child == b"trak" and "width" not in metadata:
+                f.seek(child_body)
+                for grandchild, tkhd_body, _ in _mp4_boxes(f, child_end):
+                    if grandchild == b"tkhd":
+                        f.seek(tkhd_body)
+                        version = f.read(1)[0]
+                        # Width and height are 16.16 fixed point at the end of tkhd
+                        f.seek(tkhd_body + (88 if version == 1 else 76))
+                        width, height = struct.unpack(">II", f.read(8))
+                        if width:
+                            metadata["width"], metadata["height"] = width >> 16, height >> 16
+                        break
+            f.seek(position)
+        break
+    if not metadata:
+        raise ValueError("No movie header found")
+    return metadata
+
+# Matroska: Segment > Info (TimecodeScale, Duration) and Tracks > TrackEntry > Video
+
+EBML_SEGMENT = 0x18538067
+EBML_INFO = 0x1549A966
+EBML_TRACKS = 0x1654AE6B
+EBML_TRACK_ENTRY = 0xAE
+EBML_VIDEO = 0xE0
+EBML_CLUSTER = 0x1F43B675
+EBML_TIMECODE_SCALE = 0x2AD7B1
+EBML_DURATION = 0x4489
+EBML_PIXEL_WIDTH = 0xB0
+EBML_PIXEL_HEIGHT = 0xBA
+
+def _ebml_vint(f, keep_marker):
+    first = f.read(1)
+    if not first:
+        raise EOFError
+    value = first[0]
+    length = 1
+    mask = 0x80
+    while length <= 8 and not value & mask:
+        mask >>= 1
+        length += 1
+    if length > 8:
+        raise ValueError("Invalid EBML variable length integer")
+    if not keep_marker:
+        value &= mask - 1
+    unknown = value == mask - 1
+    for byte in f.read(length - 1):
+        value = (value << 8) | byte
+        unknown = unknown and byte == 0xFF
+    return value, (None if unknown and not keep_marker else value)
+
+def _ebml_elements(f, end):
+    while f.tell() < end:
+        try:
+            element_id, _ = _ebml_vint(f, True)
+            _, size = _ebml_vint(f, False)
+        except EOFError:
+            return
+        body = f.tell()
+        yield element_id, body, end if size is None else min(body + size, end)
+
+def _ebml_uint(f, body, end):
+    f.seek(body)
+    return int.from_bytes(f.read(end - body), "big")
+
+def read_matroska(f):
+    f.seek(0, os.SEEK_END)
+    end = f.tell()
+    f.seek(0)
+    metadata = {}
+    scale = 1000000
+    duration = None
+    for element_id, body, element_end in _ebml_elements(f, end):
+        if element_id != EBML_SEGMENT:
+            f.seek(element_end)
+            continue
+        for child_id, child_body, child_end in _ebml_elements(f, element_end):
+            if child_id == EBML_CLUSTER:
+                break  # Headers come before the media data
+            if child_id == EBML_INFO:
+                for info_id, info_body, info_end in _ebml_elements(f, child_end):
+                    if info_id == EBML_TIMECODE_SCALE:
+                        scale = _ebml_uint(f, info_body, info_end)
+                    elif info_id == EBML_DURATION:
+                        f.seek(info_body)
+                        raw = f.read(info_end - info_body)
+                        duration = struct.unpack(">f" if len(raw) == 4 else ">d", raw)[0]
+                    f.seek(info_end)
+            elif child_id == EBML_TRACKS:
+                for entry_id, entry_body, entry_end in _ebml_elements(f, child_end):
+                    if entry_id == EBML_TRACK_ENTRY and "width" not in metadata:
+                        for track_id, track_body, track_end in _ebml_elements(f, entry_end):
+                            if track_id == EBML_VIDEO:
+                                for video_id, video_body, video_end in _ebml_elements(f, track_end):
+                                    if video_id == EBML_PIXEL_WIDTH:
+                                        metadata["width"] = _ebml_uint(f, video_body, video_end)
+                                    elif video_id == EBML_PIXEL_HEIGHT:
+                                        metadata["height"] = _ebml_uint(f, video_body, video_end)
+                                    f.seek(video_end)
+                            f.seek(track_end)
+                    f.seek(entry_end)
+            f.seek(child_end)
+        break
+    if duration is not None:
+        metadata["duration"] = duration * scale / 1e9
+    if not metadata:
+        raise ValueError("No segment info found")
+    return metadata
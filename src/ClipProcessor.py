@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import hashlib
+import json
+import multiprocessing
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from PyQt6.QtCore import QObject, QTimer, QStandardPaths, pyqtSignal
+
+from .ClipMetadata import get_extractor, extract, lower_priority
+from .LatencyHistogram import LatencyHistogram
+
+def default_cache_dir():
+    directory = QStandardPaths.writableLocation(QStandardPaths.StandardLocation.CacheLocation)
+    if not directory:
+        directory = os.path.join(os.path.expanduser("~"), ".cache", "gpu-screen-recorder")
+    return os.path.join(directory, "thumbnails")
+
+class ThumbnailCache:
+    """
+    On-disk cache of clip metadata (.json) and thumbnails (.jpg), keyed by
+    path and mtime so a rewritten clip is never served stale data. Entries
+    are touched on every hit and the least recently used are evicted once
+    the cache grows past max_bytes, so it survives restarts as an LRU.
+    """
+
+    def __init__(self, directory=None, max_bytes=256 * 1024 * 1024):
+        self.directory = directory or default_cache_dir()
+        self.max_bytes = max_bytes
+        os.makedirs(self.directory, exist_ok=True)
+        self.total = None  # Bytes on disk, counted on first write
+
+    def key(self, path, mtime_ns):
+        return hashlib.sha1(f"{path}\0{mtime_ns}".encode("utf-8", "surrogateescape")).hexdigest()
+
+    def paths(self, key):
+        base = os.path.join(self.directory, key)
+        return base + ".json", base + ".jpg"
+
+    def get(self, path, mtime_ns):
+        """
+        Look up a clip.
+
+        Returns:
+            tuple: (metadata dict, thumbnail path or None), or None on a miss
+        """
+        metadata_path, thumbnail_path = self.paths(self.key(path, mtime_ns))
+        try:
+            with open(metadata_path) as f:
+                metadata = json.load(f)
+        except (OSError, ValueError):
+            return None
+        has_thumbnail = os.path.exists(thumbnail_path)
+        try:
+            os.utime(metadata_path)
+            if has_thumbnail:
+                os.utime(thumbnail_path)
+        except OSError:
+            pass
+        return metadata, thumbnail_path if has_thumbnail else None
+
+    def put(self, key, metadata):
+        metadata_path, thumbnail_path = self.paths(key)
+        with open(metadata_path, "w") as f:
+            json.dump(metadata, f)
+        if self.total is None:
+            self.total = sum(entry.stat().st_size for entry in os.scandir(self.directory))
+        else:
+            self.total += os.path.getsize(metadata_path)
+            if os.path.exists(thumbnail_path):
+                self.total += os.path.getsize(thumbnail_path)
+        if self.total > self.max_bytes:
+            self.evict()
+
+    def evict(self):
+        """Drop least recently used files until the cache is 10% under its limit"""
+        entries = []
+        for entry in os.scandir(self.directory):
+            try:
+                st = entry.stat()
+            except OSError:
+                continue
+            entries.append((st.st_mtime_ns, st.st_size, entry.path))
+        entries.sort()
+        self.total = sum(size for _, size, _ in entries)
+        target = self.max_bytes * 0.9
+        for _, size, path in entries:
+            if self.total <= target:
+                break
+            try:
+                os.remove(path)
+                self.total -= size
+            except OSError:
+                pass
+
+class ClipProcessor(QObject):
+    """
+    Post-save stage that probes clips and makes their thumbnails in a small
+    pool of worker processes (niced, so they stay out of a game's way).
+    Requests are queued and at most two per worker are in flight; the most
+    urgent (e.g. rows on screen) jump the queue. Results are cached on disk
+    and handed back through signals, so nothing that browses clips ever
+    waits on a decoder.
+    """
+
+    processed = pyqtSignal(str, dict)  # Clip path, metadata (with "thumbnail" path or None)
+    failed = pyqtSignal(str, str)  # Clip path, error
+
+    def __init__(self, extractor="auto", workers=2, cache=None, thumbnail_width=320,
+                 poll_interval=50, parent=None):
+        super().__init__(parent)
+        self.extractor = get_extractor(extractor) if isinstance(extractor, str) else extractor
+        self.workers = workers
+        self.cache = cache or ThumbnailCache()
+        self.thumbnail_width = thumbnail_width
+        self.executor = None  # Started with the first job
+
+        self.queue = deque()
+        self.queued = set()
+        self.in_flight = {}  # Future -> (path, cache key)
+        self.failures = set()  # Cache keys that failed, not retried this run
+        self.times = LatencyHistogram()
+
+        self.poll_timer = QTimer(self)
+        self.poll_timer.setInterval(poll_interval)
+        self.poll_timer.timeout.connect(self.poll)
+
+    def cached(self, path):
+        """
+        Cached result for a clip, without starting any work.
+
+        Returns:
+            dict: Metadata with a "thumbnail" key, or None if not processed yet
+        """
+        try:
+            mtime_ns = os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+        hit = self.cache.get(path, mtime_ns)
+        if hit is None:
+            return None
+        metadata, thumbnail = hit
+        return dict(metadata, thumbnail=thumbnail)
+
+    def request(self, path, urgent=False):
+        """
+        Queue a clip for processing unless it is cached, queued or running.
+
+        Args:
+            path (str): Clip to process
+            urgent (bool): Put it at the front of the queue
+        """
+        if path in self.queued:
+            if urgent:
+                self.queue.remove(path)
+                self.queue.appendleft(path)
+            return
+        if any(job_path == path for job_path, _ in self.in_flight.values()):
+            return
+        self.queued.add(path)
+        if urgent:
+            self.queue.appendleft(path)
+        else:
+            self.queue.append(path)
+        self._dispatch()
+
+    def pending(self):
+        return len(self.queue) + len(self.in_flight)
+
+    def poll(self):
+        for future in [future for future in self.in_flight if future.done()]:
+            path, key = self.in_flight.pop(future)
+            try:
+                result = future.result()
+            except Exception as e:
+                result = {"path": path, "metadata": {}, "thumbnail": False, "error": str(e), "elapsed_ms": 0}
+            self._finish(path, key, result)
+        self._dispatch()
+        if not self.in_flight:
+            self.poll_timer.stop()
+
+    def shutdown(self):
+        """Drop queued work and let running workers exit on their own"""
+        self.queue.clear()
+        self.queued.clear()
+        self.poll_timer.stop()
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
+
+    def _dispatch(self):
+        while self.queue and len(self.in_flight) < self.workers * 2:
+            path = self.queue.popleft()
+            self.queued.discard(path)
+            try:
+                mtime_ns = os.stat(path).st_mtime_ns
+            except OSError:
+                continue
+            key = self.cache.key(path, mtime_ns)
+            if key in self.failures:
+                continue
+            hit = self.cache.get(path, mtime_ns)
+            if hit is not None:
+                self.processed.emit(path, dict(hit[0], thumbnail=hit[1]))
+                continue
+            if self.executor is None:
+                # Spawned rather than forked, a fork of a running Qt app is not safe
+                self.executor = ProcessPoolExecutor(
+                    self.workers, mp_context=multiprocessing.get_context("spawn"), initializer=lower_priority
+                )
+            thumbnail_path = self.cache.paths(key)[1]
+            future = self.executor.submit(extract, self.extractor, path, thumbnail_path, self.thumbnail_width)
+            self.in_flight[future] = (path, key)
+        if self.in_flight and not self.poll_timer.isActive():
+            self.poll_timer.start()
+
+    def _finish(self, path, key, result):
+        self.times.add(int(result["elapsed_ms"] * 1e6))
+        if result["error"]:
+            self.failures.add(key)
+            self.failed.emit(path, result["error"])
+            return
+        metadata = dict(result["metadata"], extractor=self.extractor.name)
+        try:
+            self.cache.put(key, metadata)
+        except OSError as e:
+            print(f"Error caching clip metadata: {e}")
+        thumbnail = self.cache.paths(key)[1] if result["thumbnail"] else None
+        self.processed.emit(path, dict(metadata, thumbnail=thumbnail))
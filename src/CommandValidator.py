@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+
+# Flags where a later value is allowed to replace an earlier one.
+# In CBR mode -q is the bitrate in kbps and overrides the quality preset.
+MERGEABLE = frozenset(("-q",))
+# Flags that may be given several times, e.g. one -a per audio track
+REPEATABLE = frozenset(("-a",))
+
+# Video codecs each container can hold ("auto" lets the recorder pick)
+CONTAINER_VIDEO_CODECS = {
+    "webm": {"auto", "vp8", "vp9", "av1", "av1_hdr", "av1_10bit"},
+    "flv": {"auto", "h264"},
+}
+# Codecs that only fit these containers
+CODEC_CONTAINERS = {
+    "vp8": {"webm", "mkv"},
+    "vp9": {"webm", "mkv"},
+}
+# Audio codec to use when the chosen one does not fit the container
+CONTAINER_AUDIO_CODECS = {
+    "webm": ("opus",),
+    "flv": ("aac",),
+}
+
+class CommandError(ValueError):
+    """Raised when a command line would make gpu-screen-recorder fail"""
+
+    def __init__(self, problems):
+        super().__init__("; ".join(problems))
+        self.problems = problems
+
+def validate_command(argv):
+    """
+    Check a gpu-screen-recorder command line before launching it.
+
+    Duplicate flags are merged when harmless (same value, or a flag in
+    MERGEABLE where the last value wins) and rejected otherwise. The output
+    location and codec/container combination are checked too.
+
+    Args:
+        argv (list): Full command line, executable first
+
+    Returns:
+        tuple: (cleaned argv, list of warning strings)
+
+    Raises:
+        CommandError: If the command cannot work
+    """
+    problems = []
+    warnings = []
+
+    # Flags and values, in order, keeping the position of the first occurrence
+    options = {}
+    repeated = []
+    args = argv[1:]
+    if len(args) % 2:
+        problems.append(f"Missing value for {args[-1]}")
+        args = args[:-1]
+    for i in range(0, len(args), 2):
+        flag, value = args[i], args[i + 1]
+        if flag in REPEATABLE and flag in options:
+            if value not in repeated and value != options[flag]:
+                repeated.append(value)
+            continue
+        if flag in options and options[flag] != value:
+            if flag in MERGEABLE:
+                warnings.append(f"{flag} {options[flag]} replaced by {flag} {value}")
+            else:
+                problems.append(f"Conflicting values for {flag}: {options[flag]} and {value}")
+                continue
+        elif flag in options:
+            warnings.append(f"Duplicate {flag} {value} dropped")
+        options[flag] = value
+
+    # Required flags
+    for flag in ("-w", "-o"):
+        if not options.get(flag):
+            problems.append(f"No {'capture source' if flag == '-w' else 'output path'} specified")
+
+    # Numbers
+    for flag, name in (("-f", "Frame rate"), ("-r", "Replay buffer size")):
+        if flag in options and not (options[flag].isdigit() and int(options[flag]) > 0):
+            problems.append(f"{name} must be a positive number, got {options[flag]}")
+
+    # Output location
+    output = options.get("-o")
+    if output:
+        problem = check_output(output, "-r" in options)
+        if problem:
+            problems.append(problem)
+
+    # Codec and container
+    container = options.get("-c") or (os.path.splitext(output or "")[1][1:].lower())
+    codec = options.get("-k", "auto")
+    allowed = CONTAINER_VIDEO_CODECS.get(container)
+    if allowed is not None and codec not in allowed:
+        problems.append(f"The {codec} codec cannot be stored in {container} files")
+    elif container and codec in CODEC_CONTAINERS and container not in CODEC_CONTAINERS[codec]:
+        problems.append(f"The {codec} codec needs a webm or mkv container, not {container}")
+
+    audio_allowed = CONTAINER_AUDIO_CODECS.get(container)
+    if audio_allowed and "-ac" in options and options["-ac"] not in audio_allowed:
+        warnings.append(f"{container} files cannot hold {options['-ac']} audio, using {audio_allowed[0]}")
+        options["-ac"] = audio_allowed[0]
+
+    if problems:
+        raise CommandError(problems)
+
+    cleaned = [argv[0]]
+    for flag, value in options.items():
+        cleaned.extend((flag, value))
+        if flag in REPEATABLE:
+            for extra in repeated:
+                cleaned.extend((flag, extra))
+    return cleaned, warnings
+
+def check_output(path, replay_mode):
+    """
+    Check the -o value can be written.
+
+    Args:
+        path (str): Output directory (replay) or file (recording)
+        replay_mode (bool): Whether path is a directory
+
+    Returns:
+        str: A description of the problem, or None if it is fine
+    """
+    if replay_mode:
+        directory = path
+        if os.path.exists(path) and not os.path.isdir(path):
+            return f"Replay output {path} is not a directory"
+    else:
+        if os.path.isdir(path):
+            return f"Output file {path} is a directory"
+        directory = os.path.dirname(path) or "."
+
+    # A missing directory is fine as long as it can be created
+    existing = directory
+    while not os.path.exists(existing):
+        parent = os.path.dirname(existing)
+        if parent == existing:
+            break
+        existing = parent
+    if not os.path.isdir(existing):
+        return f"Output directory {directory} cannot be created, {existing} is not a directory"
+    if not os.access(existing, os.W_OK | os.X_OK):
+        return f"Output directory {existing} is not writable"
+    return None
@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import json
+import os
+import tempfile
+from PyQt6.QtCore import QObject, pyqtSignal
+from PyQt6.QtNetwork import QLocalServer, QLocalSocket
+
+
+def default_socket_path():
+    """Control socket location, inside XDG_RUNTIME_DIR when available"""
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR") or tempfile.gettempdir()
+    return os.path.join(runtime_dir, f"gpu-screen-recorder-gui-{os.getuid()}.sock")
+
+class ControlServer(QObject):
+    """
+    Unix-domain socket control API for a RecorderController.
+
+    Clients send one request per line and get one JSON reply per line.
+    A request is either plain text ("save-replay", "start replay") or a JSON
+    object ({"command": "start", "mode": "replay"}). Commands:
+
+        start [replay|record]  Start recording (mode defaults to the saved setting)
+        stop                   Stop recording
+        save-replay            Save the replay buffer
+        pause                  Pause or resume
+        status                 Current recording state
+        metrics                Capture metrics and save replay latency
+        sessions               State of every extra session
+        jobs                   Post-processing job queue
+        ping                   Check the daemon is alive
+
+    Commands act on the main recorder unless a session is named, as
+    "@name" in plain text or {"session": "name"} in JSON. save-replay
+    also takes "@all" to save every running replay buffer.
+
+    A client sending more than max_line bytes without a newline gets an
+    error reply and is disconnected.
+    """
+
+    message = pyqtSignal(str)  # Log messages
+
+    def __init__(self, controller, config, socket_path=None, sessions=None, jobs=None,
+                 max_line=4096, parent=None):
+        super().__init__(parent)
+        self.controller = controller
+        self.config = config
+        self.sessions = sessions
+        self.jobs = jobs
+        self.socket_path = socket_path or default_socket_path()
+        self.buffers = {}  # socket -> bytearray of unterminated input
+        self.max_line = max_line
+
+        self.server = QLocalServer(self)
+        self.server.setSocketOptions(QLocalServer.SocketOption.UserAccessOption)
+        self.server.newConnection.connect(self._on_new_connection)
+
+        self.handlers = {
+            "start": self.handle_start,
+            "stop": self.handle_stop,
+            "save-replay": self.handle_save_replay,
+            "pause": self.handle_pause,
+            "status": lambda request: self.target(request).status(),
+            "metrics": lambda request: self.target(request).metrics_snapshot(),
+            "sessions": lambda request: {"sessions": self.sessions.status() if self.sessions else {}},
+            "jobs": self.handle_jobs,
+            "ping": lambda request: {"pong": True},
+        }
+
+    def listen(self):
+        """
+        Start listening, replacing a stale socket file if needed. A socket
+        another instance still answers on is left alone.
+
+        Returns:
+            bool: True on success
+        """
+        probe = QLocalSocket()
+        probe.connectToServer(self.socket_path)
+        if probe.waitForConnected(500):
+            probe.disconnectFromServer()
+            self.message.emit(f"Another instance is already listening at {self.socket_path}")
+            return False
+        QLocalServer.removeServer(self.socket_path)
+        if not self.server.listen(self.socket_path):
+            self.message.emit(f"Control socket failed: {self.server.errorString()}")
+            return False
+        self.message.emit(f"Control socket listening at {self.socket_path}")
+        return True
+
+    def close(self):
+        self.server.close()
+
+    def handle_request(self, text):
+        """
+        Run one request.
+
+        Returns:
+            dict: Reply, always with an "ok" key
+        """
+        try:
+            text = text.strip()
+            if text.startswith("{"):
+                request = json.loads(text)
+            else:
+                parts = text.split()
+                request = {"command": parts[0] if parts else ""}
+                for part in parts[1:]:
+                    if part.startswith("@"):
+                        request["session"] = part[1:]
+                    else:
+                        request["mode"] = part
+
+            handler = self.handlers.get(request.get("command"))
+            if handler is None:
+                return {"ok": False, "error": f"unknown command: {request.get('command')}"}
+            reply = {"ok": True}
+            reply.update(handler(request))
+            return reply
+        except Exception as e:
+            return {"ok": False, "error": str(e)}
+
+    def target(self, request):
+        """The controller a request is meant for"""
+        name = request.get("session")
+        if not name:
+            return self.controller
+        if self.sessions is None:
+            raise RuntimeError("sessions are not available")
+        return self.sessions.controller(name)
+
+    def handle_start(self, request):
+        if request.get("session"):
+            controller = self.target(request)
+            self.sessions.start(request["session"])
+            return controller.status()
+        if self.controller.is_recording:
+            raise RuntimeError("already recording")
+        mode = request.get("mode")
+        if mode not in (None, "replay", "record"):
+            raise ValueError(f"unknown mode: {mode} (expected replay or record)")
+        replay_mode = self.config.replay_enabled if mode is None else mode == "replay"
+        output = None if replay_mode else self.config.recording_file()
+        # Same check as the window, a recording that would be stopped at once is refused
+        if not replay_mode and self.config.storage_auto_stop:
+            refused = self.controller.storage.check_start(output, self.config.estimated_bitrate_kbps())
+            if refused:
+                raise RuntimeError(refused)
+        command = self.config.to_argv(replay_mode, output)
+        self.message.emit(f"Starting: {' '.join(command)}")
+        self.controller.start(
+            command, replay_mode, self.config.fps,
+            self.config.replay_save_merge_ms, self.config.estimated_bitrate_kbps()
+        )
+        return self.controller.status()
+
+    def handle_stop(self, request):
+        controller = self.target(request)
+        if not controller.is_recording:
+            raise RuntimeError("not recording")
+        controller.stop()
+        return controller.status()
+
+    def handle_save_replay(self, request):
+        if request.get("session") == "all":
+            saved = ["main"] if self.controller.save_replay("socket") is not None else []
+            if self.sessions:
+                saved += self.sessions.save_replay(None, "socket")
+            if not saved:
+                raise RuntimeError("no replay buffer is running")
+            return {"saved": saved}
+        if request.get("session"):
+            self.target(request)
+            if not self.sessions.save_replay(request["session"], "socket"):
+                raise RuntimeError("replay buffer is not running")
+            return {"saved": [request["session"]]}
+        if not self.controller.is_recording or not self.controller.is_replay_mode:
+            raise RuntimeError("replay buffer is not running")
+        save = self.controller.save_replay("socket")
+        if save is None:
+            raise RuntimeError("could not signal the recorder")
+        return {"save": {"id": save["id"], "state": save["state"], "merged": save["merged"]}}
+
+    def handle_jobs(self, request):
+        if self.jobs is None:
+            return {"counts": {}, "jobs": []}
+        keys = ("id", "clip", "state", "attempts", "wall_ms", "exit_code", "error")
+        return {
+            "counts": self.jobs.counts(),
+            "jobs": [{key: job[key] for key in keys} for job in self.jobs.jobs[-20:]],
+        }
+
+    def handle_pause(self, request):
+        controller = self.target(request)
+        if not controller.toggle_pause():
+            raise RuntimeError("not recording")
+        return controller.status()
+
+    def _on_new_connection(self):
+        while self.server.hasPendingConnections():
+            socket = self.server.nextPendingConnection()
+            self.buffers[socket] = bytearray()
+            socket.readyRead.connect(lambda socket=socket: self._on_ready_read(socket))
+            socket.disconnected.connect(lambda socket=socket: self._on_disconnected(socket))
+
+    def _on_ready_read(self, socket):
+        buffer = self.buffers.get(socket)
+        if buffer is None:
+            return
+        buffer += socket.readAll().data()
+        while True:
+            end = buffer.find(b"\n")
+            if end < 0:
+                break
+            text = buffer[:end].decode("utf-8", errors="replace")
+            del buffer[:end + 1]
+            reply = self.handle_request(text)
+            socket.write((json.dumps(reply) + "\n").encode("utf-8"))
+        if len(buffer) > self.max_line:
+            self.buffers.pop(socket)
+            reply = {"ok": False, "error": f"request longer than {self.max_line} bytes"}
+            socket.write((json.dumps(reply) + "\n").encode("utf-8"))
+            socket.flush()
+            socket.disconnectFromServer()
+            return
+        socket.flush()
+
+    def _on_disconnected(self, socket):
+        self.buffers.pop(socket, None)
+        socket.deleteLater()
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import hashlib
+import time
+from PyQt6 import sip
+from PyQt6.QtCore import QObject, QProcess, QTimer, pyqtSignal
+
+class DiscoveryCache:
+    """
+    Persistent cache of probe output, keyed by the probe command line.
+    Entries are stored in QSettings together with a content hash and the
+    time they were taken, so callers can tell fresh from stale results.
+    """
+
+    def __init__(self, settings, ttl=300):
+        self.settings = settings
+        self.ttl = ttl  # Seconds before an entry is considered stale
+
+    def _key(self, command):
+        # QSettings uses "/" as a group separator
+        return "discovery_cache/" + " ".join(command).replace("/", "_")
+
+    def get(self, command):
+        """
+        Look up the cached output of a probe command.
+
+        Returns:
+            tuple: (output, content hash, age in seconds), or None if not cached
+        """
+        key = self._key(command)
+        output = self.settings.value(f"{key}/output")
+        if output is None:
+            return None
+        content_hash = self.settings.value(f"{key}/hash", "")
+        taken = float(self.settings.value(f"{key}/time", 0))
+        return output, content_hash, time.time() - taken
+
+    def is_fresh(self, command):
+        """Check if the cached entry for a command is younger than the TTL"""
+        entry = self.get(command)
+        return entry is not None and entry[2] < self.ttl
+
+    def put(self, command, output):
+        """
+        Store the output of a probe command.
+
+        Returns:
+            str: Content hash of the output
+        """
+        key = self._key(command)
+        content_hash = self.content_hash(output)
+        self.settings.setValue(f"{key}/output", output)
+        self.settings.setValue(f"{key}/hash", content_hash)
+        self.settings.setValue(f"{key}/time", time.time())
+        return content_hash
+
+    @staticmethod
+    def content_hash(output):
+        return hashlib.sha1(output.encode("utf-8")).hexdigest()
+
+class DeviceDiscovery(QObject):
+    """
+    Runs the gpu-screen-recorder --list-* probes without blocking the GUI.
+    Every probe gets its own QProcess so they all run at the same time, and
+    each result is delivered as soon as that probe exits.
+
+    With a DiscoveryCache, probe_finished only fires when a probe's output
+    differs from what was last delivered, and fresh cache entries skip the
+    probe entirely unless a refresh is forced.
+    """
+
+    # Probe name -> arguments passed to gpu-screen-recorder
+    PROBES = {
+        "capture_options": ["--list-capture-options"],
+        "audio_devices": ["--list-audio-devices"],
+        "application_audio": ["--list-application-audio"],
+    }
+
+    probe_finished = pyqtSignal(str, str)  # probe name, stdout text
+    probe_failed = pyqtSignal(str, str)    # probe name, error message
+    all_finished = pyqtSignal()
+
+    def __init__(self, executable="gpu-screen-recorder", timeout=5000, cache=None, parent=None):
+        super().__init__(parent)
+        self.executable = executable
+        self.timeout = timeout  # Per-probe timeout in milliseconds
+        self.cache = cache
+        self.running = {}  # probe name -> (QProcess, QTimer)
+        self.delivered = {}  # probe name -> hash of the last delivered output
+
+    def command(self, name):
+        """Full command line of a probe, used as its cache key"""
+        return [self.executable] + self.PROBES[name]
+
+    def load_cached(self, probes=None):
+        """
+        Deliver cached results right away, without running any probe.
+
+        Args:
+            probes (list): Probe names from PROBES (optional)
+        """
+        if self.cache is None:
+            return
+        for name in probes or list(self.PROBES):
+            entry = self.cache.get(self.command(name))
+            if entry is not None:
+                output, content_hash, age = entry
+                self._deliver(name, output, content_hash)
+
+    def refresh(self, probes=None, force=True):
+        """
+        Launch the given probes (all of them by default).
+
+        Args:
+            probes (list): Probe names from PROBES (optional)
+            force (bool): Run probes even if their cache entry is still fresh
+        """
+        for name in probes or list(self.PROBES):
+            # A probe that is still running will deliver a fresh result anyway
+            if name in self.running:
+                continue
+            if not force and self.cache is not None and self.cache.is_fresh(self.command(name)):
+                continue
+            self._start_probe(name)
+        self._check_all_finished()
+
+    def is_running(self, name=None):
+        """Check if a probe (or any probe) is still running"""
+        if name is None:
+            return bool(self.running)
+        return name in self.running
+
+    def cancel(self):
+        """Kill every running probe"""
+        for name in list(self.running):
+            self._fail(name, "cancelled")
+
+    def _start_probe(self, name):
+        process = QProcess(self)
+        timer = QTimer(self)
+        timer.setSingleShot(True)
+        timer.timeout.connect(lambda: self._fail(name, f"timed out after {self.timeout} ms"))
+
+        process.finished.connect(lambda exit_code, exit_status: self._on_finished(name))
+        process.errorOccurred.connect(lambda error: self._on_error(name, error))
+
+        self.running[name] = (process, timer)
+        process.start(self.executable, self.PROBES[name])
+        timer.start(self.timeout)
+
+    def _on_finished(self, name):
+        if self._being_destroyed(name):
+            return
+        entry = self.running.pop(name, None)
+        if entry is None:
+            return
+        process, timer = entry
+        timer.stop()
+        output = process.readAllStandardOutput().data().decode("utf-8", errors="replace")
+        process.deleteLater()
+        timer.deleteLater()
+        if self.cache is not None:
+            content_hash = self.cache.put(self.command(name), output)
+        else:
+            content_hash = DiscoveryCache.content_hash(output)
+        self._deliver(name, output, content_hash)
+        self._check_all_finished()
+
+    def _deliver(self, name, output, content_hash):
+        # Only touch the consumers when the output actually changed
+        if self.delivered.get(name) == content_hash:
+            return
+        self.delivered[name] = content_hash
+        self.probe_finished.emit(name, output)
+
+    def _on_error(self, name, error):
+        if self._being_destroyed(name):
+            return
+        # Crashes and timeouts are reported through finished/_fail
+        if error == QProcess.ProcessError.FailedToStart:
+            self._fail(name, f"failed to start {self.executable}")
+
+    def _being_destroyed(self, name):
+        # Probes still running at shutdown emit signals while being destroyed
+        entry = self.running.get(name)
+        return entry is not None and (sip.isdeleted(self) or sip.isdeleted(entry[0]))
+
+    def _fail(self, name, message):
+        entry = self.running.pop(name, None)
+        if entry is None:
+            return
+        process, timer = entry
+        timer.stop()
+        if process.state() != QProcess.ProcessState.NotRunning:
+            process.kill()
+        process.deleteLater()
+        timer.deleteLater()
+        self.probe_failed.emit(name, message)
+        self._check_all_finished()
+
+    def _check_all_finished(self):
+        if not self.running:
+            self.all_finished.emit()
@@ -3,19 +3,25 @@
 
 import os
 import sys
-from PyQt6.QtCore import QObject, QTimer
+import time
+from PyQt6.QtCore import QObject
 from PyQt6.QtGui import QKeySequence, QShortcut
 from PyQt6.QtWidgets import QApplication
 
+from .ShortcutDispatcher import ShortcutDispatcher
+
 class GlobalShortcutManager(QObject):
     """
     Manages global (system-wide) keyboard shortcuts using KDE's kglobalaccel
     service via D-Bus when available, with fallback to application shortcuts.
+    Triggers go through a ShortcutDispatcher, which drops repeats within an
+    action's cooldown and times each one.
     """
     
-    def __init__(self):
+    def __init__(self, dispatcher=None):
         super().__init__()
         self.shortcuts = {}
+        self.dispatcher = dispatcher or ShortcutDispatcher(self)
         self.dbus_available = False
         self.kde_available = False
         
@@ -69,12 +75,13 @@ class GlobalShortcutManager(QObject):
     
     def _on_shortcut_triggered(self, shortcut_name, action_name):
         """Handler for when a shortcut is triggered"""
+        received_ns = time.monotonic_ns()
         shortcut_id = f"{shortcut_name}/{action_name}"
         if shortcut_id in self.shortcuts:
-            # Use QTimer to ensure callback runs in the main thread
-            QTimer.singleShot(0, self.shortcuts[shortcut_id])
+            # The dispatcher runs the callback in the main thread
+            self.dispatcher.trigger(shortcut_id, received_ns)
     
-    def register(self, key_sequence, callback, friendly_name=None):
+    def register(self, key_sequence, callback, friendly_name=None, cooldown_ms=None):
         """
         Register a keyboard shortcut.
         
@@ -82,6 +89,7 @@ class GlobalShortcutManager(QObject):
             key_sequence (str): Shortcut key sequence (e.g., "Ctrl+Shift+S")
             callback (function): Function to call when shortcut is triggered
             friendly_name (str): Optional name for the shortcut
+            cooldown_ms (int): Minimum time between two runs, see ShortcutDispatcher
         
         Returns:
             str: Shortcut ID for later reference, or None if registration failed
@@ -104,26 +112,34 @@ class GlobalShortcutManager(QObject):
                 # Store the callback
                 shortcut_id = f"{app_name}/{action_name}"
                 self.shortcuts[shortcut_id] = callback
+                self._add_action(shortcut_id, callback, friendly_name, cooldown_ms)
                 
                 return shortcut_id
                 
             except Exception as e:
                 print(f"Error registering global shortcut: {e}")
                 # Fall back to Qt shortcut (application-only)
-                return self._register_qt_shortcut(key_sequence, callback)
+                return self._register_qt_shortcut(key_sequence, callback, friendly_name, cooldown_ms)
         else:
             # Fall back to Qt shortcut (application-only)
-            return self._register_qt_shortcut(key_sequence, callback)
+            return self._register_qt_shortcut(key_sequence, callback, friendly_name, cooldown_ms)
+    
+    def _add_action(self, shortcut_id, callback, friendly_name, cooldown_ms):
+        if cooldown_ms is None:
+            cooldown_ms = self.dispatcher.COOLDOWNS_MS.get(friendly_name)
+        self.dispatcher.add(shortcut_id, callback, cooldown_ms)
     
-    def _register_qt_shortcut(self, key_sequence, callback):
+    def _register_qt_shortcut(self, key_sequence, callback, friendly_name=None, cooldown_ms=None):
         """Register a Qt shortcut (application-only)"""
         # Create the shortcut with application context
         if QApplication.activeWindow():
             shortcut = QShortcut(QKeySequence(key_sequence), QApplication.activeWindow())
-            shortcut.activated.connect(callback)
+            shortcut.setAutoRepeat(False)
             
             shortcut_id = f"qt_{len(self.shortcuts)}"
+            shortcut.activated.connect(lambda: self.dispatcher.trigger(shortcut_id))
             self.shortcuts[shortcut_id] = callback
+            self._add_action(shortcut_id, callback, friendly_name, cooldown_ms)
             return shortcut_id
         else:
             print("Warning: No active window for shortcut registration")
@@ -147,6 +163,7 @@ class GlobalShortcutManager(QObject):
                 
                 # Remove from our mapping
                 del self.shortcuts[shortcut_id]
+                self.dispatcher.remove(shortcut_id)
                     
             except Exception as e:
                 print(f"Error unregistering global shortcut: {e}")
@@ -155,6 +172,7 @@ class GlobalShortcutManager(QObject):
             # It's a Qt shortcut - we can't easily delete it
             # Just remove from our mapping
             del self.shortcuts[shortcut_id]
+            self.dispatcher.remove(shortcut_id)
     
     def unregister_all(self):
         """Unregister all shortcuts"""
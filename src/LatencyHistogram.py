@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from array import array
+from bisect import bisect_left
+
+class LatencyHistogram:
+    """
+    Latency histogram with fixed millisecond buckets.
+    Bucket counts cover every sample ever added; the most recent samples are
+    also kept in a ring buffer so percentiles stay exact over that window.
+    """
+
+    # Upper bounds of the buckets in milliseconds, the last bucket is open
+    BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+    def __init__(self, buckets_ms=BUCKETS_MS, window=1024):
+        self.buckets_ms = tuple(buckets_ms)
+        self.window = window
+        self.clear()
+
+    def clear(self):
+        self.counts = [0] * (len(self.buckets_ms) + 1)
+        self.recent = array("q", [0] * self.window)
+        self.recent_start = 0
+        self.recent_count = 0
+        self.total = 0
+        self.maximum_ns = 0
+        self.last_ns = None
+
+    def add(self, latency_ns):
+        """Record one latency sample in nanoseconds"""
+        self.counts[bisect_left(self.buckets_ms, latency_ns / 1e6)] += 1
+        self.total += 1
+        self.last_ns = latency_ns
+        self.maximum_ns = max(self.maximum_ns, latency_ns)
+
+        index = (self.recent_start + self.recent_count) % self.window
+        self.recent[index] = latency_ns
+        if self.recent_count < self.window:
+            self.recent_count += 1
+        else:
+            self.recent_start = (self.recent_start + 1) % self.window
+
+    def percentile(self, percent):
+        """
+        Percentile of the recent samples.
+
+        Returns:
+            int: Latency in nanoseconds, or None without samples
+        """
+        if not self.recent_count:
+            return None
+        samples = sorted(self.recent[(self.recent_start + i) % self.window] for i in range(self.recent_count))
+        rank = min(len(samples) - 1, int(round(percent / 100 * (len(samples) - 1))))
+        return samples[rank]
+
+    def bucket_labels(self):
+        """Human readable label for every bucket"""
+        labels = [f"≤ {bound} ms" for bound in self.buckets_ms]
+        labels.append(f"> {self.buckets_ms[-1]} ms")
+        return labels
+
+    def summary(self):
+        """Return the main figures as a plain dict, in milliseconds"""
+        def ms(value):
+            return None if value is None else round(value / 1e6, 3)
+
+        return {
+            "count": self.total,
+            "last_ms": ms(self.last_ns),
+            "p50_ms": ms(self.percentile(50)),
+            "p95_ms": ms(self.percentile(95)),
+            "max_ms": ms(self.maximum_ns) if self.total else None,
+            "buckets": dict(zip(self.bucket_labels(), self.counts)),
+        }
+
+    def format_text(self, width=30):
+        """Render the non-empty buckets as text bars"""
+        peak = max(self.counts) or 1
+        lines = []
+        for label, count in zip(self.bucket_labels(), self.counts):
+            if count:
+                bar = "█" * max(1, round(count / peak * width))
+                lines.append(f"{label:>12} {bar} {count}")
+        return "\n".join(lines)
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import time
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+
+class LogBatcher(QObject):
+    """
+    Collects log text and hands it to the log view in batches.
+    Lines are timestamped as they arrive and flushed in a single insert at
+    most every `interval` ms, or right away once `max_lines` are waiting,
+    so a chatty recorder costs one GUI update per batch instead of per read.
+    """
+
+    flushed = pyqtSignal(list)  # Timestamped lines
+
+    def __init__(self, interval=100, max_lines=500, parent=None):
+        super().__init__(parent)
+        self.max_lines = max_lines
+        self.pending = []
+
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(interval)
+        self.timer.timeout.connect(self.flush)
+
+        # Formatting the time is only needed once per second
+        self._stamp_second = None
+        self._stamp = ""
+
+    def add(self, text):
+        """Queue text (possibly several lines) for the next flush"""
+        stamp = self._timestamp()
+        for line in text.splitlines() or [""]:
+            self.pending.append(f"[{stamp}] {line}")
+
+        if len(self.pending) >= self.max_lines:
+            self.flush()
+        elif not self.timer.isActive():
+            self.timer.start()
+
+    def flush(self):
+        """Emit everything queued so far"""
+        self.timer.stop()
+        if self.pending:
+            lines, self.pending = self.pending, []
+            self.flushed.emit(lines)
+
+    def _timestamp(self):
+        now = time.time()
+        second = int(now)
+        if second != self._stamp_second:
+            self._stamp_second = second
+            self._stamp = time.strftime("%H:%M:%S", time.localtime(now))
+        return self._stamp
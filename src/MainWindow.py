@@ -2,11 +2,9 @@
 # -*- coding: utf-8 -*-
 
 import os
-import traceback
-from pathlib import Path
-from datetime import datetime
+import time
 
-from PyQt6.QtCore import Qt, QSettings, QSize, QTimer
+from PyQt6.QtCore import Qt, QCoreApplication, QSettings, QSize, QTimer
 from PyQt6.QtGui import QAction, QIcon, QKeySequence
 from PyQt6.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
@@ -15,32 +13,120 @@ from PyQt6.QtWidgets import (
 )
 
 # Use relative imports for local modules
-from .RecorderProcess import GPUScreenRecorderProcess
-from .ui.RecordTab import RecordTab
-from .ui.ReplayTab import ReplayTab
-from .ui.AdvancedTab import AdvancedTab
-from .ui.LogTab import LogTab
-from .GlobalShortcuts import GlobalShortcutManager
-from .NotificationManager import NotificationManager
+from .CommandValidator import CommandError
+from .RecorderConfig import RecorderConfig
+from .RecorderController import RecorderController
+from .ReplayPrewarmer import ReplayPrewarmer
+from .ShortcutDispatcher import ShortcutDispatcher
+from .StorageMonitor import format_minutes
+from .ui.LogTab import LogModel
+from .ui.Sparkline import Sparkline
+from .LogBatcher import LogBatcher
 
 class GPUScreenRecorderGUI(QMainWindow):
+    # Tabs in display order: attribute name, title
+    TABS = [
+        ("record_tab", "Record"),
+        ("replay_tab", "Replay"),
+        ("advanced_tab", "Advanced"),
+        ("log_tab", "Log"),
+        ("metrics_tab", "Metrics"),
+        ("sessions_tab", "Sessions"),
+        ("library_tab", "Library"),
+        ("jobs_tab", "Jobs"),
+    ]
+    
+    # Tabs are only built when first shown or first needed
+    record_tab = property(lambda self: self.ensure_tab("record_tab"))
+    replay_tab = property(lambda self: self.ensure_tab("replay_tab"))
+    advanced_tab = property(lambda self: self.ensure_tab("advanced_tab"))
+    log_tab = property(lambda self: self.ensure_tab("log_tab"))
+    metrics_tab = property(lambda self: self.ensure_tab("metrics_tab"))
+    sessions_tab = property(lambda self: self.ensure_tab("sessions_tab"))
+    library_tab = property(lambda self: self.ensure_tab("library_tab"))
+    jobs_tab = property(lambda self: self.ensure_tab("jobs_tab"))
+    
+    # Recording state lives in the controller
+    is_recording = property(lambda self: self.controller.is_recording)
+    is_replay_mode = property(lambda self: self.controller.is_replay_mode)
+    is_paused = property(lambda self: self.controller.is_paused)
+    
+    # Built on first use, see ensure_sessions() and ensure_post_processing()
+    sessions = property(lambda self: self.ensure_sessions())
+    post_processing = property(lambda self: self.ensure_post_processing())
+    
     def __init__(self):
         super().__init__()
         
+        # Startup timing breakdown, reported once the window has been painted
+        self.startup_started = time.perf_counter()
+        self.startup_timings = []
+        
         # Set up settings
         self.settings = QSettings()
         
-        # Initialize process controller
-        self.recorder = GPUScreenRecorderProcess()
-        self.recorder.signals.started.connect(self.on_recording_started)
-        self.recorder.signals.finished.connect(self.on_recording_finished)
-        self.recorder.signals.error.connect(self.show_error)
-        self.recorder.signals.output.connect(self.append_log)
-        
-        # Recording state
-        self.is_recording = False
-        self.is_replay_mode = False
-        self.is_paused = False
+        # Log lines are kept here even before the log tab exists
+        self.log_model = LogModel(int(self.settings.value("log/max_lines", 10000)), self)
+        
+        # Log lines are batched so bursts of output cost one view update
+        self.log_batcher = LogBatcher(
+            interval=int(self.settings.value("log/flush_interval", 100)),
+            max_lines=int(self.settings.value("log/flush_lines", 500)),
+            parent=self
+        )
+        self.log_batcher.flushed.connect(self.flush_log)
+        
+        # Recorder settings, kept up to date by the tabs
+        self.config = RecorderConfig.from_settings(self.settings)
+        
+        # Recording controller, shared with headless mode
+        self.controller = RecorderController(self)
+        self.controller.started.connect(self.on_recording_started)
+        self.controller.finished.connect(self.on_recording_finished)
+        self.controller.error.connect(self.show_error)
+        self.controller.message.connect(self.append_log)
+        self.controller.crashed.connect(self.on_recorder_crashed)
+        self.controller.state_changed.connect(self.on_controller_state_changed)
+        self.controller.line.connect(self.on_recorder_line)
+        self.controller.bitrate_sampler.sampled.connect(self.on_bitrate_sampled)
+        self.controller.storage.sampled.connect(self.on_storage_sampled)
+        self.controller.storage.warning.connect(self.on_storage_warning)
+        self.controller.storage.stop_requested.connect(self.on_storage_full)
+        self.recorder = self.controller.recorder
+        
+        # Let a stopping recorder finish its file before the app exits
+        QCoreApplication.instance().aboutToQuit.connect(self.controller.finish_pending)
+        
+        # Live metrics parsed from verbose recorder output
+        self.metrics = self.controller.metrics
+        self.metrics.updated.connect(self.update_metrics_display)
+        
+        # Timing of the save replay path, up to the clip landing on disk
+        self.save_tracker = self.controller.save_tracker
+        # Clips are handed on once the SaveQueue has confirmed them finished
+        self.controller.save_queue.clip_ready.connect(self.on_replay_landed)
+        self.save_tracker.save_timed_out.connect(self.on_replay_timed_out)
+        
+        # Optional background replay buffer, taken over by Start Recording
+        self.prewarmer = ReplayPrewarmer(
+            self.controller, self.config,
+            settle_ms=int(self.settings.value("replay/prewarm_settle_ms", 2000)),
+            parent=self
+        )
+        self.controller.warm_changed.connect(self.on_warm_changed)
+        
+        # Extra recorders next to the main one, loaded when first needed
+        self.session_manager = None
+        
+        # Post-processing scripts for saved replays, created after the first
+        # paint (it resumes jobs left from the last run) or when first needed
+        self.post_process_queue = None
+        
+        # Index of saved clips, opened with the library tab, and the
+        # metadata/thumbnail workers, started with the first clip to probe
+        self.library = None
+        self.clip_processor = None
+        self.mark_startup("controller")
         
         # UI Setup
         self.setWindowTitle("GPU Screen Recorder")
@@ -54,35 +140,74 @@ class GPUScreenRecorderGUI(QMainWindow):
         # Initialize UI components
         self.init_ui()
         
-        # Notification manager (must be created after tray icon)
-        self.notification_manager = NotificationManager()
-        self.notification_manager.set_tray_icon(self.tray_icon)
+        # Created after the first paint, see finish_startup()
+        self.notification_manager = None
+        self.startup_scheduled = False
         
         # Setup global shortcuts (must be done after window is created)
         self.shortcut_id_map = {}  # Store shortcut IDs for later unregistering
         self.setup_shortcuts()
+        self.mark_startup("shortcuts")
         
         # Log initial debug info
         self.append_log("Application started")
         self.append_log(f"Current directory: {os.getcwd()}")
+    
+    def mark_startup(self, stage):
+        """Record how long a startup stage took"""
+        now = time.perf_counter()
+        previous = self.startup_timings[-1][2] if self.startup_timings else self.startup_started
+        self.startup_timings.append((stage, (now - previous) * 1000, now))
+    
+    def finish_startup(self):
+        """Deferred startup work, run after the first paint"""
+        if self.notification_manager is not None:
+            return
+        self.mark_startup("first paint")
         
         # Try to find gpu-screen-recorder
-        try:
-            import subprocess
-            result = subprocess.run(["which", "gpu-screen-recorder"], 
-                                    stdout=subprocess.PIPE, 
-                                    stderr=subprocess.PIPE, 
-                                    text=True)
-            if result.returncode == 0:
-                self.append_log(f"Found gpu-screen-recorder at: {result.stdout.strip()}")
-            else:
-                self.append_log("WARNING: gpu-screen-recorder not found in PATH")
-        except Exception as e:
-            self.append_log(f"Error locating gpu-screen-recorder: {e}")
+        import shutil
+        path = shutil.which("gpu-screen-recorder")
+        if path:
+            self.append_log(f"Found gpu-screen-recorder at: {path}")
+        else:
+            self.append_log("WARNING: gpu-screen-recorder not found in PATH")
+        
+        # Notification manager (must be created after tray icon)
+        from .NotificationManager import NotificationManager
+        self.notification_manager = NotificationManager()
+        self.notification_manager.set_tray_icon(self.tray_icon)
+        self.notification_manager.dispatched.connect(self.on_notification_dispatched)
+        self.mark_startup("notifications")
+        
+        # Resume post-processing jobs left from the last run
+        self.ensure_post_processing()
+        self.mark_startup("post-processing")
+        
+        # Start the background replay buffer, if enabled
+        self.prewarmer.sync()
+        
+        breakdown = ", ".join(f"{stage} {ms:.1f} ms" for stage, ms, _ in self.startup_timings)
+        total = (self.startup_timings[-1][2] - self.startup_started) * 1000
+        self.append_log(f"Startup took {total:.1f} ms ({breakdown})")
+    
+    def on_shortcut_dispatched(self, name, latency_ns):
+        if "metrics_tab" in self.built_tabs:
+            self.metrics_tab.update_shortcuts(self.shortcut_dispatcher, self.config.fps)
+    
+    def on_notification_dispatched(self):
+        if "metrics_tab" in self.built_tabs:
+            self.metrics_tab.update_notifications(self.notification_manager)
+    
+    def notify(self, title, message, **kwargs):
+        """Show a desktop notification, connecting to D-Bus first if needed"""
+        self.finish_startup()
+        self.notification_manager.notify(title, message, **kwargs)
     
     def init_ui(self):
         # System Tray
         self.setup_tray()
+        self.mark_startup("tray")
         
         # Main layout
         central_widget = QWidget()
@@ -93,21 +218,17 @@ class GPUScreenRecorderGUI(QMainWindow):
         self.tabs = QTabWidget()
         main_layout.addWidget(self.tabs)
         
-        # Record tab
-        self.record_tab = RecordTab(self.settings)
-        self.tabs.addTab(self.record_tab, "Record")
-        
-        # Replay tab
-        self.replay_tab = ReplayTab(self.settings)
-        self.tabs.addTab(self.replay_tab, "Replay")
-        
-        # Advanced tab
-        self.advanced_tab = AdvancedTab(self.settings)
-        self.tabs.addTab(self.advanced_tab, "Advanced")
-        
-        # Log tab
-        self.log_tab = LogTab()
-        self.tabs.addTab(self.log_tab, "Log")
+        # Placeholders for every tab, only the visible one is built now
+        self.built_tabs = {}
+        for name, title in self.TABS:
+            self.tabs.addTab(QWidget(), title)
+        current = int(self.settings.value("window/tab", 0))
+        if not 0 <= current < len(self.TABS):
+            current = 0
+        self.tabs.setCurrentIndex(current)
+        self.ensure_tab(self.TABS[current][0])
+        self.tabs.currentChanged.connect(self.on_tab_changed)
+        self.mark_startup("visible tab")
         
         # Control buttons
         button_layout = QHBoxLayout()
@@ -119,7 +240,7 @@ class GPUScreenRecorderGUI(QMainWindow):
         
         # Save Replay button (only enabled when in replay mode)
         self.save_replay_btn = QPushButton("Save Replay")
-        self.save_replay_btn.clicked.connect(self.save_replay)
+        self.save_replay_btn.clicked.connect(lambda: self.save_replay("button"))
         self.save_replay_btn.setEnabled(False)
         button_layout.addWidget(self.save_replay_btn)
         
@@ -137,6 +258,140 @@ class GPUScreenRecorderGUI(QMainWindow):
         self.setStatusBar(self.status_bar)
         self.status_label = QLabel("Ready")
         self.status_bar.addWidget(self.status_label, 1)
+        self.fps_label = QLabel()
+        self.status_bar.addPermanentWidget(self.fps_label)
+        self.bitrate_sparkline = Sparkline()
+        self.bitrate_sparkline.setToolTip("Measured bitrate, dashed: average since start")
+        self.status_bar.addPermanentWidget(self.bitrate_sparkline)
+        self.bitrate_label = QLabel()
+        self.status_bar.addPermanentWidget(self.bitrate_label)
+        self.storage_label = QLabel()
+        self.status_bar.addPermanentWidget(self.storage_label)
+    
+    def create_tab(self, name):
+        """Build a tab widget, importing its module on first use"""
+        if name == "record_tab":
+            from .ui.RecordTab import RecordTab
+            return RecordTab(self.settings, self.config)
+        if name == "replay_tab":
+            from .ui.ReplayTab import ReplayTab
+            return ReplayTab(self.settings, self.config)
+        if name == "advanced_tab":
+            from .ui.AdvancedTab import AdvancedTab
+            return AdvancedTab(self.settings, self.config)
+        if name == "log_tab":
+            from .ui.LogTab import LogTab
+            return LogTab(self.settings, self.log_model)
+        if name == "metrics_tab":
+            from .ui.MetricsTab import MetricsTab
+            tab = MetricsTab(self.save_tracker, self.controller.save_queue)
+            tab.update_metrics(self.metrics)
+            tab.update_save_latency()
+            if self.notification_manager is not None:
+                tab.update_notifications(self.notification_manager)
+            tab.update_shortcuts(self.shortcut_dispatcher, self.config.fps)
+            return tab
+        if name == "sessions_tab":
+            from .ui.SessionsTab import SessionsTab
+            sources = []
+            if "record_tab" in self.built_tabs:
+                combo = self.record_tab.source_combo
+                sources = [combo.itemText(i) for i in range(3, combo.count())]
+            return SessionsTab(self.sessions, sources)
+        if name == "jobs_tab":
+            from .ui.JobsTab import JobsTab
+            return JobsTab(self.post_processing)
+        if name == "library_tab":
+            from .ui.LibraryTab import LibraryTab
+            return LibraryTab(self.ensure_library(), self.library_roots, self.ensure_clip_processor())
+        raise ValueError(f"Unknown tab: {name}")
+    
+    def ensure_tab(self, name):
+        """Return a tab, building it in place of its placeholder if needed"""
+        tab = self.built_tabs.get(name)
+        if tab is not None:
+            return tab
+        
+        tab = self.create_tab(name)
+        self.built_tabs[name] = tab
+        
+        # Swap the placeholder without the tab bar noticing
+        index = [tab_name for tab_name, _ in self.TABS].index(name)
+        current = self.tabs.currentIndex()
+        placeholder = self.tabs.widget(index)
+        self.tabs.blockSignals(True)
+        self.tabs.removeTab(index)
+        self.tabs.insertTab(index, tab, self.TABS[index][1])
+        self.tabs.setCurrentIndex(current)
+        self.tabs.blockSignals(False)
+        placeholder.deleteLater()
+        return tab
+    
+    def ensure_sessions(self):
+        """Load the extra sessions on first use, their processes start on demand"""
+        if self.session_manager is None:
+            from .SessionManager import SessionManager
+            self.session_manager = SessionManager(self.config, self.settings, self)
+            self.session_manager.session_line.connect(lambda name, text: self.append_log(f"[{name}] {text}"))
+            self.session_manager.session_error.connect(
+                lambda name, message: self.append_log(f"ERROR [{name}]: {message}")
+            )
+            self.session_manager.replay_saved.connect(lambda name, path: self.post_processing.add(path))
+            QCoreApplication.instance().aboutToQuit.connect(self.session_manager.finish_pending)
+        return self.session_manager
+    
+    def ensure_post_processing(self):
+        """Create the post-processing queue on first use, which resumes saved jobs"""
+        if self.post_process_queue is None:
+            from .PostProcessQueue import PostProcessQueue
+            self.post_process_queue = PostProcessQueue(self.config, parent=self)
+            self.post_process_queue.job_changed.connect(self.on_job_changed)
+            QCoreApplication.instance().aboutToQuit.connect(self.post_process_queue.shutdown)
+        return self.post_process_queue
+    
+    def ensure_library(self):
+        """Open the replay library index on first use"""
+        if self.library is None:
+            from .ReplayLibrary import ReplayLibrary
+            self.library = ReplayLibrary(parent=self)
+            self.library.set_roots(self.library_roots())
+        return self.library
+    
+    def ensure_clip_processor(self):
+        """Create the metadata and thumbnail worker pool on first use"""
+        if self.clip_processor is None:
+            from .ClipProcessor import ClipProcessor, ThumbnailCache
+            try:
+                self.clip_processor = ClipProcessor(
+                    extractor=self.settings.value("library/extractor", "auto"),
+                    workers=int(self.settings.value("library/workers", 2)),
+                    cache=ThumbnailCache(max_bytes=int(self.settings.value("library/thumbnail_cache_mb", 256)) * 1024 * 1024),
+                    parent=self
+                )
+            except ValueError as e:
+                self.append_log(f"ERROR: {e}, using the built-in clip probe")
+                self.clip_processor = ClipProcessor(extractor="python", parent=self)
+            self.clip_processor.processed.connect(self.on_clip_processed)
+            self.clip_processor.failed.connect(lambda path, error: self.append_log(f"Could not probe {path}: {error}"))
+            QCoreApplication.instance().aboutToQuit.connect(self.clip_processor.shutdown)
+            self.append_log(f"Probing clips with the {self.clip_processor.extractor.name} extractor")
+        return self.clip_processor
+    
+    def on_clip_processed(self, path, metadata):
+        if self.library is not None and metadata.get("duration") is not None:
+            self.library.set_duration(path, metadata["duration"])
+    
+    def library_roots(self):
+        """Folders the replay library indexes: the replay folder and any session folders outside it"""
+        roots = [self.config.replay_output_dir]
+        for session in self.sessions.sessions.values():
+            if session.replay_mode:
+                roots.append(session.config(self.config).replay_output_dir)
+        return roots
+    
+    def on_tab_changed(self, index):
+        if 0 <= index < len(self.TABS):
+            self.ensure_tab(self.TABS[index][0])
     
     def setup_tray(self):
         """Set up system tray icon with shortcut actions"""
@@ -157,7 +412,7 @@ class GPUScreenRecorderGUI(QMainWindow):
         
         # Add shortcut actions with key sequences in the label
         save_replay_action = QAction("Save Replay (Ctrl+Shift+S)", self)
-        save_replay_action.triggered.connect(self.save_replay)
+        save_replay_action.triggered.connect(lambda: self.save_replay("tray"))
         
         toggle_record_action = QAction("Start Recording (Ctrl+Shift+R)", self)
         toggle_record_action.triggered.connect(self.toggle_recording)
@@ -165,6 +420,13 @@ class GPUScreenRecorderGUI(QMainWindow):
         toggle_pause_action = QAction("Pause/Resume (Ctrl+Shift+P)", self)
         toggle_pause_action.triggered.connect(self.toggle_pause)
         
+        save_all_action = QAction("Save Replay in All Sessions", self)
+        save_all_action.triggered.connect(self.save_all_replays)
+        
+        # Extra sessions, rebuilt each time the menu opens
+        self.sessions_menu = QMenu("Sessions")
+        self.sessions_menu.aboutToShow.connect(self.populate_sessions_menu)
+        
         # Create a shortcuts sub-menu
         shortcuts_menu = QMenu("Shortcuts")
         shortcuts_menu.addAction(save_replay_action)
@@ -178,6 +440,8 @@ class GPUScreenRecorderGUI(QMainWindow):
         tray_menu.addSeparator()
         tray_menu.addAction(toggle_record_action)  # Also keep the main toggle action in the root menu
         tray_menu.addAction(save_replay_action)    # And the save replay action
+        tray_menu.addAction(save_all_action)
+        tray_menu.addMenu(self.sessions_menu)
         tray_menu.addSeparator()
         tray_menu.addAction(quit_action)
         
@@ -193,6 +457,43 @@ class GPUScreenRecorderGUI(QMainWindow):
         self.save_replay_action = save_replay_action
         self.toggle_pause_action = toggle_pause_action
 
+    def populate_sessions_menu(self):
+        """Start/stop and save actions for every session"""
+        self.sessions_menu.clear()
+        if not self.sessions.sessions:
+            action = self.sessions_menu.addAction("No sessions (see the Sessions tab)")
+            action.setEnabled(False)
+            return
+        for name, session in self.sessions.sessions.items():
+            controller = session.controller
+            recording = controller is not None and controller.is_recording
+            menu = self.sessions_menu.addMenu(f"{name} ({session.state_name()})")
+            toggle = menu.addAction("Stop" if recording else "Start")
+            toggle.setEnabled(controller is None or not controller.is_finalizing)
+            toggle.triggered.connect(lambda checked, name=name: self.toggle_session(name))
+            save = menu.addAction("Save Replay")
+            save.setEnabled(recording and session.replay_mode)
+            save.triggered.connect(lambda checked, name=name: self.sessions.save_replay(name, "tray"))
+    
+    def toggle_session(self, name):
+        try:
+            self.sessions.toggle(name)
+        except Exception as e:
+            self.append_log(f"ERROR [{name}]: {e}")
+            self.notify("GPU Screen Recorder", f"Cannot start {name}: {e}")
+    
+    def save_all_replays(self):
+        """Save the main replay buffer and every session's"""
+        saved = []
+        if self.is_recording and self.is_replay_mode and self.controller.save_replay("tray") is not None:
+            saved.append("main")
+        saved += self.sessions.save_replay(None, "tray")
+        if saved:
+            self.append_log(f"Replay saved: {', '.join(saved)}")
+            self.notify("GPU Screen Recorder", f"Saved {len(saved)} replay{'s' if len(saved) > 1 else ''}", timeout=5000)
+        else:
+            self.notify("GPU Screen Recorder", "No replay buffer is running")
+    
     def tray_icon_activated(self, reason):
         """Handle tray icon activation (click, double-click)"""
         if reason == QSystemTrayIcon.ActivationReason.Trigger:
@@ -203,88 +504,81 @@ class GPUScreenRecorderGUI(QMainWindow):
             self.toggle_recording()
         elif reason == QSystemTrayIcon.ActivationReason.MiddleClick:
             # Middle click - save replay
-            self.save_replay()
+            self.save_replay("tray")
         
     def setup_shortcuts(self):
         """Set up application keyboard shortcuts"""
         from PyQt6.QtGui import QShortcut, QKeySequence
         
-        # Create shortcut for save replay (Ctrl+Shift+S)
-        save_shortcut = QShortcut(QKeySequence("Ctrl+Shift+S"), self)
-        save_shortcut.activated.connect(self.save_replay)
-        
-        # Create shortcut for toggle recording (Ctrl+Shift+R)
-        record_shortcut = QShortcut(QKeySequence("Ctrl+Shift+R"), self)
-        record_shortcut.activated.connect(self.toggle_recording)
-        
-        # Create shortcut for pause/resume (Ctrl+Shift+P)
-        pause_shortcut = QShortcut(QKeySequence("Ctrl+Shift+P"), self)
-        pause_shortcut.activated.connect(self.toggle_pause)
-        
-        # Store references for later
-        self.shortcuts = [save_shortcut, record_shortcut, pause_shortcut]
+        # Every shortcut goes through the dispatcher, which drops key repeat
+        # and double presses and times each action
+        self.shortcut_dispatcher = ShortcutDispatcher(self)
+        self.shortcut_dispatcher.add("save_replay", lambda: self.save_replay("shortcut"))
+        self.shortcut_dispatcher.add("toggle_recording", self.toggle_recording)
+        self.shortcut_dispatcher.add("toggle_pause", self.toggle_pause)
+        self.shortcut_dispatcher.dispatched.connect(self.on_shortcut_dispatched)
+        self.shortcut_dispatcher.dropped.connect(
+            lambda name: self.append_log(f"Shortcut {name} ignored, pressed again within its cooldown")
+        )
+        
+        self.shortcuts = []
+        for key_sequence, name in (
+            ("Ctrl+Shift+S", "save_replay"),  # Save replay
+            ("Ctrl+Shift+R", "toggle_recording"),  # Toggle recording
+            ("Ctrl+Shift+P", "toggle_pause"),  # Pause/resume
+        ):
+            shortcut = QShortcut(QKeySequence(key_sequence), self)
+            shortcut.setAutoRepeat(False)
+            shortcut.activated.connect(lambda name=name: self.shortcut_dispatcher.trigger(name))
+            self.shortcuts.append(shortcut)
         
         # Log the shortcuts
         self.append_log("Keyboard shortcuts registered: Ctrl+Shift+S (Save), Ctrl+Shift+R (Record), Ctrl+Shift+P (Pause)")
 
         
-    def build_command(self):
-        command = ["gpu-screen-recorder"]
-        
-        # Get values from UI tabs
-        try:
-            # Record tab
-            record_cmd = self.record_tab.build_command()
-            self.append_log(f"Record tab command: {record_cmd}")
-            command.extend(record_cmd)
-            
-            # Replay mode
-            if self.is_replay_mode:
-                replay_cmd = self.replay_tab.build_command()
-                self.append_log(f"Replay tab command: {replay_cmd}")
-                command.extend(replay_cmd)
-            
-            # Advanced tab
-            advanced_cmd = self.advanced_tab.build_command()
-            self.append_log(f"Advanced tab command: {advanced_cmd}")
-            command.extend(advanced_cmd)
-            
-            # Final validation
-            if "-o" not in command:
-                raise ValueError("No output path specified")
-                
-            return command
-            
-        except Exception as e:
-            self.show_error(f"Error building command: {str(e)}")
-            self.append_log(f"Error stack: {traceback.format_exc()}")
-            # Return a safe default command if error occurs
-            return ["gpu-screen-recorder", "--help"]
+    def build_command(self, replay_mode=None):
+        """Command line for the current settings, from the cached argument vector"""
+        if replay_mode is None:
+            replay_mode = self.config.replay_enabled
+        output = None if replay_mode else self.config.recording_file()
+        return self.config.to_argv(replay_mode, output)
     
     def toggle_recording(self):
         if self.is_recording:
             self.stop_recording()
-        else:
+        elif not self.controller.is_finalizing:
             self.start_recording()
     
     def start_recording(self):
         try:
             # Determine if this is replay mode or regular recording
-            self.is_replay_mode = self.replay_tab.is_replay_mode()
-            self.append_log(f"Replay mode: {self.is_replay_mode}")
+            replay_mode = self.config.replay_enabled
             
             # Build command
-            command = self.build_command()
+            command = self.build_command(replay_mode)
             
             # Log command
             self.append_log(f"Starting: {' '.join(command)}")
             
+            # Refuse a recording the storage monitor would stop straight away
+            if not replay_mode and self.config.storage_auto_stop:
+                refused = self.controller.storage.check_start(
+                    command[command.index("-o") + 1], self.config.estimated_bitrate_kbps()
+                )
+                if refused:
+                    self.show_error(refused)
+                    return
+            
             # Start the process
-            self.recorder.start(command)
+            self.fps_label.clear()
+            self.clear_bitrate()
+            self.storage_label.clear()
+            self.controller.start(
+                command, replay_mode, self.config.fps,
+                self.config.replay_save_merge_ms, self.config.estimated_bitrate_kbps()
+            )
             
             # Update UI
-            self.is_recording = True
-            self.is_paused = False
             self.start_stop_btn.setText("Stop Recording")
             self.pause_btn.setEnabled(True)
             self.pause_btn.setText("Pause")
@@ -295,15 +589,17 @@ class GPUScreenRecorderGUI(QMainWindow):
             if self.is_replay_mode:
                 self.status_label.setText("Replay buffer active")
                 # Show notification
-                self.notification_manager.notify("GPU Screen Recorder", "Replay buffer started")
+                self.notify("GPU Screen Recorder", "Replay buffer started")
             else:
                 self.status_label.setText("Recording")
                 # Show notification
-                self.notification_manager.notify("GPU Screen Recorder", "Recording started")
+                self.notify("GPU Screen Recorder", "Recording started")
             
             # Save settings
             self.save_settings()
             
+        except CommandError as e:
+            self.show_error(f"Cannot start recording: {e}")
         except Exception as e:
             import traceback
             self.show_error(f"Error starting recording: {str(e)}")
@@ -311,64 +607,133 @@ class GPUScreenRecorderGUI(QMainWindow):
     
     def stop_recording(self):
         # Stop the process
-        self.recorder.stop()
+        self.controller.stop()
         
-        # Update UI
-        self.is_recording = False
-        self.is_paused = False
+        # Update UI, Start stays off until the recorder has finished its file
         self.start_stop_btn.setText("Start Recording")
+        self.start_stop_btn.setEnabled(not self.controller.is_finalizing)
         self.pause_btn.setEnabled(False)
         self.pause_btn.setText("Pause")
         self.save_replay_btn.setEnabled(False)
         self.toggle_record_action.setText("Start Recording")
         
         # Update status
-        self.status_label.setText("Ready")
+        self.status_label.setText("Finalizing..." if self.controller.is_finalizing else "Ready")
         
         # Show notification
         if self.is_replay_mode:
-            self.notification_manager.notify("GPU Screen Recorder", "Replay buffer stopped")
+            self.notify("GPU Screen Recorder", "Replay buffer stopped")
         else:
-            self.notification_manager.notify("GPU Screen Recorder", "Recording stopped")
+            self.notify("GPU Screen Recorder", "Recording stopped")
     
     def toggle_pause(self):
         if not self.is_recording:
             return
         
-        if self.recorder.toggle_pause():
-            self.is_paused = not self.is_paused
+        if self.controller.toggle_pause():
             if self.is_paused:
                 self.pause_btn.setText("Resume")
                 self.status_label.setText("Paused")
                 # Show notification
-                self.notification_manager.notify("GPU Screen Recorder", "Recording paused")
+                self.notify("GPU Screen Recorder", "Recording paused")
             else:
                 self.pause_btn.setText("Pause")
                 self.status_label.setText("Recording" if not self.is_replay_mode else "Replay buffer active")
                 # Show notification
-                self.notification_manager.notify("GPU Screen Recorder", "Recording resumed")
+                self.notify("GPU Screen Recorder", "Recording resumed")
     
-    def save_replay(self):
+    def save_replay(self, source="button"):
         if not self.is_recording or not self.is_replay_mode:
             QMessageBox.warning(self, "Not in Replay Mode", "You need to start replay buffer first.")
             return
         
-        if self.recorder.save_replay():
-            self.append_log("Replay saved")
-            self.status_label.setText("Replay saved")
-            
-            # Show notification
-            self.notification_manager.notify("GPU Screen Recorder", "Replay saved", timeout=5000)
+        save = self.controller.save_replay(source)
+        if save is not None:
+            if save["merged"]:
+                # Same clip as the save in progress, nothing new to announce
+                self.append_log(f"Save Replay merged into save {save['id']}")
+                self.status_label.setText("Replay save merged")
+            else:
+                message = "Replay saved" if save["state"] == "writing" else "Replay save queued"
+                self.append_log(message)
+                self.status_label.setText(message)
+                
+                # Show notification
+                self.notify("GPU Screen Recorder", "Replay saved", timeout=5000,
+                            key="replay_saved", plural="{count} replays saved")
             
             # Reset after 2 seconds
             QTimer.singleShot(2000, lambda: self.status_label.setText("Replay buffer active" if self.is_recording else "Ready"))
     
+    def on_replay_landed(self, record):
+        durations = self.save_tracker.stage_durations(record)
+        self.append_log(f"Replay written to {record['path']} in {durations['total_ms']:.1f} ms")
+        if self.library is not None:
+            self.library.add_file(record["path"])
+        # Probe and thumbnail it in the background
+        self.ensure_clip_processor().request(record["path"])
+        self.post_processing.add(record["path"])
+        if "metrics_tab" in self.built_tabs:
+            self.metrics_tab.update_save_latency()
+    
+    def on_job_changed(self, job):
+        if job["state"] not in self.post_processing.FINISHED:
+            return
+        message = f"Post-processing {os.path.basename(job['clip'])}: {job['state']}"
+        if job["wall_ms"] is not None:
+            message += f" (exit {job['exit_code']}, {job['wall_ms']:.0f} ms)"
+        if job["error"]:
+            message += f", {job['error']}"
+        self.append_log(message)
+    
+    def on_replay_timed_out(self, record):
+        self.append_log("WARNING: No replay file showed up after saving")
+    
+    def on_bitrate_sampled(self, sample):
+        sampler = self.controller.bitrate_sampler
+        self.bitrate_sparkline.set_values(sampler.instant.values(), sampler.average.values())
+        self.bitrate_label.setText(
+            f"{sample['instant_kbps'] / 1000:.1f} Mbps (avg {sample['average_kbps'] / 1000:.1f})"
+        )
+    
+    def clear_bitrate(self):
+        self.bitrate_sparkline.clear()
+        self.bitrate_label.clear()
+    
+    def on_storage_sampled(self, sample):
+        if sample["free_bytes"] is None:
+            self.storage_label.clear()
+            return
+        text = f"{sample['free_bytes'] / 1024 ** 3:.1f} GB free"
+        if sample["seconds_left"] is not None:
+            text += f", {format_minutes(sample['seconds_left'])} left"
+        elif sample["clips_left"] is not None:
+            text += f", {sample['clips_left']} clips"
+        self.storage_label.setText(text)
+    
+    def on_storage_warning(self, text):
+        self.append_log(f"WARNING: {text}")
+        self.notify("GPU Screen Recorder", text, key="storage")
+    
+    def on_storage_full(self, reason):
+        """Stop the recording before the disk runs out, unless turned off"""
+        if not self.config.storage_auto_stop or not self.is_recording:
+            self.on_storage_warning(reason)
+            return
+        self.append_log(f"{reason}, stopping the recording")
+        self.stop_recording()
+        self.notify("GPU Screen Recorder", f"{reason}, recording stopped", key="storage")
+    
     def on_recording_started(self):
         self.append_log("Recording started")
     
-    def on_recording_finished(self):
-        if self.is_recording:
-            self.is_recording = False
+    def on_recording_finished(self, unexpected):
+        self.start_stop_btn.setEnabled(True)
+        self.clear_bitrate()
+        self.storage_label.clear()
+        if self.status_label.text() == "Finalizing...":
+            self.status_label.setText("Ready")
+        if unexpected:
             self.start_stop_btn.setText("Start Recording")
             self.pause_btn.setEnabled(False)
             self.save_replay_btn.setEnabled(False)
@@ -376,12 +741,49 @@ class GPUScreenRecorderGUI(QMainWindow):
             self.status_label.setText("Ready")
             self.append_log("Recording finished")
     
+    def on_recorder_crashed(self, record):
+        """Report a recorder crash, with the end of its error output"""
+        self.append_log(f"Recorder crashed after {record['run_time_s']:.1f} s (exit code {record['exit_code']})")
+        for line in record["stderr"][-10:]:
+            self.append_log(f"    {line}")
+        delay = record["restart_delay_ms"]
+        if delay is not None:
+            self.append_log(f"Restarting in {delay / 1000:.1f} s")
+            self.notify("GPU Screen Recorder", f"Recorder crashed, restarting in {delay / 1000:.0f} s")
+        elif self.controller.supervisor.circuit_open:
+            self.append_log("Too many crashes, not restarting")
+            self.notify("GPU Screen Recorder", "Recorder keeps crashing, replay buffer stopped")
+        else:
+            self.notify("GPU Screen Recorder", "Recorder crashed")
+    
+    def on_controller_state_changed(self):
+        if self.controller.is_restarting:
+            self.status_label.setText("Recorder crashed, restarting...")
+        elif self.is_recording and self.status_label.text() == "Recorder crashed, restarting...":
+            self.status_label.setText("Replay buffer active")
+    
+    def on_warm_changed(self, warm):
+        if not self.is_recording:
+            self.status_label.setText("Ready (replay buffer warm)" if warm else "Ready")
+    
+    def on_recorder_line(self, stream, text, timestamp):
+        self.append_log(text)
+    
+    def update_metrics_display(self):
+        fps = self.metrics.fps.last()
+        if fps is not None:
+            self.fps_label.setText(f"{fps:.0f} FPS, {self.metrics.dropped_total} dropped")
+        if "metrics_tab" in self.built_tabs:
+            self.metrics_tab.update_metrics(self.metrics)
+    
     def append_log(self, text):
-        current_time = datetime.now().strftime("%H:%M:%S")
-        if hasattr(self, 'log_tab'):
-            self.log_tab.append_log(f"[{current_time}] {text}")
+        self.log_batcher.add(text)
+    
+    def flush_log(self, lines):
+        if "log_tab" in self.built_tabs:
+            self.log_tab.append_lines(lines)
         else:
-            print(f"[{current_time}] {text}")
+            self.log_model.append_lines(lines)
     
     def show_error(self, error_msg):
         self.append_log(f"ERROR: {error_msg}")
@@ -392,10 +794,26 @@ class GPUScreenRecorderGUI(QMainWindow):
         self.settings.setValue("window/size", self.size())
         self.settings.setValue("window/position", self.pos())
         
-        # Save tab settings
-        self.record_tab.save_settings()
-        self.replay_tab.save_settings()
-        self.advanced_tab.save_settings()
+        self.settings.setValue("window/tab", self.tabs.currentIndex())
+        
+        # Save tab settings (tabs never opened still hold the saved values)
+        for name in ("record_tab", "replay_tab", "advanced_tab", "log_tab"):
+            if name in self.built_tabs:
+                self.built_tabs[name].save_settings()
+    
+    def showEvent(self, event):
+        # Pre-warming stops while the window is closed
+        if self.prewarmer.paused:
+            self.prewarmer.set_paused(False)
+        super().showEvent(event)
+    
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        # Everything else waits until the first frame is on screen. A queued
+        # call from showEvent() could still run before it has been painted.
+        if not self.startup_scheduled:
+            self.startup_scheduled = True
+            QTimer.singleShot(0, self.finish_startup)
     
     def closeEvent(self, event):
         # Save settings
@@ -404,6 +822,9 @@ class GPUScreenRecorderGUI(QMainWindow):
         # Stop recording if active
         if self.is_recording:
             self.stop_recording()
+        if self.session_manager is not None:
+            self.session_manager.stop_all()
+        self.prewarmer.set_paused(True)
         
         # Unregister global shortcuts
         if hasattr(self, 'shortcut_manager'):
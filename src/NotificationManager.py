@@ -1,91 +1,203 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
-import os
 import sys
-from PyQt6.QtCore import QObject, QTimer
+import time
+from collections import OrderedDict
+from PyQt6.QtCore import QObject, QTimer, QMetaType, pyqtSignal
+from PyQt6.QtDBus import QDBusConnection, QDBusMessage, QDBusArgument, QDBusPendingCallWatcher, QDBusPendingReply
 from PyQt6.QtWidgets import QSystemTrayIcon
 
+from .LatencyHistogram import LatencyHistogram
+
 class NotificationManager(QObject):
     """
     Shows desktop notifications.
     Automatically chooses between Qt tray notifications and D-Bus/libnotify
+
+    D-Bus calls are asynchronous, so a slow notification daemon never
+    blocks the GUI thread. One call is in flight at a time, at most one per
+    min_interval_ms; notifications arriving meanwhile wait in a short queue.
+    Repeats of the same notification (same key, or same title and message)
+    are coalesced: a queued one is counted in place, and one arriving while
+    the last is still on screen replaces it through replaces_id with a
+    counted message, e.g. "3 replays saved".
     """
-    
-    def __init__(self, main_window=None):
+
+    SERVICE = "org.freedesktop.Notifications"
+    PATH = "/org/freedesktop/Notifications"
+
+    dispatched = pyqtSignal()  # A notification was shown or failed
+
+    def __init__(self, main_window=None, bus=None, min_interval_ms=250, call_timeout_ms=2000,
+                 max_queued=10, max_failures=3):
         super().__init__()
         self.main_window = main_window
         self.tray_icon = None
-        self.have_dbus = False
-        
-        # Try to import dbus for better KDE integration
-        try:
-            import dbus
-            self.have_dbus = True
-            self.dbus = dbus
-            self.session_bus = dbus.SessionBus()
-            self.notification_interface = self.session_bus.get_object(
-                'org.freedesktop.Notifications', 
-                '/org/freedesktop/Notifications'
-            )
-            self.notification_service = dbus.Interface(
-                self.notification_interface, 
-                'org.freedesktop.Notifications'
-            )
-        except (ImportError, Exception) as e:
-            print(f"D-Bus notification service not available: {e}", file=sys.stderr)
-            self.have_dbus = False
-    
+        self.min_interval_ms = min_interval_ms
+        self.call_timeout_ms = call_timeout_ms
+        self.max_queued = max_queued
+        self.max_failures = max_failures
+
+        self.bus = bus or QDBusConnection.sessionBus()
+        self.have_dbus = self.bus.isConnected()
+        if not self.have_dbus:
+            print(f"D-Bus notification service not available: {self.bus.lastError().message()}", file=sys.stderr)
+
+        self.queue = OrderedDict()  # Key -> pending notification, oldest first
+        self.shown = {}  # Key -> (notification id, count, expiry in monotonic ns)
+        self.in_flight = None
+        self.last_sent_ns = 0
+        self.failures = 0  # Consecutive failed calls
+
+        # Request to reply (or to tray fallback) per notification
+        self.latency = LatencyHistogram()
+        self.sent = 0
+        self.coalesced = 0
+        self.dropped = 0
+
+        self.send_timer = QTimer(self)
+        self.send_timer.setSingleShot(True)
+        self.send_timer.timeout.connect(self._send_next)
+
     def set_tray_icon(self, tray_icon):
         """Set the tray icon to use for notifications"""
         self.tray_icon = tray_icon
-    
-    def notify(self, title, message, icon=None, timeout=3000):
+
+    def notify(self, title, message, icon=None, timeout=3000, key=None, plural=None):
         """
         Show a desktop notification
-        
+
         Args:
             title (str): Notification title
             message (str): Notification message
             icon (str): Icon name or path (optional)
             timeout (int): Timeout in milliseconds
+            key (str): Coalescing key, defaults to the title and message
+            plural (str): Message for repeats, with a {count} field (optional)
         """
-        if self.have_dbus:
-            # Use D-Bus for better KDE integration
-            try:
-                self._notify_dbus(title, message, icon, timeout)
-                return
-            except Exception as e:
-                print(f"D-Bus notification failed: {e}", file=sys.stderr)
-                # Fall through to Qt notification
-        
-        # Fallback to Qt tray notification
-        self._notify_qt(title, message, timeout)
-    
-    def _notify_dbus(self, title, message, icon=None, timeout=3000):
-        """Show notification using D-Bus"""
-        app_name = "GPU Screen Recorder"
-        replaces_id = 0  # 0 means create new notification
-        icon_name = icon or "media-record"  # Use standard icon if none provided
-        actions = []  # No actions
-        hints = {}  # No hints
-        expire_timeout = timeout  # In milliseconds
-        
-        self.notification_service.Notify(
-            app_name, replaces_id, icon_name, title, message, 
-            actions, hints, expire_timeout
-        )
-    
+        if not self.have_dbus:
+            started = time.monotonic_ns()
+            self._notify_qt(title, message, timeout)
+            self.latency.add(time.monotonic_ns() - started)
+            self.dispatched.emit()
+            return
+
+        key = key or f"{title}\0{message}"
+        pending = self.queue.get(key)
+        if pending is not None:
+            # Not sent yet, count this one in
+            pending.update(title=title, message=message, icon=icon, timeout=timeout, plural=plural)
+            pending["count"] += 1
+            self.coalesced += 1
+            return
+
+        if len(self.queue) >= self.max_queued:
+            self.queue.popitem(last=False)
+            self.dropped += 1
+        self.queue[key] = {
+            "key": key, "title": title, "message": message, "icon": icon, "timeout": timeout,
+            "plural": plural, "count": 1, "queued_ns": time.monotonic_ns(),
+        }
+        self._schedule()
+
+    def stats(self):
+        """Dispatch figures as a plain dict"""
+        return {
+            "backend": "dbus" if self.have_dbus else "tray",
+            "sent": self.sent,
+            "coalesced": self.coalesced,
+            "dropped": self.dropped,
+            "queued": len(self.queue),
+            "latency": self.latency.summary(),
+        }
+
+    def _schedule(self):
+        if self.in_flight is not None or self.send_timer.isActive() or not self.queue:
+            return
+        wait_ms = (self.last_sent_ns - time.monotonic_ns()) / 1e6 + self.min_interval_ms
+        self.send_timer.start(max(0, int(wait_ms)))
+
+    def _send_next(self):
+        if self.in_flight is not None or not self.queue:
+            return
+        _, pending = self.queue.popitem(last=False)
+        if not self.have_dbus:
+            self._fallback(pending)
+            self._schedule()
+            return
+
+        # Still on screen: replace it and count on from there
+        now = time.monotonic_ns()
+        replaces_id, count = 0, pending["count"]
+        shown = self.shown.get(pending["key"])
+        if shown is not None and shown[2] > now:
+            replaces_id, count = shown[0], shown[1] + count
+        pending["count"] = count
+
+        message = self.bus_message(pending, replaces_id)
+        watcher = QDBusPendingCallWatcher(self.bus.asyncCall(message, self.call_timeout_ms), self)
+        watcher.finished.connect(lambda watcher: self._on_reply(watcher, pending))
+        self.in_flight = watcher
+        self.last_sent_ns = now
+
+    def bus_message(self, pending, replaces_id=0):
+        """The org.freedesktop.Notifications.Notify call for a notification"""
+        text = pending["message"]
+        if pending["count"] > 1:
+            text = pending["plural"].format(count=pending["count"]) if pending["plural"] else f"{text} ({pending['count']}x)"
+        message = QDBusMessage.createMethodCall(self.SERVICE, self.PATH, self.SERVICE, "Notify")
+        message.setArguments([
+            "GPU Screen Recorder",
+            QDBusArgument(replaces_id, QMetaType.Type.UInt.value),
+            pending["icon"] or "media-record",  # Use standard icon if none provided
+            pending["title"],
+            text,
+            QDBusArgument([], QMetaType.Type.QStringList.value),  # No actions
+            {},  # No hints
+            pending["timeout"],
+        ])
+        pending["text"] = text
+        return message
+
+    def _on_reply(self, watcher, pending):
+        self.in_flight = None
+        watcher.deleteLater()
+        now = time.monotonic_ns()
+        reply = QDBusPendingReply(watcher)
+        if reply.isError():
+            print(f"D-Bus notification failed: {reply.error().message()}", file=sys.stderr)
+            self.shown.pop(pending["key"], None)
+            self.failures += 1
+            if self.failures >= self.max_failures:
+                print("Too many D-Bus notification failures, using tray notifications", file=sys.stderr)
+                self.have_dbus = False
+            self._fallback(pending)
+        else:
+            self.failures = 0
+            notification_id = reply.argumentAt(0)
+            lifetime_ms = pending["timeout"] if pending["timeout"] > 0 else 5000
+            self.shown[pending["key"]] = (notification_id, pending["count"], now + lifetime_ms * 1000000)
+            self.sent += 1
+            self.latency.add(now - pending["queued_ns"])
+            self.dispatched.emit()
+        self._schedule()
+
+    def _fallback(self, pending):
+        self._notify_qt(pending["title"], pending.get("text", pending["message"]), pending["timeout"])
+        self.latency.add(time.monotonic_ns() - pending["queued_ns"])
+        self.dispatched.emit()
+
     def _notify_qt(self, title, message, timeout=3000):
         """Show notification using Qt tray icon"""
         if self.tray_icon:
             # Show notification
             self.tray_icon.showMessage(
-                title, 
-                message, 
-                QSystemTrayIcon.MessageIcon.Information, 
+                title,
+                message,
+                QSystemTrayIcon.MessageIcon.Information,
                 timeout
             )
         else:
             # No tray icon, print to console instead
-            print(f"Notification: {title} - {message}")
\ No newline at end of file
+            print(f"Notification: {title} - {message}")
@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import itertools
+import json
+import os
+import shutil
+import signal
+import time
+from PyQt6.QtCore import QObject, QProcess, QTimer, QStandardPaths, pyqtSignal
+
+from .RecorderProcess import LineFramer
+
+def default_state_path():
+    directory = QStandardPaths.writableLocation(QStandardPaths.StandardLocation.AppDataLocation)
+    if not directory:
+        directory = os.path.join(os.path.expanduser("~"), ".local", "share", "gpu-screen-recorder")
+    os.makedirs(directory, exist_ok=True)
+    return os.path.join(directory, "post_processing_jobs.json")
+
+class PostProcessQueue(QObject):
+    """
+    Runs the post-processing script on saved clips, replacing the recorder's
+    -sc option, which started one unmanaged process per save.
+
+    The script gets the same arguments as with -sc (clip path and "replay").
+    At most post_processing_concurrency jobs run at once, under nice and
+    (when available) idle I/O priority. A job running past
+    post_processing_timeout is terminated, then killed. Failed jobs are
+    retried post_processing_retries times after retry_delay_ms. Job state
+    is kept in a JSON file, so queued jobs, and jobs cut off by a quit,
+    run again on the next start. While post-processing is disabled, queued
+    jobs stay queued and start once it is enabled again.
+
+    Job states: queued, running, done, failed, timeout, cancelled.
+    """
+
+    FINISHED = ("done", "failed", "timeout", "cancelled")
+
+    job_changed = pyqtSignal(dict)
+    jobs_changed = pyqtSignal()  # Jobs added or cleared
+
+    def __init__(self, config, state_path=None, retry_delay_ms=5000, kill_grace_ms=3000,
+                 history=200, parent=None):
+        super().__init__(parent)
+        self.config = config
+        self.state_path = state_path or default_state_path()
+        self.retry_delay_ms = retry_delay_ms
+        self.kill_grace_ms = kill_grace_ms
+        self.history = history
+
+        self.jobs = []  # Oldest first
+        self.running = {}  # Job id -> (QProcess, timeout QTimer)
+        self.ids = itertools.count(1)
+
+        # Writes are batched, a burst of saves costs one file write
+        self.save_timer = QTimer(self)
+        self.save_timer.setSingleShot(True)
+        self.save_timer.setInterval(500)
+        self.save_timer.timeout.connect(self.save)
+
+        # Wakes the queue when a retry delay runs out
+        self.retry_timer = QTimer(self)
+        self.retry_timer.setSingleShot(True)
+        self.retry_timer.timeout.connect(self.dispatch)
+
+        config.add_listener(self._on_config_changed)
+
+        self.load()
+
+    def add(self, clip, kind="replay"):
+        """
+        Queue the script for a saved clip, if post-processing is enabled.
+
+        Returns:
+            dict: The new job, or None if post-processing is off
+        """
+        config = self.config
+        if not config.post_processing_enabled or not config.post_processing_script:
+            return None
+        job = {
+            "id": next(self.ids),
+            "clip": clip,
+            "kind": kind,
+            "script": config.post_processing_script,
+            "state": "queued",
+            "attempts": 0,
+            "queued_at": time.time(),
+            "started_at": None,
+            "finished_at": None,
+            "wall_ms": None,
+            "exit_code": None,
+            "error": None,
+            "retry_at": 0,
+            "output": [],
+        }
+        self.jobs.append(job)
+        self._trim()
+        self.jobs_changed.emit()
+        self._changed(job)
+        self.dispatch()
+        return job
+
+    def get(self, job_id):
+        for job in self.jobs:
+            if job["id"] == job_id:
+                return job
+        raise ValueError(f"No job {job_id}")
+
+    def retry(self, job_id):
+        """Run a finished job again"""
+        job = self.get(job_id)
+        if job["state"] not in self.FINISHED:
+            return
+        job.update(state="queued", attempts=0, retry_at=0, error=None)
+        self._changed(job)
+        self.dispatch()
+
+    def cancel(self, job_id):
+        """Cancel a queued job or stop a running one"""
+        job = self.get(job_id)
+        if job["state"] == "queued":
+            job.update(state="cancelled", finished_at=time.time())
+            self._changed(job)
+        elif job["state"] == "running":
+            job["error"] = "cancelled"
+            self._stop(job["id"])
+
+    def clear_finished(self):
+        self.jobs = [job for job in self.jobs if job["state"] not in self.FINISHED]
+        self.jobs_changed.emit()
+        self.save_timer.start()
+
+    def counts(self):
+        """Number of jobs in each state"""
+        counts = {}
+        for job in self.jobs:
+            counts[job["state"]] = counts.get(job["state"], 0) + 1
+        return counts
+
+    def dispatch(self):
+        """Start queued jobs while there is a free slot"""
+        if not self.config.post_processing_enabled:
+            return
+        now = time.time()
+        next_retry = None
+        for job in self.jobs:
+            if len(self.running) >= max(1, self.config.post_processing_concurrency):
+                break
+            if job["state"] != "queued":
+                continue
+            if job["retry_at"] > now:
+                next_retry = min(next_retry or job["retry_at"], job["retry_at"])
+                continue
+            self._start(job)
+        if next_retry is not None and not self.retry_timer.isActive():
+            self.retry_timer.start(max(0, int((next_retry - now) * 1000)))
+
+    def command(self, job):
+        """The job's command line, wrapped in nice and ionice"""
+        config = self.config
+        argv = [job["script"], job["clip"], job["kind"]]
+        if config.post_processing_idle_io and shutil.which("ionice"):
+            argv = ["ionice", "-c", "3"] + argv
+        if config.post_processing_nice and shutil.which("nice"):
+            argv = ["nice", "-n", str(config.post_processing_nice)] + argv
+        return argv
+
+    def _start(self, job):
+        job.update(state="running", started_at=time.time(), finished_at=None, wall_ms=None,
+                   exit_code=None, error=None, output=[])
+        job["attempts"] += 1
+        job["_started_ns"] = time.monotonic_ns()
+
+        process = QProcess(self)
+        process.setProcessChannelMode(QProcess.ProcessChannelMode.MergedChannels)
+        # Lines can be split across reads
+        framer = LineFramer()
+        process.readyReadStandardOutput.connect(lambda: self._on_output(job, process, framer))
+        process.finished.connect(
+            lambda exit_code, exit_status: self._on_finished(job, exit_code, exit_status, framer)
+        )
+        process.errorOccurred.connect(lambda error: self._on_error(job, error))
+
+        # Own process group, so a stop reaches whatever the script started too
+        if hasattr(process, "setUnixProcessParameters"):
+            process.setUnixProcessParameters(QProcess.UnixProcessFlag.CreateNewSession)
+
+        timer = QTimer(self)
+        timer.setSingleShot(True)
+        timer.timeout.connect(lambda: self._on_timeout(job))
+        if self.config.post_processing_timeout > 0:
+            timer.start(self.config.post_processing_timeout * 1000)
+
+        self.running[job["id"]] = (process, timer)
+        self._changed(job)
+        argv = self.command(job)
+        process.start(argv[0], argv[1:])
+
+    def _stop(self, job_id):
+        process, timer = self.running[job_id]
+        self._signal(process, signal.SIGTERM)
+        # Escalate if the script ignores SIGTERM
+        timer.timeout.disconnect()
+        timer.timeout.connect(lambda: self._signal(process, signal.SIGKILL))
+        timer.start(self.kill_grace_ms)
+
+    def _signal(self, process, sig):
+        pid = process.processId()
+        if not pid:
+            return
+        try:
+            if hasattr(process, "setUnixProcessParameters"):
+                os.killpg(pid, sig)
+            else:
+                os.kill(pid, sig)
+        except OSError:
+            pass
+
+    def _on_output(self, job, process, framer):
+        self._add_output(job, framer.feed(process.readAllStandardOutput().data()))
+
+    def _add_output(self, job, lines):
+        if lines:
+            job["output"] = (job["output"] + lines)[-20:]
+
+    def _on_timeout(self, job):
+        job["error"] = f"timed out after {self.config.post_processing_timeout} s"
+        self._stop(job["id"])
+
+    def _on_error(self, job, error):
+        # A script that cannot be started gets no finished signal
+        if error == QProcess.ProcessError.FailedToStart and job["id"] in self.running:
+            process, _ = self.running[job["id"]]
+            job["error"] = process.errorString()
+            self._end(job, None)
+
+    def _on_finished(self, job, exit_code, exit_status, framer):
+        if job["id"] not in self.running:
+            return
+        # A last line without its newline
+        self._add_output(job, framer.flush())
+        if exit_status == QProcess.ExitStatus.CrashExit and not job["error"]:
+            job["error"] = "killed by a signal"
+        self._end(job, exit_code)
+
+    def _end(self, job, exit_code):
+        process, timer = self.running.pop(job["id"])
+        timer.stop()
+        timer.deleteLater()
+        process.deleteLater()
+
+        job["wall_ms"] = round((time.monotonic_ns() - job.pop("_started_ns")) / 1e6, 1)
+        job["exit_code"] = exit_code
+        job["finished_at"] = time.time()
+        if job["error"] == "cancelled":
+            job["state"] = "cancelled"
+        elif exit_code == 0 and not job["error"]:
+            job["state"] = "done"
+        elif job["attempts"] <= self.config.post_processing_retries:
+            job["state"] = "queued"
+            job["retry_at"] = time.time() + self.retry_delay_ms / 1000
+        else:
+            job["state"] = "timeout" if job["error"] and job["error"].startswith("timed out") else "failed"
+        self._changed(job)
+        self.dispatch()
+
+    def _on_config_changed(self, name):
+        if name in ("post_processing_enabled", "post_processing_concurrency"):
+            self.dispatch()
+
+    def _changed(self, job):
+        self.job_changed.emit(job)
+        self.save_timer.start()
+
+    def _trim(self):
+        finished = [job for job in self.jobs if job["state"] in self.FINISHED]
+        excess = len(finished) - self.history
+        if excess > 0:
+            dropped = {job["id"] for job in finished[:excess]}
+            self.jobs = [job for job in self.jobs if job["id"] not in dropped]
+
+    def load(self):
+        try:
+            with open(self.state_path) as f:
+                jobs = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            print(f"Error loading post-processing jobs: {e}")
+            return
+        for job in jobs:
+            # Cut off by the last quit: run it again, that attempt does not count
+            if job["state"] == "running":
+                job.update(state="queued", retry_at=0, attempts=max(0, job["attempts"] - 1))
+            job.pop("_started_ns", None)
+        self.jobs = jobs
+        self.ids = itertools.count(max((job["id"] for job in jobs), default=0) + 1)
+        self.jobs_changed.emit()
+        QTimer.singleShot(0, self.dispatch)
+
+    def save(self):
+        """Write the job list to disk"""
+        self.save_timer.stop()
+        jobs = [{key: value for key, value in job.items() if not key.startswith("_")} for job in self.jobs]
+        try:
+            with open(self.state_path + ".tmp", "w") as f:
+                json.dump(jobs, f)
+            os.replace(self.state_path + ".tmp", self.state_path)
+        except OSError as e:
+            print(f"Error saving post-processing jobs: {e}")
+
+    def shutdown(self, timeout=2000):
+        """Stop running scripts and save state, they run again on the next start"""
+        for process, timer in self.running.values():
+            timer.stop()
+            process.finished.disconnect()
+            process.errorOccurred.disconnect()
+            self._signal(process, signal.SIGTERM)
+            if not process.waitForFinished(timeout):
+                self._signal(process, signal.SIGKILL)
+                process.waitForFinished(500)
+        self.save()
@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+
+# Bookkeeping slots that do not affect the command line
+_INTERNAL = frozenset(("revision", "_argv_cache", "_listeners"))
+
+# Bits per pixel per frame of each quality preset, for size estimates
+_BITS_PER_PIXEL = {"medium": 0.04, "high": 0.06, "very_high": 0.09, "ultra": 0.14}
+
+@dataclass(slots=True)
+class RecorderConfig:
+    """
+    Everything needed to build a gpu-screen-recorder command line.
+
+    Plain data with no Qt dependency. The tabs write their widget values
+    into it as they change, and to_argv() is only rebuilt after a field has
+    actually changed, so starting a recording never reads the UI.
+    """
+
+    executable: str = "gpu-screen-recorder"
+
+    # Record tab
+    source: str = "portal"
+    width: int = 0
+    height: int = 0
+    original_resolution: bool = True
+    fps: int = 60
+    audio_source: str = "default_output"
+    show_cursor: bool = True
+    quality: str = "very_high"
+    output_path: str = str(Path.home() / "Videos")
+    container: str = "mp4"
+
+    # Replay tab
+    replay_enabled: bool = False
+    replay_buffer_size: int = 60
+    replay_container: str = "mp4"
+    replay_restart_on_save: bool = False
+    replay_date_folders: bool = True
+    replay_output_dir: str = str(Path.home() / "Videos" / "Replays")
+    replay_prewarm: bool = False
+    replay_save_merge_ms: int = 500  # Save Replay presses this close together make one clip
+
+    # Post-processing, run by the app's job queue rather than the recorder
+    post_processing_enabled: bool = False
+    post_processing_script: str = ""
+    post_processing_concurrency: int = 1
+    post_processing_nice: int = 10
+    post_processing_idle_io: bool = True
+    post_processing_timeout: int = 300
+    post_processing_retries: int = 1
+
+    # Storage
+    storage_auto_stop: bool = True  # Stop a recording before its disk fills up
+
+    # Advanced tab
+    video_codec: str = "auto"
+    frame_mode: str = "vfr"
+    audio_codec: str = "opus"
+    audio_auto_bitrate: bool = True
+    audio_bitrate: int = 128
+    bitrate_mode: str = "auto"
+    cbr_bitrate: int = 15000
+    color_range: str = "limited"
+    keyframe_interval: float = 2.0
+    encoder: str = "gpu"
+    overclock: bool = False
+    restore_portal_session: bool = False
+    verbose: bool = True
+
+    # Bumped on every change, so holders of an argv can tell it is stale
+    revision: int = field(default=0, init=False, repr=False, compare=False)
+    # replay_mode -> (argv, index of the -o value)
+    _argv_cache: dict = field(default_factory=dict, init=False, repr=False, compare=False)
+    # Called with the field name after every change
+    _listeners: list = field(default_factory=list, init=False, repr=False, compare=False)
+
+    def __setattr__(self, name: str, value) -> None:
+        if name in _INTERNAL:
+            object.__setattr__(self, name, value)
+            return
+        try:
+            if getattr(self, name) == value:
+                return
+        except AttributeError:
+            pass  # First assignment, from __init__
+        object.__setattr__(self, name, value)
+        object.__setattr__(self, "_argv_cache", {})
+        object.__setattr__(self, "revision", getattr(self, "revision", 0) + 1)
+        for callback in getattr(self, "_listeners", ()):
+            callback(name)
+
+    def add_listener(self, callback) -> None:
+        """Call callback(name) after every change to a field"""
+        self._listeners.append(callback)
+
+    @classmethod
+    def from_settings(cls, settings) -> "RecorderConfig":
+        """
+        Load the config from QSettings, using the same keys and defaults
+        as the Record, Replay and Advanced tabs.
+
+        Args:
+            settings (QSettings): Application settings
+
+        Returns:
+            RecorderConfig: The saved configuration
+        """
+        def flag(key, default):
+            return settings.value(key, default, type=bool)
+
+        defaults = cls()
+        return cls(
+            source=settings.value("capture/source", defaults.source),
+            width=int(settings.value("capture/width", defaults.width)),
+            height=int(settings.value("capture/height", defaults.height)),
+            original_resolution=flag("capture/original_resolution", defaults.original_resolution),
+            fps=int(settings.value("capture/fps", defaults.fps)),
+            audio_source=settings.value("audio/source", defaults.audio_source),
+            show_cursor=flag("video/show_cursor", defaults.show_cursor),
+            quality=settings.value("video/quality", defaults.quality),
+            output_path=settings.value("output/path", defaults.output_path),
+            container=settings.value("output/container", defaults.container),
+            replay_enabled=flag("replay/enabled", defaults.replay_enabled),
+            replay_buffer_size=int(settings.value("replay/buffer_size", defaults.replay_buffer_size)),
+            replay_container=settings.value("replay/container", defaults.replay_container),
+            replay_restart_on_save=flag("replay/restart_on_save", defaults.replay_restart_on_save),
+            replay_date_folders=flag("replay/date_folders", defaults.replay_date_folders),
+            replay_output_dir=settings.value("replay/output_dir", defaults.replay_output_dir),
+            post_processing_enabled=flag("post_processing/enabled", defaults.post_processing_enabled),
+            post_processing_script=settings.value("post_processing/script", defaults.post_processing_script),
+            post_processing_concurrency=int(settings.value("post_processing/concurrency", defaults.post_processing_concurrency)),
+            post_processing_nice=int(settings.value("post_processing/nice", defaults.post_processing_nice)),
+            post_processing_idle_io=flag("post_processing/idle_io", defaults.post_processing_idle_io),
+            post_processing_timeout=int(settings.value("post_processing/timeout", defaults.post_processing_timeout)),
+            post_processing_retries=int(settings.value("post_processing/retries", defaults.post_processing_retries)),
+            storage_auto_stop=flag("storage/auto_stop", defaults.storage_auto_stop),
+            replay_prewarm=flag("replay/prewarm", defaults.replay_prewarm),
+            replay_save_merge_ms=int(settings.value("replay/save_merge_ms", defaults.replay_save_merge_ms)),
+            video_codec=settings.value("video/codec", defaults.video_codec),
+            frame_mode=settings.value("capture/frame_mode", defaults.frame_mode),
+            audio_codec=settings.value("audio/codec", defaults.audio_codec),
+            audio_auto_bitrate=flag("audio/auto_bitrate", defaults.audio_auto_bitrate),
+            audio_bitrate=int(settings.value("audio/bitrate", defaults.audio_bitrate)),
+            bitrate_mode=settings.value("video/bitrate_mode", defaults.bitrate_mode),
+            cbr_bitrate=int(settings.value("video/cbr_bitrate", defaults.cbr_bitrate)),
+            color_range=settings.value("video/color_range", defaults.color_range),
+            keyframe_interval=float(settings.value("advanced/keyframe_interval", defaults.keyframe_interval)),
+            encoder=settings.value("advanced/encoder", defaults.encoder),
+            overclock=flag("advanced/overclock", defaults.overclock),
+            restore_portal_session=flag("advanced/restore_portal_session", defaults.restore_portal_session),
+            verbose=flag("advanced/verbose", defaults.verbose),
+        )
+
+    def to_argv(self, replay_mode: bool | None = None, output: str | None = None) -> list[str]:
+        """
+        Full gpu-screen-recorder command line.
+
+        Args:
+            replay_mode (bool): Build a replay buffer command (defaults to replay_enabled)
+            output (str): Replace the -o value, e.g. with a timestamped file name
+
+        Returns:
+            list: A fresh copy of the cached argument vector
+        """
+        if replay_mode is None:
+            replay_mode = self.replay_enabled
+        cached = self._argv_cache.get(replay_mode)
+        if cached is None:
+            cached = self._argv_cache[replay_mode] = self._build(replay_mode)
+        argv, output_index = cached
+        argv = list(argv)
+        if output is not None:
+            argv[output_index] = output
+        return argv
+
+    def recording_file(self, now: float | None = None) -> str:
+        """
+        Output file for a regular recording. A directory (or a path with no
+        file extension) gets a new timestamped file name each time, a file
+        path is used as is.
+        """
+        if os.path.splitext(self.output_path)[1] and not os.path.isdir(self.output_path):
+            return self.output_path
+        name = time.strftime("Video_%Y-%m-%d_%H-%M-%S", time.localtime(now))
+        return os.path.join(self.output_path, f"{name}.{self.container}")
+
+    def estimated_bitrate_kbps(self) -> int:
+        """
+        Rough write rate of a recording with these settings, video plus audio.
+        Exact in CBR mode; the quality presets are guessed from bits per
+        pixel, with 1920x1080 assumed for the original resolution.
+        """
+        if self.bitrate_mode == "cbr":
+            video = self.cbr_bitrate
+        else:
+            width, height = (1920, 1080)
+            if not self.original_resolution and self.width > 0 and self.height > 0:
+                width, height = self.width, self.height
+            bits_per_pixel = _BITS_PER_PIXEL.get(self.quality, _BITS_PER_PIXEL["very_high"])
+            video = width * height * self.fps * bits_per_pixel / 1000
+        audio = 0
+        if self.audio_source:
+            audio = 128 if self.audio_auto_bitrate else self.audio_bitrate
+        return int(video + audio)
+
+    def _build(self, replay_mode: bool) -> tuple[tuple[str, ...], int]:
+        argv = [self.executable, "-w", self.source]
+        if not self.original_resolution and self.width > 0 and self.height > 0:
+            argv += ["-s", f"{self.width}x{self.height}"]
+        argv += ["-f", str(self.fps)]
+        if self.audio_source:
+            argv += ["-a", self.audio_source]
+        argv += ["-cursor", "yes" if self.show_cursor else "no"]
+        # In CBR mode -q is the bitrate instead of a quality preset
+        argv += ["-q", str(self.cbr_bitrate) if self.bitrate_mode == "cbr" else self.quality]
+
+        if replay_mode:
+            argv += ["-r", str(self.replay_buffer_size)]
+            argv += ["-c", self.replay_container]
+            argv += ["-restart-replay-on-save", "yes" if self.replay_restart_on_save else "no"]
+            if self.replay_date_folders:
+                argv += ["-df", "yes"]
+            # No -sc: saved replays go through PostProcessQueue instead
+            argv += ["-o", self.replay_output_dir]
+        else:
+            argv += ["-c", self.container]
+            argv += ["-o", self.output_path]
+        output_index = len(argv) - 1
+
+        argv += ["-k", self.video_codec]
+        argv += ["-fm", self.frame_mode]
+        argv += ["-ac", self.audio_codec]
+        if not self.audio_auto_bitrate:
+            argv += ["-ab", str(self.audio_bitrate)]
+        argv += ["-bm", self.bitrate_mode]
+        argv += ["-cr", self.color_range]
+        argv += ["-keyint", str(self.keyframe_interval)]
+        argv += ["-encoder", self.encoder]
+        if self.overclock:
+            argv += ["-oc", "yes"]
+        if self.restore_portal_session:
+            argv += ["-restore-portal-session", "yes"]
+        argv += ["-v", "yes" if self.verbose else "no"]
+
+        return tuple(argv), output_index
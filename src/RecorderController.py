@@ -0,0 +1,448 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import time
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+
+from .BitrateSampler import BitrateSampler
+from .CommandValidator import validate_command
+from .LatencyHistogram import LatencyHistogram
+from .RecorderProcess import GPUScreenRecorderProcess, RecorderState
+from .RecorderMetrics import RecorderMetrics
+from .RecorderSupervisor import RecorderSupervisor
+from .SaveLatencyTracker import SaveLatencyTracker
+from .SaveQueue import SaveQueue
+from .StorageMonitor import StorageMonitor
+
+class RecorderController(QObject):
+    """
+    Owns a gpu-screen-recorder process and its recording state.
+    Has no widgets, so the main window and the headless daemon drive
+    recordings through the same code.
+    """
+
+    started = pyqtSignal()
+    finished = pyqtSignal(bool)  # True if the recorder exited on its own
+    state_changed = pyqtSignal()
+    error = pyqtSignal(str)
+    message = pyqtSignal(str)  # Log messages
+    warm_changed = pyqtSignal(bool)  # A pre-warmed replay buffer came up or went away
+    warm_exited = pyqtSignal()  # The pre-warmed replay buffer died on its own
+    crashed = pyqtSignal(dict)  # Crash record from the supervisor
+    finalized = pyqtSignal(float, bool)  # ms from stop to exit, killed with SIGKILL
+    line = pyqtSignal(str, str, 'qint64')  # stream, text, monotonic ns
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+
+        # Process
+        self.recorder = GPUScreenRecorderProcess(parent=self)
+        self.recorder.signals.started.connect(self._on_started)
+        self.recorder.signals.finalized.connect(self._on_finalized)
+        self.recorder.signals.finished.connect(self._on_finished)
+        self.recorder.signals.error.connect(self.error)
+        self.recorder.signals.line.connect(self._on_line)
+
+        # Live metrics parsed from verbose recorder output
+        self.metrics = RecorderMetrics(parent=self)
+
+        # Timing of the save replay path, up to the clip landing on disk
+        self.save_tracker = SaveLatencyTracker(parent=self)
+
+        # One save at a time, bursts merged
+        self.save_queue = SaveQueue(self.save_tracker, self.recorder.save_replay, parent=self)
+
+        # Measured bitrate of the output, from file growth or saved clips
+        self.bitrate_sampler = BitrateSampler(parent=self)
+        self.save_queue.clip_ready.connect(lambda record: self.bitrate_sampler.clip_saved(record["path"]))
+
+        # Free space left for the output. The owner decides what to do
+        # with its stop_requested signal.
+        self.storage = StorageMonitor(self.bitrate_sampler, parent=self)
+        self.bitrate_kbps = 0
+
+        # Recording state
+        self.is_recording = False
+        self.is_replay_mode = False
+        self.command = None
+        self.output_path = None
+        self.started_at = None
+
+        # Between stop() and the process exiting, while the file is finished off
+        self.is_finalizing = False
+        self.finalize_times = LatencyHistogram()
+
+        # Crash detection and automatic restarts
+        self.supervisor = RecorderSupervisor()
+        self.is_restarting = False
+        self.target_fps = 0
+        self.restart_timer = QTimer(self)
+        self.restart_timer.setSingleShot(True)
+        self.restart_timer.timeout.connect(self._restart)
+
+        # Pre-warmed replay buffer, running but not yet shown as recording
+        self.is_warm = False
+        self.warm_command = None
+
+        # A killed warm buffer exits asynchronously. A launch asked for in
+        # the meantime waits here, as (command, warm), until it is gone.
+        self.is_discarding = False
+        self.pending_launch = None
+
+    def start(self, command, replay_mode=False, target_fps=0, save_merge_ms=None, bitrate_kbps=0):
+        """
+        Start the recorder. If a discarded warm buffer has not exited yet,
+        the launch waits for its finished signal.
+
+        Args:
+            command (list): Full gpu-screen-recorder command line
+            replay_mode (bool): Whether the command runs a replay buffer
+            target_fps (int): Configured frame rate, for dropped frame counting
+            save_merge_ms (int): Merge window for Save Replay requests (optional)
+            bitrate_kbps (int): Expected write rate, for the storage monitor
+
+        Raises:
+            CommandError: If the command is rejected before launch
+            RuntimeError: If the previous recording is still finalizing, or the
+                recorder could not be launched
+        """
+        if self.is_finalizing:
+            raise RuntimeError("The previous recording is still being finalized")
+
+        # Fail here rather than after a process round trip
+        command, warnings = validate_command(command)
+        for warning in warnings:
+            self.message.emit(f"Command adjusted: {warning}")
+
+        if save_merge_ms is not None:
+            self.save_queue.merge_ms = save_merge_ms
+        self.metrics.reset()
+        frame_mode = command[command.index("-fm") + 1] if "-fm" in command else "vfr"
+        self.metrics.set_target_fps(target_fps, frame_mode != "cfr")
+        self.target_fps = target_fps
+        self.bitrate_kbps = bitrate_kbps
+        self.supervisor.session_start()
+
+        if self.is_warm:
+            if replay_mode and command == self.warm_command:
+                # Already running with these settings, just take it over
+                self.is_warm = False
+                self.warm_command = None
+                self._set_recording(command, replay_mode)
+                self.warm_changed.emit(False)
+                self.started.emit()
+                return
+            self.message.emit("Pre-warmed replay buffer is out of date, restarting it")
+            self.discard_warm()
+
+        if self.is_discarding:
+            self.pending_launch = (command, False)
+            self._set_recording(command, replay_mode)
+            return
+
+        try:
+            self.recorder.start(command)
+        except RuntimeError:
+            self.supervisor.session_stop()
+            raise
+        self._set_recording(command, replay_mode)
+
+    def prewarm(self, command):
+        """
+        Start a replay buffer in the background, so a later start() with
+        the same command takes it over instead of launching a new process.
+
+        Args:
+            command (list): Full gpu-screen-recorder replay command line
+
+        Returns:
+            bool: True if a process was started, or queued behind one being discarded
+        """
+        if self.is_recording or self.is_warm:
+            return False
+        try:
+            command, _ = validate_command(command)
+        except ValueError as e:
+            self.message.emit(f"Not pre-warming the replay buffer: {e}")
+            return False
+
+        if self.is_discarding:
+            # Replaces any warm launch already waiting, its settings are older
+            self.pending_launch = (command, True)
+            return True
+        if self.recorder.is_running():
+            return False
+        return self._start_warm(command)
+
+    def _start_warm(self, command):
+        try:
+            self.recorder.start(command)
+        except RuntimeError as e:
+            self.message.emit(f"Not pre-warming the replay buffer: {e}")
+            return False
+        self.warm_command = command
+        self.is_warm = True
+        self.warm_changed.emit(True)
+        return True
+
+    def warm_matches(self, command):
+        """Whether the pre-warmed process runs exactly this command line"""
+        if not self.is_warm:
+            return False
+        try:
+            return validate_command(command)[0] == self.warm_command
+        except ValueError:
+            return False
+
+    def discard_warm(self):
+        """
+        Stop the pre-warmed replay buffer, if there is one. It is killed
+        without waiting, anything launched before it has exited is queued.
+        """
+        if self.pending_launch is not None and self.pending_launch[1]:
+            self.pending_launch = None
+        if not self.is_warm:
+            return
+        # Cleared first, so the exit is not reported as unexpected.
+        # A replay buffer nobody used has nothing to finalize, so kill it.
+        self.is_warm = False
+        self.is_discarding = self.recorder.kill()
+        if not self.is_discarding:
+            self.warm_command = None
+        self.warm_changed.emit(False)
+
+    def _launch_pending(self):
+        if self.pending_launch is None:
+            return
+        command, warm = self.pending_launch
+        self.pending_launch = None
+        if warm:
+            self._start_warm(command)
+            return
+        try:
+            self.recorder.start(command)
+        except RuntimeError as e:
+            self._end_session(str(e))
+
+    def _set_recording(self, command, replay_mode):
+        self.command = list(command)
+        self.output_path = command[command.index("-o") + 1] if "-o" in command else None
+        self.save_queue.output_dir = self.output_path
+        self.is_recording = True
+        self.is_replay_mode = replay_mode
+        self.started_at = time.monotonic()
+        if self.output_path:
+            clip_seconds = int(command[command.index("-r") + 1]) if "-r" in command else 0
+            self.bitrate_sampler.start(self.output_path, replay_mode, clip_seconds)
+            self.storage.start(self.output_path, replay_mode, self.bitrate_kbps, clip_seconds)
+        self.state_changed.emit()
+
+    def stop(self):
+        """
+        Stop the recorder without waiting for it. The finished signal
+        follows once the recorder has written out its file.
+        """
+        # Cleared first, so the finished signal is not taken for a crash
+        self.is_recording = False
+        self.is_restarting = False
+        self.restart_timer.stop()
+        self.supervisor.session_stop()
+        self.bitrate_sampler.stop()
+        self.storage.stop()
+        if self.pending_launch is not None:
+            # Never launched, the discarded buffer is still on its way out
+            self.pending_launch = None
+            self.save_queue.cancel_all(keep_current=False)
+            self.state_changed.emit()
+            self.finished.emit(False)
+            return
+        self.is_finalizing = self.recorder.stop()
+        self.state_changed.emit()
+
+    def finish_pending(self, timeout=10000):
+        """
+        Block until a stopping recorder has exited, for use at quit time.
+        A recording still running is stopped first, a warm buffer killed.
+        """
+        if self.is_warm or self.pending_launch is not None:
+            self.discard_warm()
+        if self.is_recording:
+            self.stop()
+        if self.is_finalizing or self.is_discarding:
+            self.recorder.wait_for_finished(timeout)
+
+    def toggle_pause(self):
+        """
+        Pause or resume the recording.
+
+        Returns:
+            bool: True if the recorder was signalled
+        """
+        if not self.is_recording:
+            return False
+        if not self.recorder.toggle_pause():
+            return False
+        self.metrics.paused = self.is_paused
+        self.state_changed.emit()
+        return True
+
+    def save_replay(self, source="api"):
+        """
+        Ask the replay buffer to save a clip. Saves go through the SaveQueue,
+        so this one may wait for the previous clip or be merged into it.
+
+        Returns:
+            dict: The save from the queue, or None if the recorder could not be signalled
+        """
+        if not self.is_recording or not self.is_replay_mode or self.is_restarting:
+            return None
+        return self.save_queue.request(source)
+
+    @property
+    def is_paused(self):
+        # Follows the process, which only changes state once SIGUSR2 was delivered
+        return self.recorder.state.current == RecorderState.PAUSED
+
+    def state_name(self):
+        if not self.is_recording:
+            if self.is_finalizing:
+                return "finalizing"
+            return "warm" if self.is_warm else "idle"
+        if self.is_restarting:
+            return "restarting"
+        if self.is_paused:
+            return "paused"
+        return "replay" if self.is_replay_mode else "recording"
+
+    def status(self):
+        """Return the current state as a plain dict"""
+        return {
+            "state": self.state_name(),
+            "recording": self.is_recording,
+            "replay_mode": self.is_replay_mode,
+            "paused": self.is_paused,
+            "finalizing": self.is_finalizing,
+            "warm": self.is_warm,
+            "process_state": self.recorder.state.current,
+            "pid": self.recorder.pid if self.is_recording else None,
+            "uptime_s": round(time.monotonic() - self.started_at, 3) if self.is_recording else None,
+            "output": self.output_path,
+            "storage": self.storage.snapshot() if self.is_recording else None,
+            "supervisor": self.supervisor.summary(),
+        }
+
+    def metrics_snapshot(self):
+        """Capture metrics plus save replay latency as a plain dict"""
+        snapshot = self.metrics.snapshot()
+        snapshot["save_replay"] = self.save_tracker.histogram.summary()
+        snapshot["saves"] = self.save_queue.snapshot()[-10:]
+        snapshot["finalize"] = self.finalize_times.summary()
+        snapshot["bitrate"] = self.bitrate_sampler.snapshot()
+        snapshot["timeline"] = self.recorder.state.timeline()
+        snapshot["time_by_state"] = self.recorder.state.time_by_state()
+        return snapshot
+
+    def _on_line(self, stream, text, timestamp):
+        self.metrics.feed_line(stream, text, timestamp)
+        self.supervisor.add_line(stream, text)
+        # gpu-screen-recorder prints the path of every saved replay
+        if text.startswith("/"):
+            if self.save_tracker.pending:
+                self.save_tracker.file_reported(text.strip())
+            self.save_queue.file_reported(text.strip())
+        self.line.emit(stream, text, timestamp)
+
+    def _on_started(self):
+        if self.is_restarting:
+            self.is_restarting = False
+            self.metrics.paused = False
+            self.supervisor.run_start()
+            self.message.emit(f"Recorder restarted (restart {self.supervisor.restarts})")
+            self.state_changed.emit()
+            return
+        # A pre-warmed process is announced when it is taken over
+        if not self.is_warm:
+            self.started.emit()
+
+    def _restart(self):
+        if self.is_recording and self.is_restarting:
+            try:
+                self.recorder.start(self.command, restart=True)
+            except RuntimeError as e:
+                # Called from a timer, end the session instead of raising
+                self._end_session(str(e))
+
+    def _end_session(self, error):
+        """End a session whose process could not be launched"""
+        self.error.emit(error)
+        self.is_recording = False
+        self.is_restarting = False
+        self.supervisor.session_stop()
+        self.save_queue.cancel_all(keep_current=False)
+        self.bitrate_sampler.stop()
+        self.storage.stop()
+        self.state_changed.emit()
+        self.finished.emit(True)
+
+    def _on_finalized(self, duration_ns, killed):
+        if self.warm_command is not None:
+            return
+        self.finalize_times.add(duration_ns)
+        duration_ms = duration_ns / 1e6
+        self.message.emit(
+            f"Recorder finalized in {duration_ms:.0f} ms" + (", killed after timeout" if killed else "")
+        )
+        self.finalized.emit(duration_ms, killed)
+
+    def _on_finished(self, exit_code, crashed):
+        if self.is_discarding:
+            # The killed warm buffer is gone, whatever waited on it can start
+            self.is_discarding = False
+            self.warm_command = None
+            self._launch_pending()
+            return
+        if self.warm_command is not None:
+            # The pre-warmed process went away on its own
+            if self.is_warm:
+                self.is_warm = False
+                self.message.emit("Pre-warmed replay buffer exited")
+                self.warm_changed.emit(False)
+                self.warm_exited.emit()
+            self.warm_command = None
+            return
+
+        if self.is_recording and self.recorder.launch_failed:
+            # A missing or broken executable will not start on a retry either,
+            # the process already reported the error
+            self.supervisor.session_stop()
+        elif self.is_recording:
+            record, delay = self.supervisor.on_exit(exit_code, crashed, self.is_replay_mode)
+            if record["crashed"]:
+                self.crashed.emit(record)
+            if delay is not None:
+                # Keep the session, bring the process back after a delay
+                self.save_queue.cancel_all(keep_current=False)
+                self.is_restarting = True
+                self.restart_timer.start(delay)
+                self.state_changed.emit()
+                return
+            self.supervisor.session_stop()
+
+        self.bitrate_sampler.stop()
+        self.storage.stop()
+        # A clean stop still writes out a clip already asked for
+        self.save_queue.cancel_all(keep_current=self.is_finalizing)
+        unexpected = self.is_recording
+        finalized = self.is_finalizing
+        self.is_recording = False
+        self.is_finalizing = False
+        if unexpected or finalized:
+            self.message.emit(f"Session time by state: {self._format_times()}")
+            self.state_changed.emit()
+        self.finished.emit(unexpected)
+
+    def _format_times(self):
+        parts = []
+        for state, ms in self.recorder.state.time_by_state().items():
+            parts.append(f"{state} {ms / 1000:.1f} s" if ms >= 1000 else f"{state} {ms:.0f} ms")
+        return ", ".join(parts)
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import re
+from array import array
+from PyQt6.QtCore import QObject, pyqtSignal
+
+class TimeSeries:
+    """
+    Fixed-size rolling series of (monotonic ns, value) samples.
+    Backed by two preallocated arrays used as a ring buffer.
+    """
+
+    def __init__(self, capacity=300):
+        self.capacity = capacity
+        self.times = array("q", [0] * capacity)
+        self.samples = array("d", [0.0] * capacity)
+        self.start = 0
+        self.count = 0
+
+    def append(self, timestamp, value):
+        """Add a sample, dropping the oldest one when full"""
+        index = (self.start + self.count) % self.capacity
+        self.times[index] = timestamp
+        self.samples[index] = value
+        if self.count < self.capacity:
+            self.count += 1
+        else:
+            self.start = (self.start + 1) % self.capacity
+
+    def values(self):
+        """Return the samples, oldest first"""
+        return [self.samples[(self.start + i) % self.capacity] for i in range(self.count)]
+
+    def last(self, default=None):
+        if not self.count:
+            return default
+        return self.samples[(self.start + self.count - 1) % self.capacity]
+
+    def average(self, default=None):
+        if not self.count:
+            return default
+        return sum(self.values()) / self.count
+
+    def minimum(self, default=None):
+        if not self.count:
+            return default
+        return min(self.values())
+
+    def clear(self):
+        self.start = 0
+        self.count = 0
+
+class RecorderMetrics(QObject):
+    """
+    Parses gpu-screen-recorder's verbose (-v yes) output into metrics.
+    The recorder prints an "update fps: N, damage fps: N" line every second;
+    those feed rolling FPS series. With a constant frame rate, frames
+    missing against the configured rate are counted as dropped. With a
+    variable frame rate a static screen legitimately produces fewer frames,
+    so only damaged (changed) frames that were not captured count. Samples
+    taken while paused are skipped. gsr info/warning/error lines are kept
+    as the encoder status.
+    """
+
+    FPS_RE = re.compile(r"update fps:\s*(\d+)(?:,\s*damage fps:\s*(\d+))?")
+    STATUS_RE = re.compile(r"^gsr (info|warning|error):\s*(.*)")
+
+    updated = pyqtSignal()
+
+    def __init__(self, capacity=300, parent=None):
+        super().__init__(parent)
+        self.fps = TimeSeries(capacity)
+        self.damage_fps = TimeSeries(capacity)
+        self.dropped = TimeSeries(capacity)
+        self.target_fps = 0
+        self.variable_fps = False
+        self.reset()
+
+    def reset(self):
+        """Forget everything from the previous session"""
+        self.fps.clear()
+        self.damage_fps.clear()
+        self.dropped.clear()
+        self.dropped_total = 0
+        self.paused = False
+        self.encoder_status = ""
+        self.warnings = 0
+        self.errors = 0
+
+    def set_target_fps(self, fps, variable=False):
+        """
+        Frame rate the recorder was asked for, used to count dropped frames.
+
+        Args:
+            fps (int): Configured frame rate, 0 to not count drops
+            variable (bool): Whether the recorder runs with a variable frame rate (-fm vfr)
+        """
+        self.target_fps = fps
+        self.variable_fps = variable
+
+    def feed_line(self, stream, text, timestamp):
+        """
+        Inspect one line of recorder output.
+
+        Returns:
+            bool: True if the line was recognized
+        """
+        if "fps:" in text:
+            match = self.FPS_RE.search(text)
+            if match:
+                if self.paused:
+                    # A paused recorder reports 0 fps, that is not a drop
+                    return True
+                fps = int(match.group(1))
+                damage_fps = int(match.group(2)) if match.group(2) is not None else None
+                self.fps.append(timestamp, fps)
+                if damage_fps is not None:
+                    self.damage_fps.append(timestamp, damage_fps)
+                if not self.target_fps:
+                    expected = fps
+                elif self.variable_fps:
+                    # Only changed frames are owed, unknown without a damage count
+                    expected = min(self.target_fps, damage_fps) if damage_fps is not None else fps
+                else:
+                    expected = self.target_fps
+                dropped = max(0, expected - fps)
+                self.dropped.append(timestamp, dropped)
+                self.dropped_total += dropped
+                self.updated.emit()
+                return True
+
+        if text.startswith("gsr "):
+            match = self.STATUS_RE.match(text)
+            if match:
+                level, message = match.groups()
+                if level == "warning":
+                    self.warnings += 1
+                elif level == "error":
+                    self.errors += 1
+                self.encoder_status = f"{level}: {message}"
+                self.updated.emit()
+                return True
+
+        return False
+
+    def snapshot(self):
+        """Return the current metrics as a plain dict"""
+        return {
+            "fps": self.fps.last(),
+            "fps_average": self.fps.average(),
+            "fps_minimum": self.fps.minimum(),
+            "damage_fps": self.damage_fps.last(),
+            "target_fps": self.target_fps,
+            "dropped_frames": self.dropped_total,
+            "encoder_status": self.encoder_status,
+            "warnings": self.warnings,
+            "errors": self.errors,
+        }
@@ -1,63 +1,381 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
+import codecs
 import os
 import signal
-from PyQt6.QtCore import QProcess, pyqtSignal, QObject
+import time
+from collections import deque
+from PyQt6 import sip
+from PyQt6.QtCore import QProcess, QTimer, pyqtSignal, QObject
 
 class ProcessSignals(QObject):
     started = pyqtSignal()
-    finished = pyqtSignal()
+    finished = pyqtSignal(int, bool)  # exit code, killed by a signal
+    finalized = pyqtSignal('qint64', bool)  # ns from stop() to exit, escalated to SIGKILL
     error = pyqtSignal(str)
-    output = pyqtSignal(str)
+    line = pyqtSignal(str, str, 'qint64')  # stream ("stdout"/"stderr"), text, monotonic ns
+    state_changed = pyqtSignal(str, str, 'qint64')  # previous state, new state, monotonic ns
+
+class LineFramer:
+    """
+    Turns a byte stream into complete lines.
+    Bytes accumulate in a reusable bytearray and are only decoded once a
+    newline arrives, through an incremental UTF-8 decoder, so lines split
+    across reads (or in the middle of a multibyte character) come out whole.
+    Lines end at "\n" only, a "\r" before it is dropped; a lone "\r" (as in
+    a progress line) stays part of the line.
+    """
 
-class GPUScreenRecorderProcess:
     def __init__(self):
-        self.process = QProcess()
-        self.signals = ProcessSignals()
+        self.buffer = bytearray()
+        self.decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+
+    def feed(self, data):
+        """
+        Add bytes to the stream.
+
+        Returns:
+            list: Complete lines, without line endings
+        """
+        self.buffer += data
+        end = self.buffer.rfind(b"\n")
+        if end < 0:
+            return []
+        with memoryview(self.buffer) as view:
+            text = self.decoder.decode(view[:end + 1])
+        del self.buffer[:end + 1]
+        return self._split(text[:-1])
+
+    def flush(self):
+        """Return whatever is left as a final line (if anything) and reset"""
+        text = self.decoder.decode(bytes(self.buffer), final=True)
+        self.buffer.clear()
+        self.decoder.reset()
+        return self._split(text) if text else []
+
+    @staticmethod
+    def _split(text):
+        return [line[:-1] if line.endswith("\r") else line for line in text.split("\n")]
+
+class RecorderState:
+    """
+    Lifecycle of the recorder process, with a timestamped transition log.
+
+    idle -> starting -> running <-> paused, then stopping (SIGTERM sent,
+    the recorder is writing out its file) -> finalizing (the process has
+    exited, output is drained) -> idle, or failed when it exited on its
+    own with an error or had to be killed. A failed process can be started
+    again; an automatic restart continues the same session log, so it shows
+    where wall-clock time went from the manual start to the final exit,
+    restart back-offs included.
+    """
+
+    IDLE = "idle"
+    STARTING = "starting"
+    RUNNING = "running"
+    PAUSED = "paused"
+    STOPPING = "stopping"
+    FINALIZING = "finalizing"
+    FAILED = "failed"
+
+    TRANSITIONS = {
+        IDLE: {STARTING},
+        STARTING: {RUNNING, STOPPING, FAILED},
+        RUNNING: {PAUSED, STOPPING, FINALIZING},
+        PAUSED: {RUNNING, STOPPING, FINALIZING},
+        STOPPING: {FINALIZING, FAILED},
+        FINALIZING: {IDLE, FAILED},
+        FAILED: {STARTING},
+    }
+
+    def __init__(self, history=20):
+        self.current = self.IDLE
+        self.entered = time.monotonic_ns()
+        self.log = []  # (state, monotonic ns, note) for the current session
+        self.sessions = deque(maxlen=history)  # Logs of earlier sessions
+
+    def can_enter(self, state):
+        return state in self.TRANSITIONS[self.current]
+
+    def enter(self, state, note="", restart=False):
+        """
+        Move to another state.
+
+        Args:
+            state (str): The new state
+            note (str): Why, kept in the transition log
+            restart (bool): For starting, continue the current session log
+
+        Returns:
+            str: The previous state
+
+        Raises:
+            ValueError: If the transition is not allowed from the current state
+        """
+        if not self.can_enter(state):
+            raise ValueError(f"Invalid recorder transition: {self.current} -> {state}")
+        previous = self.current
+        now = time.monotonic_ns()
+        # A start opens a new session log, an automatic restart continues it
+        if state == self.STARTING and not restart and self.log:
+            self.sessions.append(self.log)
+            self.log = []
+        self.current = state
+        self.entered = now
+        self.log.append((state, now, note))
+        return previous
+
+    def note(self, note):
+        """Log something that happened without changing state"""
+        self.log.append((self.current, time.monotonic_ns(), note))
+
+    def timeline(self, log=None):
+        """
+        The transitions of a session, the current one by default.
+
+        Returns:
+            list: Dicts with the state, ms since the session started, ms spent in it and the note
+        """
+        log = self.log if log is None else log
+        if not log:
+            return []
+        start = log[0][1]
+        now = time.monotonic_ns()
+        entries = []
+        for i, (state, stamp, note) in enumerate(log):
+            end = log[i + 1][1] if i + 1 < len(log) else None
+            if end is None and state in (self.IDLE, self.FAILED):
+                duration = None  # Session over, nothing left to time
+            else:
+                duration = round(((end or now) - stamp) / 1e6, 3)
+            entries.append({
+                "state": state,
+                "at_ms": round((stamp - start) / 1e6, 3),
+                "duration_ms": duration,
+                "note": note,
+            })
+        return entries
+
+    def time_by_state(self, log=None):
+        """Total ms spent in each state over a session"""
+        totals = {}
+        for entry in self.timeline(log):
+            if entry["duration_ms"] is not None:
+                totals[entry["state"]] = round(totals.get(entry["state"], 0.0) + entry["duration_ms"], 3)
+        return totals
+
+class GPUScreenRecorderProcess:
+    def __init__(self, kill_timeout=10000, parent=None):
+        # The process belongs to the signals object, so both go away together
+        self.signals = ProcessSignals(parent)
+        self.process = QProcess(self.signals)
         self.process.readyReadStandardOutput.connect(self._handle_stdout)
         self.process.readyReadStandardError.connect(self._handle_stderr)
-        self.process.started.connect(self.signals.started)
-        self.process.finished.connect(self.signals.finished)
+        self.process.started.connect(self._handle_started)
+        self.process.errorOccurred.connect(self._handle_error)
+        self.process.finished.connect(self._handle_finished)
         self.pid = None
+        self.launch_failed = False  # The last start never got a process going
+        self.framers = {"stdout": LineFramer(), "stderr": LineFramer()}
+        self.state = RecorderState()
+
+        # Stopping is asynchronous: SIGTERM now, SIGKILL only if the recorder
+        # is still finalizing its file when this fires
+        self.stop_requested = None
+        self.killed = False
+        self.escalated = False
+        self.kill_timer = QTimer(self.signals)
+        self.kill_timer.setSingleShot(True)
+        self.kill_timer.setInterval(kill_timeout)
+        self.kill_timer.timeout.connect(self._escalate)
 
-    def start(self, command):
+    def start(self, command, restart=False):
+        """
+        Launch the recorder.
+
+        Args:
+            command (list): Full gpu-screen-recorder command line
+            restart (bool): An automatic restart, kept in the same session log
+
+        Raises:
+            RuntimeError: If the recorder is still running or could not be launched
+        """
+        if not self.state.can_enter(RecorderState.STARTING):
+            raise RuntimeError(f"Cannot start the recorder while it is {self.state.current}")
+        self._enter(RecorderState.STARTING, "restart" if restart else "", restart)
         try:
+            for framer in self.framers.values():
+                framer.flush()
+            self.stop_requested = None
+            self.killed = False
+            self.escalated = False
+            self.launch_failed = False
             self.process.start(command[0], command[1:])
             self.pid = self.process.processId()
         except Exception as e:
-            self.signals.error.emit(str(e))
+            self._enter(RecorderState.FAILED, str(e))
+            raise RuntimeError(f"Could not start the recorder: {e}") from e
+
+    def is_running(self):
+        return self.process.state() != QProcess.ProcessState.NotRunning
 
     def stop(self):
-        if self.process.state() == QProcess.ProcessState.Running:
+        """
+        Ask the recorder to finish its file and exit, without waiting.
+
+        Returns:
+            bool: True if a running process was signalled
+        """
+        if not self.is_running():
+            return False
+        if self.stop_requested is None:
+            self.stop_requested = time.monotonic_ns()
+            self.killed = False
+            self._enter(RecorderState.STOPPING, "SIGTERM")
             self.process.terminate()
-            if not self.process.waitForFinished(1000):
-                self.process.kill()
+            self.kill_timer.start()
+        return True
+
+    def kill(self):
+        """
+        Kill the process at once, for buffers with nothing worth finalizing.
+        Does not wait either, the finished signal follows once it is gone.
+
+        Returns:
+            bool: True if a running process was killed
+        """
+        if not self.is_running():
+            return False
+        if self.stop_requested is None:
+            self.stop_requested = time.monotonic_ns()
+            self._enter(RecorderState.STOPPING, "SIGKILL")
+        self.killed = True
+        self.process.kill()
+        return True
+
+    def wait_for_finished(self, timeout):
+        """Block until a stopping process is gone, used only when quitting"""
+        if self.is_running() and not self.process.waitForFinished(timeout):
+            self._escalate()
+            self.process.waitForFinished(500)
+
+    def _escalate(self):
+        if self.is_running():
+            self.killed = True
+            self.escalated = True
+            self.process.kill()
 
     def save_replay(self):
-        if self.pid:
-            try:
-                os.kill(self.pid, signal.SIGUSR1)
-                return True
-            except ProcessLookupError:
-                self.signals.error.emit("Process not found. Is recording active?")
-                return False
-        return False
+        """
+        Ask a running replay buffer to save a clip.
+
+        Returns:
+            bool: True if the signal was delivered
+        """
+        if self.state.current not in (RecorderState.RUNNING, RecorderState.PAUSED):
+            return False
+        return self._send_signal(signal.SIGUSR1)
 
     def toggle_pause(self):
-        if self.pid:
-            try:
-                os.kill(self.pid, signal.SIGUSR2)
-                return True
-            except ProcessLookupError:
-                self.signals.error.emit("Process not found. Is recording active?")
-                return False
-        return False
+        """
+        Pause or resume the recording. The state only changes once the
+        signal has reached the live process.
+
+        Returns:
+            bool: True if the recorder was signalled
+        """
+        if self.state.current == RecorderState.RUNNING:
+            target = RecorderState.PAUSED
+        elif self.state.current == RecorderState.PAUSED:
+            target = RecorderState.RUNNING
+        else:
+            return False
+        if not self._send_signal(signal.SIGUSR2):
+            return False
+        self._enter(target, "SIGUSR2")
+        return True
+
+    def _send_signal(self, signum):
+        # QProcess only reaps the child in its finished handling, so while
+        # it still reports the process as running the pid cannot have been
+        # reused by something else
+        pid = self.process.processId() if self.is_running() else 0
+        if not pid:
+            return False
+        try:
+            os.kill(pid, signum)
+            return True
+        except ProcessLookupError:
+            self.signals.error.emit("Process not found. Is recording active?")
+            return False
+
+    def _enter(self, state, note="", restart=False):
+        previous = self.state.enter(state, note, restart)
+        self.signals.state_changed.emit(previous, state, self.state.entered)
+
+    def _follow(self, state, note=""):
+        """
+        _enter() for the QProcess signal handlers, which must not raise:
+        an exception in a Qt slot aborts the application.
+        """
+        try:
+            self._enter(state, note)
+        except ValueError as e:
+            self.state.note(f"ignored: {e}")
+
+    def _handle_started(self):
+        if self.state.current == RecorderState.STOPPING:
+            # stop() or kill() came before the process was up, it is on its way out
+            self.state.note("started after stop")
+            return
+        self._follow(RecorderState.RUNNING)
+        self.signals.started.emit()
+
+    def _handle_error(self, error):
+        # Any other error is followed by finished, a failed launch is not
+        if error != QProcess.ProcessError.FailedToStart or sip.isdeleted(self.signals):
+            return
+        self.pid = None
+        self.launch_failed = True
+        self._follow(RecorderState.FAILED, self.process.errorString())
+        self.signals.error.emit(f"Could not start the recorder: {self.process.errorString()}")
+        self.signals.finished.emit(-1, True)
 
     def _handle_stdout(self):
-        data = self.process.readAllStandardOutput().data().decode()
-        self.signals.output.emit(data)
+        self._emit_lines("stdout", self.framers["stdout"].feed(self.process.readAllStandardOutput().data()))
 
     def _handle_stderr(self):
-        data = self.process.readAllStandardError().data().decode()
-        self.signals.output.emit(data)
\ No newline at end of file
+        self._emit_lines("stderr", self.framers["stderr"].feed(self.process.readAllStandardError().data()))
+
+    def _handle_finished(self, exit_code, exit_status):
+        # Finished can fire from the QProcess destructor during teardown
+        if sip.isdeleted(self.signals):
+            return
+        self.kill_timer.stop()
+        self.pid = None
+        crashed = exit_status == QProcess.ExitStatus.CrashExit
+        self._follow(RecorderState.FINALIZING, f"exit code {exit_code}" + (", crashed" if crashed else ""))
+
+        # Pass on a trailing line that never got its newline
+        for stream, framer in self.framers.items():
+            self._emit_lines(stream, framer.flush())
+
+        requested = self.stop_requested is not None
+        if requested:
+            self.signals.finalized.emit(time.monotonic_ns() - self.stop_requested, self.killed)
+            self.stop_requested = None
+        if self.escalated:
+            self._follow(RecorderState.FAILED, "killed after timeout")
+        elif requested or (exit_code == 0 and not crashed):
+            self._follow(RecorderState.IDLE)
+        else:
+            self._follow(RecorderState.FAILED, "exited unexpectedly")
+        self.signals.finished.emit(exit_code, crashed)
+
+    def _emit_lines(self, stream, lines):
+        if not lines:
+            return
+        timestamp = time.monotonic_ns()
+        for line in lines:
+            self.signals.line.emit(stream, line, timestamp)
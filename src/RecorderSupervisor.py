@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import time
+from collections import deque
+
+class RecorderSupervisor:
+    """
+    Restart policy for a recorder that exits without being asked to.
+
+    An exit is a crash when the process was killed by a signal or returned
+    a non-zero exit code; a zero exit (e.g. the captured window closed) is
+    reported but not restarted. Only replay buffers are restarted, a regular
+    recording would overwrite its own file.
+
+    Restarts back off exponentially from base_delay_ms up to max_delay_ms,
+    and the delay resets once a run has lasted stable_s. If max_restarts
+    crashes happen within window_s the circuit opens and restarting stops
+    until the next manual start.
+    """
+
+    def __init__(self, base_delay_ms=1000, max_delay_ms=60000, max_restarts=5,
+                 window_s=300, stable_s=60, stderr_lines=50, history=20):
+        self.base_delay_ms = base_delay_ms
+        self.max_delay_ms = max_delay_ms
+        self.max_restarts = max_restarts
+        self.window_s = window_s
+        self.stable_s = stable_s
+        self.enabled = True
+
+        self.stderr_tail = deque(maxlen=stderr_lines)
+        self.crashes = deque(maxlen=history)
+        self.crash_times = deque()
+        self.restarts = 0
+        self.attempt = 0
+        self.circuit_open = False
+
+        self.session_started = None  # Manual start of the session
+        self.run_started = None  # Start of the current process
+        self.uptime_total = 0.0  # Seconds the recorder has run, over all sessions
+
+    def session_start(self):
+        """A recording was started by hand: fresh counters, circuit closed"""
+        now = time.monotonic()
+        self.session_started = now
+        self.run_started = now
+        self.restarts = 0
+        self.attempt = 0
+        self.circuit_open = False
+        self.crash_times.clear()
+        self.stderr_tail.clear()
+
+    def run_start(self):
+        """A restarted process is up"""
+        self.run_started = time.monotonic()
+        self.stderr_tail.clear()
+
+    def session_stop(self):
+        self._end_run()
+        self.session_started = None
+
+    def add_line(self, stream, text):
+        if stream == "stderr":
+            self.stderr_tail.append(text)
+
+    def on_exit(self, exit_code, crashed, replay_mode):
+        """
+        Record an exit nobody asked for and decide what to do about it.
+
+        Args:
+            exit_code (int): Process exit code
+            crashed (bool): Whether the process was killed by a signal
+            replay_mode (bool): Whether it was running a replay buffer
+
+        Returns:
+            tuple: (crash record dict, restart delay in ms or None)
+        """
+        now = time.monotonic()
+        run_time = now - self.run_started if self.run_started is not None else 0.0
+        self._end_run()
+
+        record = {
+            "time": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "exit_code": exit_code,
+            "crashed": crashed or exit_code != 0,
+            "run_time_s": round(run_time, 3),
+            "stderr": list(self.stderr_tail),
+            "restart_delay_ms": None,
+        }
+        if not record["crashed"]:
+            return record, None
+        self.crashes.append(record)
+
+        # Circuit breaker over a sliding window of crash times
+        self.crash_times.append(now)
+        while self.crash_times and now - self.crash_times[0] > self.window_s:
+            self.crash_times.popleft()
+        if len(self.crash_times) >= self.max_restarts:
+            self.circuit_open = True
+
+        if not self.enabled or not replay_mode or self.circuit_open:
+            return record, None
+
+        # A long healthy run earns a fresh backoff
+        if run_time >= self.stable_s:
+            self.attempt = 0
+        delay = min(self.base_delay_ms * (2 ** self.attempt), self.max_delay_ms)
+        self.attempt += 1
+        self.restarts += 1
+        record["restart_delay_ms"] = delay
+        return record, delay
+
+    def uptime(self):
+        """Seconds since the session was started by hand, restarts included"""
+        if self.session_started is None:
+            return None
+        return time.monotonic() - self.session_started
+
+    def summary(self):
+        """Counters as a plain dict"""
+        uptime = self.uptime()
+        running = time.monotonic() - self.run_started if self.run_started is not None else 0.0
+        return {
+            "restarts": self.restarts,
+            "crashes": len(self.crashes),
+            "circuit_open": self.circuit_open,
+            "session_uptime_s": round(uptime, 3) if uptime is not None else None,
+            "total_uptime_s": round(self.uptime_total + running, 3),
+            "last_crash": self.crashes[-1] if self.crashes else None,
+        }
+
+    def _end_run(self):
+        if self.run_started is not None:
+            self.uptime_total += time.monotonic() - self.run_started
+            self.run_started = None
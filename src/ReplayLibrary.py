@@ -0,0 +1,336 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import sqlite3
+import time
+from collections import deque
+from PyQt6.QtCore import QObject, QTimer, QFileSystemWatcher, QStandardPaths, pyqtSignal
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS clips (
+    path TEXT PRIMARY KEY,
+    folder TEXT NOT NULL,
+    name TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    created REAL NOT NULL,  -- st_mtime, when the recorder finished the file
+    container TEXT NOT NULL,
+    duration REAL
+);
+CREATE INDEX IF NOT EXISTS clips_folder ON clips(folder);
+CREATE INDEX IF NOT EXISTS clips_created ON clips(created);
+CREATE INDEX IF NOT EXISTS clips_name ON clips(name);
+CREATE INDEX IF NOT EXISTS clips_size ON clips(size);
+CREATE INDEX IF NOT EXISTS clips_duration ON clips(duration);
+CREATE TABLE IF NOT EXISTS folders (
+    path TEXT PRIMARY KEY,
+    parent TEXT,
+    mtime_ns INTEGER NOT NULL
+);
+"""
+
+def default_database_path():
+    directory = QStandardPaths.writableLocation(QStandardPaths.StandardLocation.AppDataLocation)
+    if not directory:
+        directory = os.path.join(os.path.expanduser("~"), ".local", "share", "gpu-screen-recorder")
+    os.makedirs(directory, exist_ok=True)
+    return os.path.join(directory, "library.sqlite")
+
+class ReplayLibrary(QObject):
+    """
+    Index of the clips saved under the replay output folders, kept in SQLite.
+
+    Scans are incremental: every known folder is stat'ed, but only the ones
+    whose mtime moved since the last scan are listed and diffed against the
+    index, so a pass over years of date folders costs one stat per folder.
+    Scanning runs in slices on a timer so the UI never stalls on a big tree.
+    Between scans a QFileSystemWatcher (inotify on Linux) queues just the
+    folders that changed, and saves reported by the recorder are added
+    directly.
+    """
+
+    VIDEO_EXTENSIONS = (".mp4", ".mkv", ".webm", ".flv")
+    SORT_COLUMNS = ("name", "created", "duration", "size", "container", "folder")
+
+    changed = pyqtSignal()  # Clips were added, updated or removed
+    scan_finished = pyqtSignal(float)  # ms spent on the pass
+
+    def __init__(self, db_path=None, slice_ms=8, settle_ms=2000, parent=None):
+        super().__init__(parent)
+        self.db = sqlite3.connect(db_path or default_database_path())
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.executescript(SCHEMA)
+        self.roots = []
+        self.slice_ns = slice_ms * 1_000_000
+
+        # Folders waiting to be scanned, and whether to list them regardless of mtime
+        self.queue = deque()
+        self.queued = {}
+        self.dirty = False
+        self.scan_started = None
+
+        self.scan_timer = QTimer(self)
+        self.scan_timer.setInterval(0)
+        self.scan_timer.timeout.connect(self._scan_slice)
+
+        # A clip still being written only changes size, not its folder's mtime
+        self.unsettled = set()
+        self.settle_ns = settle_ms * 1_000_000
+        self.settle_timer = QTimer(self)
+        self.settle_timer.setSingleShot(True)
+        self.settle_timer.setInterval(settle_ms)
+        self.settle_timer.timeout.connect(self._recheck_unsettled)
+
+        self.watcher = QFileSystemWatcher(self)
+        self.watched = set()
+        self.watcher.directoryChanged.connect(lambda path: self.scan([path], force=True))
+
+    def set_roots(self, roots):
+        """
+        Set the folders to index. Clips outside them are dropped from the
+        index and a scan of the new roots is queued.
+
+        Returns:
+            bool: True if the roots changed
+        """
+        roots = sorted({os.path.abspath(os.path.expanduser(root)) for root in roots if root})
+        # Nested roots are covered by their parent
+        roots = [root for root in roots if not any(root.startswith(other + os.sep) for other in roots)]
+        if roots == self.roots:
+            return False
+        self.roots = roots
+
+        placeholders = " OR ".join(["(path = ? OR substr(path, 1, ?) = ?)"] * len(roots)) or "0"
+        params = []
+        for root in roots:
+            params += [root, len(root) + 1, root + os.sep]
+        self.db.execute(f"DELETE FROM clips WHERE NOT ({placeholders.replace('path', 'folder')})", params)
+        self.db.execute(f"DELETE FROM folders WHERE NOT ({placeholders})", params)
+        self.db.commit()
+        if self.watched:
+            self.watcher.removePaths(list(self.watched))
+            self.watched.clear()
+        self.dirty = True
+        self.scan()
+        return True
+
+    def scan(self, folders=None, force=False):
+        """
+        Queue folders (the roots by default) for an incremental scan.
+
+        Args:
+            folders (list): Folders to look at, their subfolders follow
+            force (bool): List them even if their mtime did not change
+        """
+        for folder in self.roots if folders is None else folders:
+            if folder in self.queued:
+                self.queued[folder] = self.queued[folder] or force
+                continue
+            self.queued[folder] = force
+            self.queue.append(folder)
+        if self.queue and not self.scan_timer.isActive():
+            self.scan_started = time.perf_counter_ns()
+            self.scan_timer.start()
+
+    def is_scanning(self):
+        return self.scan_timer.isActive()
+
+    def add_file(self, path):
+        """Index a clip right away, e.g. one the recorder just reported"""
+        try:
+            st = os.stat(path)
+        except OSError:
+            return
+        self._upsert(path, st)
+        self.db.commit()
+        self._mark_unsettled(os.path.dirname(path), st)
+        self.changed.emit()
+
+    def remove(self, path, delete_file=False):
+        """
+        Drop a clip from the index.
+
+        Raises:
+            OSError: If delete_file is set and the file cannot be removed
+        """
+        if delete_file and os.path.exists(path):
+            os.remove(path)
+        self.db.execute("DELETE FROM clips WHERE path = ?", (path,))
+        self.db.commit()
+        self.changed.emit()
+
+    def set_duration(self, path, duration):
+        """Store a clip's duration in seconds once something has probed it"""
+        self.db.execute("UPDATE clips SET duration = ? WHERE path = ?", (duration, path))
+        self.db.commit()
+
+    def count(self, filter_text=""):
+        where, params = self._filter(filter_text)
+        return self.db.execute(f"SELECT COUNT(*) FROM clips {where}", params).fetchone()[0]
+
+    def totals(self, filter_text=""):
+        """
+        Returns:
+            tuple: (number of clips, total bytes)
+        """
+        where, params = self._filter(filter_text)
+        count, size = self.db.execute(f"SELECT COUNT(*), SUM(size) FROM clips {where}", params).fetchone()
+        return count, size or 0
+
+    def page(self, offset, limit, sort="created", descending=True, filter_text=""):
+        """
+        One page of clips.
+
+        Args:
+            offset (int): Rows to skip
+            limit (int): Rows to return
+            sort (str): One of SORT_COLUMNS
+            descending (bool): Sort order
+            filter_text (str): Only clips whose name contains this
+
+        Returns:
+            list: Dicts with path, folder, name, size, created (modification time),
+                container and duration
+        """
+        if sort not in self.SORT_COLUMNS:
+            raise ValueError(f"Cannot sort by {sort}")
+        order = "DESC" if descending else "ASC"
+        where, params = self._filter(filter_text)
+        rows = self.db.execute(
+            f"SELECT path, folder, name, size, created, container, duration FROM clips {where} "
+            f"ORDER BY {sort} {order}, path {order} LIMIT ? OFFSET ?",
+            params + [limit, offset],
+        ).fetchall()
+        keys = ("path", "folder", "name", "size", "created", "container", "duration")
+        return [dict(zip(keys, row)) for row in rows]
+
+    def close(self):
+        self.scan_timer.stop()
+        self.db.close()
+
+    def _filter(self, filter_text):
+        if not filter_text:
+            return "", []
+        return "WHERE instr(lower(name), ?) > 0", [filter_text.lower()]
+
+    def _scan_slice(self):
+        # Work through the queue for at most slice_ns, then yield to the event loop
+        deadline = time.perf_counter_ns() + self.slice_ns
+        while self.queue and time.perf_counter_ns() < deadline:
+            folder = self.queue.popleft()
+            force = self.queued.pop(folder)
+            try:
+                self._scan_folder(folder, force)
+            except sqlite3.Error as e:
+                print(f"Error indexing {folder}: {e}")
+        self.db.commit()
+        if self.queue:
+            return
+
+        self.scan_timer.stop()
+        if self.dirty:
+            self.dirty = False
+            self.changed.emit()
+        self.scan_finished.emit((time.perf_counter_ns() - self.scan_started) / 1e6)
+
+    def _scan_folder(self, folder, force):
+        try:
+            st = os.stat(folder)
+        except OSError:
+            self._forget_folder(folder)
+            return
+
+        row = self.db.execute("SELECT mtime_ns FROM folders WHERE path = ?", (folder,)).fetchone()
+        if row is not None and row[0] == st.st_mtime_ns and not force:
+            # Nothing was added, removed or renamed here; subfolders may still have changed
+            children = self.db.execute("SELECT path FROM folders WHERE parent = ?", (folder,)).fetchall()
+            self.scan([child for child, in children])
+            self._watch(folder)
+            return
+
+        known = {
+            path: (size, mtime_ns)
+            for path, size, mtime_ns in self.db.execute(
+                "SELECT path, size, mtime_ns FROM clips WHERE folder = ?", (folder,)
+            )
+        }
+        subfolders = []
+        try:
+            entries = list(os.scandir(folder))
+        except OSError:
+            entries = []
+        for entry in entries:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    subfolders.append(entry.path)
+                elif entry.name.endswith(self.VIDEO_EXTENSIONS):
+                    file_st = entry.stat()
+                    previous = known.pop(entry.path, None)
+                    if previous != (file_st.st_size, file_st.st_mtime_ns):
+                        self._upsert(entry.path, file_st)
+                    self._mark_unsettled(folder, file_st)
+            except OSError:
+                continue
+
+        # Whatever was not seen is gone
+        if known:
+            self.db.executemany("DELETE FROM clips WHERE path = ?", [(path,) for path in known])
+            self.dirty = True
+        seen = set(subfolders)
+        for child, in self.db.execute("SELECT path FROM folders WHERE parent = ?", (folder,)).fetchall():
+            if child not in seen:
+                self._forget_folder(child)
+
+        parent = None if folder in self.roots else os.path.dirname(folder)
+        self.db.execute(
+            "INSERT OR REPLACE INTO folders (path, parent, mtime_ns) VALUES (?, ?, ?)",
+            (folder, parent, st.st_mtime_ns),
+        )
+        self._watch(folder)
+        # New subfolders have no stored mtime, so they are listed anyway
+        self.scan(subfolders)
+
+    def _upsert(self, path, st):
+        """
+        Add or refresh a clip. Its created column is the file's modification
+        time, the ctime of a Linux file is not its creation time. A file
+        rewritten in place loses its stored duration, so it is probed again.
+        """
+        name = os.path.basename(path)
+        self.db.execute(
+            "INSERT INTO clips (path, folder, name, size, mtime_ns, created, container) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT(path) DO UPDATE SET size = excluded.size, mtime_ns = excluded.mtime_ns, "
+            "created = excluded.created, "
+            "duration = CASE WHEN clips.mtime_ns != excluded.mtime_ns OR clips.size != excluded.size "
+            "THEN NULL ELSE clips.duration END",
+            (path, os.path.dirname(path), name, st.st_size, st.st_mtime_ns, st.st_mtime,
+             os.path.splitext(name)[1][1:].lower()),
+        )
+        self.dirty = True
+
+    def _forget_folder(self, folder):
+        prefix = folder + os.sep
+        params = (folder, len(prefix), prefix)
+        self.db.execute("DELETE FROM clips WHERE folder = ? OR substr(folder, 1, ?) = ?", params)
+        self.db.execute("DELETE FROM folders WHERE path = ? OR substr(path, 1, ?) = ?", params)
+        for path in [path for path in self.watched if path == folder or path.startswith(prefix)]:
+            self.watcher.removePath(path)
+            self.watched.discard(path)
+        self.dirty = True
+
+    def _watch(self, folder):
+        if folder not in self.watched and self.watcher.addPath(folder):
+            self.watched.add(folder)
+
+    def _mark_unsettled(self, folder, st):
+        if time.time_ns() - st.st_mtime_ns < self.settle_ns:
+            self.unsettled.add(folder)
+            if not self.settle_timer.isActive():
+                self.settle_timer.start()
+
+    def _recheck_unsettled(self):
+        folders, self.unsettled = list(self.unsettled), set()
+        self.scan(folders, force=True)
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import time
+from PyQt6.QtCore import QObject, QTimer
+
+class ReplayPrewarmer(QObject):
+    """
+    Keeps a replay buffer running in the background while nothing is being
+    recorded, so Start Recording takes over a process that has already been
+    through portal negotiation and encoder setup.
+
+    Stale config policy:
+    - RecorderController.start() only takes over the warm process when its
+      command line is exactly the one the current settings produce, anything
+      else is stopped and started fresh. A stale buffer is never recorded.
+    - While idle, a settings change restarts the warm process once the
+      settings have stayed the same for settle_ms, so dragging a spin box
+      does not respawn it on every step.
+    - Only replay mode is pre-warmed, and a portal capture only when the
+      portal session can be restored, otherwise the picker would pop up.
+    - If max_failures warm processes in a row die within fail_window_ms
+      of starting, pre-warming is paused until settings change.
+    """
+
+    def __init__(self, controller, config, settle_ms=2000, respawn_ms=500,
+                 max_failures=3, fail_window_ms=10000, parent=None):
+        super().__init__(parent)
+        self.controller = controller
+        self.config = config
+        self.respawn_ms = respawn_ms
+        self.max_failures = max_failures
+        self.fail_window_ms = fail_window_ms
+
+        self.failures = 0
+        self.warm_started = None
+        self.paused = False
+
+        # Settings must stay unchanged this long before the warm process is replaced
+        self.settle_timer = QTimer(self)
+        self.settle_timer.setSingleShot(True)
+        self.settle_timer.setInterval(settle_ms)
+        self.settle_timer.timeout.connect(self.sync)
+
+        config.add_listener(self.on_config_changed)
+
+        controller.warm_changed.connect(self.on_warm_changed)
+        controller.warm_exited.connect(self.on_warm_exited)
+        # Respawn right after a recording stops
+        controller.finished.connect(lambda unexpected: QTimer.singleShot(self.respawn_ms, self.sync))
+
+    def wanted(self):
+        """Whether a warm process should be running for the current settings"""
+        config = self.config
+        return (
+            config.replay_prewarm
+            and config.replay_enabled
+            and (config.source != "portal" or config.restore_portal_session)
+            and self.failures < self.max_failures
+            and not self.paused
+        )
+
+    def sync(self):
+        """Start, replace or stop the warm process to match the settings"""
+        # Runs again from the finished signal once a stop has completed
+        if self.controller.is_recording or self.controller.is_finalizing:
+            return
+        if not self.wanted():
+            self.controller.discard_warm()
+            return
+
+        command = self.config.to_argv(True)
+        if self.controller.warm_matches(command):
+            return
+        if self.controller.is_warm:
+            self.controller.message.emit("Settings changed, restarting the pre-warmed replay buffer")
+            self.controller.discard_warm()
+        self.controller.prewarm(command)
+
+    def set_paused(self, paused):
+        """Stop pre-warming for now (e.g. while the window is closed), or carry on"""
+        self.paused = paused
+        self.sync()
+
+    def on_config_changed(self, name):
+        # New settings get a fresh set of attempts
+        self.failures = 0
+        self.settle_timer.start()
+
+    def on_warm_changed(self, warm):
+        if warm:
+            self.warm_started = time.monotonic()
+
+    def on_warm_exited(self):
+        if self.controller.recorder.launch_failed:
+            # Retrying cannot help until the settings change
+            self.failures = self.max_failures
+        elif (time.monotonic() - self.warm_started) * 1000 < self.fail_window_ms:
+            self.failures += 1
+        else:
+            self.failures = 0
+        if self.failures >= self.max_failures:
+            self.controller.message.emit("Pre-warmed replay buffer keeps exiting, pre-warming paused")
+            return
+        QTimer.singleShot(self.respawn_ms, self.sync)
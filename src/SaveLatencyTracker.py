@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import csv
+import json
+import os
+import time
+from collections import deque
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+
+from .LatencyHistogram import LatencyHistogram
+
+class SaveLatencyTracker(QObject):
+    """
+    Measures the Save Replay critical path.
+    Each save gets a record with perf_counter_ns stamps for every stage
+    (requested -> signalled -> landed). While saves are pending, the replay
+    output directory and any date subfolders touched since the request are
+    polled until the new clip shows up.
+    """
+
+    VIDEO_EXTENSIONS = (".mp4", ".mkv", ".webm", ".flv")
+
+    save_completed = pyqtSignal(dict)  # Finished save record
+    save_timed_out = pyqtSignal(dict)
+
+    def __init__(self, poll_interval=25, timeout=30000, history=1000, remembered=64, parent=None):
+        super().__init__(parent)
+        self.timeout_ns = timeout * 1_000_000
+        self.pending = []
+        self.records = deque(maxlen=history)
+        # Files already matched to a save. Only clips newer than a pending
+        # request are candidates, so the last few are enough to remember.
+        self.reported = set()
+        self.reported_order = deque(maxlen=remembered)
+
+        # Per-save latency from request to file on disk, and to the signal
+        self.histogram = LatencyHistogram()
+        self.signal_histogram = LatencyHistogram()
+
+        self.timer = QTimer(self)
+        self.timer.setInterval(poll_interval)
+        self.timer.timeout.connect(self.poll)
+
+    def begin(self, output_dir, source="button", requested_ns=None):
+        """
+        Start timing a save.
+
+        Args:
+            output_dir (str): Replay output directory
+            source (str): What triggered the save (button, shortcut, tray, ...)
+            requested_ns (int): perf_counter_ns of the request, if it waited in a queue
+
+        Returns:
+            dict: The save record, to pass to mark() / cancel()
+        """
+        record = {
+            "source": source,
+            "output_dir": output_dir,
+            "wall_time": time.time(),
+            "since_ns": time.time_ns(),  # Files modified after this are candidates
+            "requested": requested_ns or time.perf_counter_ns(),
+            "signalled": None,
+            "landed": None,
+            "path": None,
+            "reported_by": None,  # "log" or "disk"
+            "status": "pending",
+        }
+        self.pending.append(record)
+        if not self.timer.isActive():
+            self.timer.start()
+        return record
+
+    def mark(self, record, stage):
+        """Stamp a stage of a save with the current time"""
+        record[stage] = time.perf_counter_ns()
+
+    def cancel(self, record):
+        """Forget a save that never reached the recorder"""
+        if record in self.pending:
+            self.pending.remove(record)
+        if not self.pending:
+            self.timer.stop()
+
+    def file_reported(self, path):
+        """
+        Resolve the oldest pending save with a path the recorder reported.
+
+        Returns:
+            bool: True if a pending save was completed
+        """
+        if self.pending and path not in self.reported and path.endswith(self.VIDEO_EXTENSIONS):
+            self._complete(self.pending[0], path, "log")
+            return True
+        return False
+
+    def poll(self):
+        """Look for new clips on disk for the pending saves"""
+        now = time.perf_counter_ns()
+        for record in list(self.pending):
+            # Timed from the signal, a save may have waited in the SaveQueue
+            if now - (record["signalled"] or record["requested"]) > self.timeout_ns:
+                self.pending.remove(record)
+                record["status"] = "timeout"
+                self.records.append(record)
+                self.save_timed_out.emit(record)
+
+        if self.pending:
+            record = self.pending[0]
+            path = self._find_new_file(record["output_dir"], record["since_ns"])
+            if path:
+                self._complete(record, path, "disk")
+
+        if not self.pending:
+            self.timer.stop()
+
+    def _complete(self, record, path, reported_by):
+        self.mark(record, "landed")
+        record["path"] = path
+        record["reported_by"] = reported_by
+        record["status"] = "done"
+        self.pending.remove(record)
+        self._remember(path)
+        self.records.append(record)
+
+        self.histogram.add(record["landed"] - record["requested"])
+        if record["signalled"] is not None:
+            self.signal_histogram.add(record["signalled"] - record["requested"])
+        self.save_completed.emit(record)
+
+    def _remember(self, path):
+        if path in self.reported:
+            return
+        if len(self.reported_order) == self.reported_order.maxlen:
+            self.reported.discard(self.reported_order[0])
+        self.reported_order.append(path)
+        self.reported.add(path)
+
+    def _find_new_file(self, directory, since_ns):
+        # With -df yes clips land in a date folder, whose mtime changes with it
+        try:
+            entries = list(os.scandir(directory))
+        except OSError:
+            return None
+        newest = None
+        for entry in entries:
+            try:
+                if entry.is_dir():
+                    if entry.stat().st_mtime_ns >= since_ns:
+                        entries.extend(os.scandir(entry.path))
+                elif entry.name.endswith(self.VIDEO_EXTENSIONS) and entry.path not in self.reported:
+                    mtime = entry.stat().st_mtime_ns
+                    if mtime >= since_ns and (newest is None or mtime < newest[0]):
+                        newest = (mtime, entry.path)
+            except OSError:
+                continue
+        return newest[1] if newest else None
+
+    def stage_durations(self, record):
+        """Milliseconds spent in each stage of a finished save record"""
+        def delta(start, end):
+            if record[start] is None or record[end] is None:
+                return None
+            return round((record[end] - record[start]) / 1e6, 3)
+
+        return {
+            "request_to_signal_ms": delta("requested", "signalled"),
+            "signal_to_file_ms": delta("signalled", "landed"),
+            "total_ms": delta("requested", "landed"),
+        }
+
+    def export(self, path):
+        """Write the recorded saves to a .json or .csv file"""
+        rows = []
+        for record in self.records:
+            row = {
+                "time": time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(record["wall_time"])),
+                "source": record["source"],
+                "status": record["status"],
+                "path": record["path"] or "",
+            }
+            row.update(self.stage_durations(record))
+            rows.append(row)
+
+        if path.endswith(".json"):
+            with open(path, "w") as f:
+                json.dump({"saves": rows, "histogram": self.histogram.summary()}, f, indent=2)
+        else:
+            with open(path, "w", newline="") as f:
+                writer = csv.DictWriter(f, fieldnames=[
+                    "time", "source", "status", "path",
+                    "request_to_signal_ms", "signal_to_file_ms", "total_ms"
+                ])
+                writer.writeheader()
+                writer.writerows(rows)
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import itertools
+import os
+import time
+from collections import deque
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+
+class SaveQueue(QObject):
+    """
+    Serializes Save Replay requests against the recorder.
+
+    Only one SIGUSR1 is outstanding at a time. The next one is sent once the
+    previous clip is confirmed finished: either the recorder printed its
+    path, or the file the tracker found on disk kept the same size for
+    stable_ms. A request arriving within merge_ms of the last one waiting
+    in the queue, or else of the one being written, is merged into it
+    instead of producing an overlapping clip. Requests further apart are
+    queued as their own saves.
+
+    Save states: queued, writing, done, failed, timeout, cancelled.
+    """
+
+    FINISHED = ("done", "failed", "timeout", "cancelled")
+
+    save_changed = pyqtSignal(dict)
+    clip_ready = pyqtSignal(dict)  # Tracker record of a clip confirmed finished
+
+    def __init__(self, tracker, send, merge_ms=500, stable_ms=200, poll_interval=50,
+                 history=50, parent=None):
+        """
+        Args:
+            tracker (SaveLatencyTracker): Times each save and finds its file
+            send (function): Signals the recorder, returns True once delivered
+            merge_ms (int): Requests this close to the latest save are merged into it
+            stable_ms (int): How long a clip found on disk must keep its size
+        """
+        super().__init__(parent)
+        self.tracker = tracker
+        self.send = send
+        self.merge_ms = merge_ms
+        self.stable_ms = stable_ms
+        self.output_dir = None
+
+        self.queue = deque()
+        self.current = None  # The save being written
+        self.saves = deque(maxlen=history)  # Every save, newest last
+        self.ids = itertools.count(1)
+
+        tracker.save_completed.connect(self._on_landed)
+        tracker.save_timed_out.connect(self._on_timed_out)
+
+        # Watches the size of a clip found on disk until it settles
+        self.size_timer = QTimer(self)
+        self.size_timer.setInterval(poll_interval)
+        self.size_timer.timeout.connect(self._check_size)
+        self.last_size = None
+        self.size_since = 0
+
+    def request(self, source="api"):
+        """
+        Ask for a clip, merged into a waiting or just-started save if there is one.
+
+        Returns:
+            dict: The save carrying the request, or None if the recorder could not be signalled
+        """
+        now = time.perf_counter_ns()
+        target = self.queue[-1] if self.queue else self.current
+        if target is not None and now - target["requested"] < self.merge_ms * 1000000:
+            target["merged"] += 1
+            self.save_changed.emit(target)
+            return target
+
+        save = {
+            "id": next(self.ids),
+            "source": source,
+            "state": "queued",
+            "requested": now,
+            "sent": None,
+            "confirmed": None,
+            "confirmed_by": None,
+            "merged": 0,
+            "path": None,
+            "record": None,
+        }
+        self.saves.append(save)
+        self.queue.append(save)
+        self.save_changed.emit(save)
+        self._next()
+        return None if save["state"] == "failed" else save
+
+    def file_reported(self, path):
+        """The recorder printed a clip path, which confirms a clip still settling on disk"""
+        if self.current is not None and self.current["path"] == path and self.size_timer.isActive():
+            self._confirm(self.current, "log")
+
+    def cancel_all(self, keep_current=True):
+        """
+        Drop every waiting request, for when the recorder goes away.
+
+        Args:
+            keep_current (bool): Keep waiting for a clip already signalled,
+                which a recorder that is shutting down still writes out
+        """
+        for save in self.queue:
+            self._finish(save, "cancelled")
+        self.queue.clear()
+        if self.current is not None and not keep_current:
+            self.size_timer.stop()
+            self.tracker.cancel(self.current["record"])
+            self._finish(self.current, "cancelled")
+            self.current = None
+
+    def durations(self, save):
+        """Milliseconds a save spent waiting, being written, and in total"""
+        def delta(start, end):
+            if save[start] is None or save[end] is None:
+                return None
+            return round((save[end] - save[start]) / 1e6, 3)
+
+        return {
+            "wait_ms": delta("requested", "sent"),
+            "write_ms": delta("sent", "confirmed"),
+            "total_ms": delta("requested", "confirmed"),
+        }
+
+    def snapshot(self):
+        """Recent saves as plain dicts, newest last"""
+        return [
+            {
+                "id": save["id"],
+                "source": save["source"],
+                "state": save["state"],
+                "merged": save["merged"],
+                "path": save["path"],
+                "confirmed_by": save["confirmed_by"],
+                **self.durations(save),
+            }
+            for save in self.saves
+        ]
+
+    def _next(self):
+        if self.current is not None or not self.queue:
+            return
+        save = self.queue.popleft()
+        save["record"] = self.tracker.begin(self.output_dir, save["source"], save["requested"])
+        if not self.send():
+            self.tracker.cancel(save["record"])
+            self._finish(save, "failed")
+            self._next()
+            return
+        self.tracker.mark(save["record"], "signalled")
+        save["sent"] = save["record"]["signalled"]
+        save["state"] = "writing"
+        self.current = save
+        self.save_changed.emit(save)
+
+    def _on_landed(self, record):
+        save = self.current
+        if save is None or save["record"] is not record:
+            return
+        save["path"] = record["path"]
+        if record["reported_by"] == "log":
+            # The recorder prints the path once the clip is written
+            self._confirm(save, "log")
+            return
+        # Found on disk, it may still be growing
+        self.last_size = None
+        self.size_since = time.perf_counter_ns()
+        self.size_timer.start()
+
+    def _check_size(self):
+        save = self.current
+        if save is None:
+            self.size_timer.stop()
+            return
+        try:
+            size = os.path.getsize(save["path"])
+        except OSError:
+            size = None
+        now = time.perf_counter_ns()
+        if size != self.last_size:
+            self.last_size = size
+            self.size_since = now
+        elif size is not None and now - self.size_since >= self.stable_ms * 1000000:
+            self._confirm(save, "size")
+
+    def _confirm(self, save, how):
+        self.size_timer.stop()
+        save["confirmed"] = time.perf_counter_ns()
+        save["confirmed_by"] = how
+        self.current = None
+        self._finish(save, "done")
+        self.clip_ready.emit(save["record"])
+        self._next()
+
+    def _on_timed_out(self, record):
+        save = self.current
+        if save is None or save["record"] is not record:
+            return
+        self.size_timer.stop()
+        self.current = None
+        self._finish(save, "timeout")
+        self._next()
+
+    def _finish(self, save, state):
+        save["state"] = state
+        self.save_changed.emit(save)
@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import dataclasses
+import json
+import os
+from collections import deque
+from PyQt6.QtCore import QObject, pyqtSignal
+
+from .RecorderController import RecorderController
+
+class RecordingSession:
+    """
+    An extra recorder running next to the main one, e.g. a replay buffer
+    per monitor. Its config is the main config plus a few overrides, so
+    codec and quality changes carry over; output goes into a folder named
+    after the session unless overridden. The controller (and its process)
+    is only created on first start.
+    """
+
+    def __init__(self, name, replay_mode=True, overrides=None, log_lines=2000):
+        self.name = name
+        self.replay_mode = replay_mode
+        self.overrides = dict(overrides or {})
+        self.controller = None
+        self.log = deque(maxlen=log_lines)
+
+        # Derived config, rebuilt only when the main config changes
+        self._config = None
+        self._base_revision = None
+
+    def config(self, base):
+        """The session's RecorderConfig, derived from the main config"""
+        if self._config is None or self._base_revision != base.revision:
+            overrides = dict(self.overrides)
+            overrides.setdefault("replay_output_dir", os.path.join(base.replay_output_dir, self.name))
+            overrides.setdefault("output_path", os.path.join(base.output_path, self.name))
+            overrides["replay_enabled"] = self.replay_mode
+            overrides["replay_prewarm"] = False
+            self._config = dataclasses.replace(base, **overrides)
+            self._base_revision = base.revision
+        return self._config
+
+    def state_name(self):
+        return self.controller.state_name() if self.controller else "idle"
+
+    def to_dict(self):
+        return {"name": self.name, "replay_mode": self.replay_mode, "overrides": self.overrides}
+
+class SessionManager(QObject):
+    """
+    Runs extra recording sessions, each with its own controller, config,
+    log and save replay routing. Sessions are stored in QSettings as JSON
+    under sessions/list.
+    """
+
+    sessions_changed = pyqtSignal()  # Added or removed
+    session_state_changed = pyqtSignal(str)  # Session name
+    session_line = pyqtSignal(str, str)  # Session name, text
+    session_error = pyqtSignal(str, str)  # Session name, message
+    replay_saved = pyqtSignal(str, str)  # Session name, clip path
+
+    def __init__(self, config, settings=None, parent=None):
+        super().__init__(parent)
+        self.base = config
+        self.settings = settings
+        self.sessions = {}
+        self.retiring = set()  # Controllers of removed sessions still finishing their file
+        if settings is not None:
+            self.load()
+
+    def load(self):
+        value = self.settings.value("sessions/list", "[]")
+        # A hand-edited INI file splits unquoted commas into a list
+        if isinstance(value, list):
+            value = ", ".join(value)
+        try:
+            entries = json.loads(value)
+        except ValueError as e:
+            print(f"Error loading sessions: {e}")
+            entries = []
+        for entry in entries:
+            self.sessions[entry["name"]] = RecordingSession(
+                entry["name"], entry.get("replay_mode", True), entry.get("overrides")
+            )
+        self.sessions_changed.emit()
+
+    def save(self):
+        if self.settings is not None:
+            self.settings.setValue(
+                "sessions/list", json.dumps([session.to_dict() for session in self.sessions.values()])
+            )
+
+    def add(self, name, replay_mode=True, overrides=None):
+        """
+        Add a session.
+
+        Args:
+            name (str): Unique name, also used for its output folder
+            replay_mode (bool): Run a replay buffer rather than a recording
+            overrides (dict): RecorderConfig fields that differ from the main config
+
+        Returns:
+            RecordingSession: The new session
+        """
+        name = name.strip()
+        if not name or "/" in name:
+            raise ValueError(f"Invalid session name: {name!r}")
+        if name in self.sessions:
+            raise ValueError(f"A session called {name} already exists")
+        fields = {f.name for f in dataclasses.fields(self.base)}
+        unknown = set(overrides or {}) - fields
+        if unknown:
+            raise ValueError(f"Unknown settings: {', '.join(sorted(unknown))}")
+
+        session = RecordingSession(name, replay_mode, overrides)
+        self.sessions[name] = session
+        self.save()
+        self.sessions_changed.emit()
+        return session
+
+    def remove(self, name):
+        """
+        Remove a session. A recording is stopped first, and its controller
+        is only deleted once the recorder has finished writing the file.
+        """
+        session = self.get(name)
+        controller = session.controller
+        if controller is not None:
+            if controller.is_recording:
+                controller.stop()
+            if controller.is_finalizing:
+                self.retiring.add(controller)
+                controller.finished.connect(lambda unexpected: self._retire(controller))
+            else:
+                controller.deleteLater()
+        del self.sessions[name]
+        self.save()
+        self.sessions_changed.emit()
+
+    def get(self, name):
+        session = self.sessions.get(name)
+        if session is None:
+            raise ValueError(f"No session called {name}")
+        return session
+
+    def controller(self, name):
+        """The session's controller, created on first use"""
+        session = self.get(name)
+        if session.controller is None:
+            controller = RecorderController(self)
+            controller.line.connect(lambda stream, text, timestamp: self._on_line(session, text))
+            controller.message.connect(lambda text: self._on_line(session, text))
+            controller.error.connect(lambda message: self.session_error.emit(session.name, message))
+            controller.state_changed.connect(lambda: self.session_state_changed.emit(session.name))
+            controller.finished.connect(lambda unexpected: self.session_state_changed.emit(session.name))
+            controller.save_queue.clip_ready.connect(
+                lambda record: self.replay_saved.emit(session.name, record["path"])
+            )
+            controller.storage.warning.connect(lambda text: self._on_line(session, f"WARNING: {text}"))
+            controller.storage.stop_requested.connect(lambda reason: self._on_storage_full(session, reason))
+            session.controller = controller
+        return session.controller
+
+    def start(self, name):
+        """
+        Start a session with its current config.
+
+        Raises:
+            CommandError: If the command line is rejected
+            RuntimeError: If it is already running or still finalizing
+        """
+        session = self.get(name)
+        controller = self.controller(name)
+        if controller.is_recording:
+            raise RuntimeError(f"{name} is already recording")
+        config = session.config(self.base)
+        output = None if session.replay_mode else config.recording_file()
+        if session.replay_mode:
+            os.makedirs(config.replay_output_dir, exist_ok=True)
+        else:
+            os.makedirs(os.path.dirname(output), exist_ok=True)
+        controller.start(
+            config.to_argv(session.replay_mode, output), session.replay_mode, config.fps,
+            config.replay_save_merge_ms, config.estimated_bitrate_kbps()
+        )
+
+    def stop(self, name):
+        controller = self.get(name).controller
+        if controller is not None and controller.is_recording:
+            controller.stop()
+
+    def toggle(self, name):
+        controller = self.get(name).controller
+        if controller is not None and controller.is_recording:
+            self.stop(name)
+        else:
+            self.start(name)
+
+    def save_replay(self, name=None, source="api"):
+        """
+        Save the replay buffer of one session, or of every session running one.
+
+        Returns:
+            list: Names of the sessions that were signalled
+        """
+        names = [name] if name else list(self.sessions)
+        saved = []
+        for session_name in names:
+            controller = self.get(session_name).controller
+            if controller is not None and controller.save_replay(source) is not None:
+                saved.append(session_name)
+        return saved
+
+    def running(self):
+        """Names of the sessions that are recording"""
+        return [
+            name for name, session in self.sessions.items()
+            if session.controller is not None and session.controller.is_recording
+        ]
+
+    def stop_all(self):
+        for name in self.running():
+            self.stop(name)
+
+    def finish_pending(self):
+        """Let every session finish its file, for use at quit time"""
+        for session in self.sessions.values():
+            if session.controller is not None:
+                session.controller.finish_pending()
+        for controller in list(self.retiring):
+            controller.finish_pending()
+
+    def status(self):
+        """Every session's state as a plain dict"""
+        return {
+            name: {
+                "replay_mode": session.replay_mode,
+                "overrides": session.overrides,
+                **(session.controller.status() if session.controller else {"state": "idle"}),
+            }
+            for name, session in self.sessions.items()
+        }
+
+    def _retire(self, controller):
+        self.retiring.discard(controller)
+        controller.deleteLater()
+
+    def _on_storage_full(self, session, reason):
+        if not session.config(self.base).storage_auto_stop:
+            self._on_line(session, f"WARNING: {reason}")
+            return
+        self._on_line(session, f"{reason}, stopping")
+        self.stop(session.name)
+
+    def _on_line(self, session, text):
+        session.log.append(text)
+        self.session_line.emit(session.name, text)
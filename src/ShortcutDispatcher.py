@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import time
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+
+from .LatencyHistogram import LatencyHistogram
+
+class ShortcutDispatcher(QObject):
+    """
+    Runs shortcut actions with a per-action cooldown, so key repeat or a
+    double press cannot fire an action twice (two SIGUSR1s mean two
+    overlapping replays). A trigger within cooldown_ms of the last accepted
+    one is dropped.
+
+    Each accepted trigger is timed from the moment the shortcut signal was
+    received until its callback returns, including the wait in the event
+    queue, and recorded in a LatencyHistogram per action and overall.
+    """
+
+    # Default cooldowns in milliseconds
+    COOLDOWNS_MS = {
+        "save_replay": 1000,
+        "toggle_recording": 500,
+        "toggle_pause": 300,
+    }
+
+    dispatched = pyqtSignal(str, 'qint64')  # Action, receipt to completion in ns
+    dropped = pyqtSignal(str)  # Action
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.actions = {}  # Name -> (callback, cooldown in ns)
+        self.last_accepted = {}  # Name -> receipt time in monotonic ns
+        self.drops = {}  # Name -> dropped triggers
+        self.histograms = {}  # Name -> LatencyHistogram
+        self.histogram = LatencyHistogram()
+
+    def add(self, name, callback, cooldown_ms=None):
+        """
+        Register an action.
+
+        Args:
+            name (str): Action name
+            callback (function): Called with no arguments
+            cooldown_ms (int): Minimum time between two runs, defaults to COOLDOWNS_MS or 250
+        """
+        if cooldown_ms is None:
+            cooldown_ms = self.COOLDOWNS_MS.get(name, 250)
+        self.actions[name] = (callback, cooldown_ms * 1000000)
+        self.drops.setdefault(name, 0)
+        self.histograms.setdefault(name, LatencyHistogram())
+
+    def remove(self, name):
+        self.actions.pop(name, None)
+        self.last_accepted.pop(name, None)
+
+    def trigger(self, name, received_ns=None):
+        """
+        Run an action from the event loop unless it is cooling down.
+
+        Args:
+            name (str): Action name
+            received_ns (int): When the shortcut signal arrived (monotonic ns), defaults to now
+
+        Returns:
+            bool: True if the action was accepted
+        """
+        if name not in self.actions:
+            return False
+        if received_ns is None:
+            received_ns = time.monotonic_ns()
+        _, cooldown_ns = self.actions[name]
+        last = self.last_accepted.get(name)
+        if last is not None and received_ns - last < cooldown_ns:
+            self.drops[name] += 1
+            self.dropped.emit(name)
+            return False
+        self.last_accepted[name] = received_ns
+        # Run from the main loop, the signal may come from a D-Bus callback
+        QTimer.singleShot(0, lambda: self._run(name, received_ns))
+        return True
+
+    def _run(self, name, received_ns):
+        action = self.actions.get(name)
+        if action is None:
+            return
+        try:
+            action[0]()
+        finally:
+            latency_ns = time.monotonic_ns() - received_ns
+            self.histograms[name].add(latency_ns)
+            self.histogram.add(latency_ns)
+            self.dispatched.emit(name, latency_ns)
+
+    def within(self, budget_ms):
+        """
+        Share of recent dispatches that finished within a time budget,
+        e.g. one frame.
+
+        Returns:
+            float: Between 0 and 1, or None without samples
+        """
+        histogram = self.histogram
+        if not histogram.recent_count:
+            return None
+        budget_ns = budget_ms * 1e6
+        inside = sum(
+            1 for i in range(histogram.recent_count)
+            if histogram.recent[(histogram.recent_start + i) % histogram.window] <= budget_ns
+        )
+        return inside / histogram.recent_count
+
+    def summary(self):
+        """Latency and drop counts per action as a plain dict"""
+        return {
+            name: dict(self.histograms[name].summary(), dropped=self.drops[name])
+            for name in self.actions
+        }
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+
+def existing_dir(path):
+    """The path's directory, or its nearest parent that exists"""
+    path = os.path.abspath(os.path.expanduser(path or "."))
+    if not os.path.isdir(path):
+        path = os.path.dirname(path)
+    while not os.path.isdir(path) and os.path.dirname(path) != path:
+        path = os.path.dirname(path)
+    return path
+
+def free_bytes(path):
+    """
+    Space left for an unprivileged writer on the filesystem holding path.
+
+    Returns:
+        int: Free bytes, or None if the filesystem cannot be queried
+    """
+    try:
+        stat = os.statvfs(existing_dir(path))
+    except OSError:
+        return None
+    return stat.f_bavail * stat.f_frsize
+
+def check_space(path, bitrate_kbps, reserve_bytes=0):
+    """
+    Free space for a recording written to path, and how long it lasts.
+
+    Args:
+        path (str): Output file or directory
+        bitrate_kbps (float): Expected write rate, video plus audio
+        reserve_bytes (int): Space to leave untouched
+
+    Returns:
+        dict: free_bytes and seconds_left, either None when unknown
+    """
+    free = free_bytes(path)
+    seconds_left = None
+    if free is not None and bitrate_kbps > 0:
+        seconds_left = max(0, free - reserve_bytes) / (bitrate_kbps * 125)
+    return {"free_bytes": free, "seconds_left": seconds_left}
+
+def format_minutes(seconds):
+    if seconds >= 3600:
+        return f"{seconds / 3600:.1f} h"
+    return f"{seconds / 60:.0f} min" if seconds >= 60 else f"{seconds:.0f} s"
+
+class StorageMonitor(QObject):
+    """
+    Watches free space on the filesystem a recording is written to.
+
+    Every interval_ms statvfs gives the free space, and the BitrateSampler
+    the measured write rate. Time to full is the free space (less
+    reserve_bytes) over the larger of the measured and estimated rates, so
+    a recording that has just started is judged by the configured bitrate.
+    Below warn_s a warning is sent, below stop_s (or once free space drops
+    under the reserve) stop_requested asks the owner to stop the recording
+    while the file can still be finished.
+
+    A replay buffer only writes when a clip is saved, so it is judged by
+    how many more clips fit, and only warned about.
+    """
+
+    sampled = pyqtSignal(dict)  # The latest sample
+    warning = pyqtSignal(str)
+    stop_requested = pyqtSignal(str)
+
+    def __init__(self, sampler, interval_ms=2000, warn_s=600, stop_s=60,
+                 reserve_bytes=256 * 1024 * 1024, parent=None):
+        """
+        Args:
+            sampler (BitrateSampler): Measures the recording's bitrate
+        """
+        super().__init__(parent)
+        self.sampler = sampler
+        self.warn_s = warn_s
+        self.stop_s = stop_s
+        self.reserve_bytes = reserve_bytes
+
+        self.timer = QTimer(self)
+        self.timer.setInterval(interval_ms)
+        self.timer.timeout.connect(self.sample)
+
+        # A saved replay changes how many more fit
+        sampler.sampled.connect(lambda sample: self.sample() if self.replay_mode else None)
+
+        self.path = None
+        self.replay_mode = False
+        self.estimated_kbps = 0
+        self.clip_seconds = 0
+        self.warned = False
+        self.stop_sent = False
+        self.last = None  # The latest sample
+
+    def start(self, path, replay_mode=False, estimated_kbps=0, clip_seconds=0):
+        """
+        Start watching a recording.
+
+        Args:
+            path (str): Output file, or the replay output directory
+            replay_mode (bool): Whether the recorder runs a replay buffer
+            estimated_kbps (float): Write rate expected from the settings
+            clip_seconds (int): Length of a saved replay
+        """
+        self.path = path
+        self.replay_mode = replay_mode
+        self.estimated_kbps = estimated_kbps
+        self.clip_seconds = clip_seconds
+        self.warned = False
+        self.stop_sent = False
+        self.last = None
+        self.timer.start()
+        self.sample()
+
+    def stop(self):
+        self.timer.stop()
+
+    def check_start(self, path, estimated_kbps):
+        """
+        Check a recording is worth starting, before launching it.
+
+        Returns:
+            str: Why it would be stopped straight away, or None if there is room
+        """
+        space = check_space(path, estimated_kbps, self.reserve_bytes)
+        if space["seconds_left"] is not None and space["seconds_left"] < self.stop_s:
+            return f"Not enough free space to record: {space['free_bytes'] / 1024 ** 2:.0f} MB free"
+        return None
+
+    def sample(self):
+        """Take a sample now, sending warnings as thresholds are crossed"""
+        if self.path is None:
+            return
+        free = free_bytes(self.path)
+        sample = {
+            "path": self.path,
+            "free_bytes": free,
+            "estimated_kbps": self.estimated_kbps,
+            "measured_kbps": self.sampler.average.last(),
+            "seconds_left": None,
+            "clips_left": None,
+        }
+        self.last = sample
+        if free is None:
+            self.sampled.emit(sample)
+            return
+        usable = free - self.reserve_bytes
+
+        if self.replay_mode:
+            clip_bytes = self.sampler.clip_bytes or self.estimated_kbps * 125 * self.clip_seconds
+            if clip_bytes > 0:
+                sample["clips_left"] = max(0, int(usable // clip_bytes))
+                if sample["clips_left"] < 3 and not self.warned:
+                    self.warned = True
+                    self.warning.emit(
+                        f"Only {free / 1024 ** 3:.1f} GB free for replays, "
+                        + ("not enough for another clip" if sample["clips_left"] == 0
+                           else f"room for about {sample['clips_left']} more")
+                    )
+            self.sampled.emit(sample)
+            return
+
+        # Judge by the faster of the measured and configured rates, once
+        # a few samples have evened out the first writes
+        measured = self.sampler.average.last(0) if self.sampler.average.count >= 3 else 0
+        kbps = max(measured, self.estimated_kbps)
+        if kbps > 0:
+            sample["seconds_left"] = max(0, usable) / (kbps * 125)
+        self.sampled.emit(sample)
+
+        seconds_left = sample["seconds_left"]
+        if usable <= 0 or (seconds_left is not None and seconds_left < self.stop_s):
+            if not self.stop_sent:
+                self.stop_sent = True
+                self.stop_requested.emit(f"Disk almost full, {free / 1024 ** 2:.0f} MB free")
+        elif seconds_left is not None and seconds_left < self.warn_s and not self.warned:
+            self.warned = True
+            self.warning.emit(
+                f"Only {free / 1024 ** 3:.1f} GB free, about {format_minutes(seconds_left)} of recording left"
+            )
+
+    def snapshot(self):
+        """The latest sample, as a plain dict"""
+        return dict(self.last or {})
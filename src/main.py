@@ -1,32 +1,177 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
+import argparse
+import json
+import signal
+import socket
 import sys
 import traceback
-from PyQt6.QtWidgets import QApplication
-from PyQt6.QtGui import QIcon
+from PyQt6.QtCore import QCoreApplication, QSettings, QTimer
 
-# Use relative import for local modules
-# This assumes the file is in the src/ directory
-from .MainWindow import GPUScreenRecorderGUI
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="GPU Screen Recorder GUI")
+    parser.add_argument("--headless", action="store_true",
+                        help="Run without a window, controlled through a Unix socket")
+    parser.add_argument("--socket", metavar="PATH",
+                        help="Control socket path (default: $XDG_RUNTIME_DIR/gpu-screen-recorder-gui-<uid>.sock)")
+    parser.add_argument("--send", metavar="COMMAND", nargs="+",
+                        help="Send a command to a running headless instance and print the reply")
+    # Qt options like -style are left for QApplication
+    args, _ = parser.parse_known_args(argv[1:])
+    return args
+
+def setup_application(app):
+    app.setApplicationName("GPU Screen Recorder")
+    app.setOrganizationName("GPUScreenRecorder")
+    app.setOrganizationDomain("github.com/gpu-screen-recorder")
+
+def send_command(socket_path, command):
+    """Send one request to the control socket and print the reply"""
+    from .ControlServer import default_socket_path
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        client.connect(socket_path or default_socket_path())
+        client.sendall((" ".join(command) + "\n").encode("utf-8"))
+        reply = b""
+        while not reply.endswith(b"\n"):
+            chunk = client.recv(65536)
+            if not chunk:
+                break
+            reply += chunk
+    except OSError as e:
+        print(f"Could not reach the headless instance: {e}", file=sys.stderr)
+        return 1
+    finally:
+        client.close()
+
+    print(reply.decode("utf-8").strip())
+    return 0 if json.loads(reply or b"{}").get("ok") else 1
+
+def run_headless(socket_path):
+    """Run the recorder controller and control socket without any widgets"""
+    from .RecorderConfig import RecorderConfig
+    from .RecorderController import RecorderController
+    from .ControlServer import ControlServer
+    from .ReplayPrewarmer import ReplayPrewarmer
+    from .SessionManager import SessionManager
+    from .PostProcessQueue import PostProcessQueue
+    from .LogBatcher import LogBatcher
+
+    app = QCoreApplication(sys.argv)
+    setup_application(app)
+    settings = QSettings()
+
+    # Log to stdout in batches, like the log tab
+    log_batcher = LogBatcher(parent=app)
+    log_batcher.flushed.connect(lambda lines: print("\n".join(lines), flush=True))
+
+    controller = RecorderController(app)
+    app.aboutToQuit.connect(controller.finish_pending)
+    controller.line.connect(lambda stream, text, timestamp: log_batcher.add(text))
+    controller.error.connect(lambda message: log_batcher.add(f"ERROR: {message}"))
+    controller.message.connect(log_batcher.add)
+    controller.crashed.connect(
+        lambda record: log_batcher.add(
+            f"Recorder crashed (exit code {record['exit_code']}), "
+            + (f"restarting in {record['restart_delay_ms']} ms" if record["restart_delay_ms"] is not None else "not restarting")
+        )
+    )
+    controller.finished.connect(
+        lambda unexpected: log_batcher.add("Recording finished" if unexpected else "Recording stopped")
+    )
+
+    config = RecorderConfig.from_settings(settings)
+
+    # Stop before the disk fills up, unless turned off
+    def on_storage_full(reason):
+        if config.storage_auto_stop and controller.is_recording:
+            log_batcher.add(f"{reason}, stopping")
+            controller.stop()
+        else:
+            log_batcher.add(f"WARNING: {reason}")
+    controller.storage.warning.connect(lambda text: log_batcher.add(f"WARNING: {text}"))
+    controller.storage.stop_requested.connect(on_storage_full)
+
+    sessions = SessionManager(config, settings, app)
+    sessions.session_line.connect(lambda name, text: log_batcher.add(f"[{name}] {text}"))
+    sessions.session_error.connect(lambda name, message: log_batcher.add(f"ERROR [{name}]: {message}"))
+    app.aboutToQuit.connect(sessions.finish_pending)
+
+    # Post-processing scripts for saved replays
+    jobs = PostProcessQueue(config, parent=app)
+    def on_job_changed(job):
+        if job["state"] in jobs.FINISHED:
+            log_batcher.add(
+                f"Post-processing {job['clip']}: {job['state']}"
+                + (f" (exit {job['exit_code']}, {job['wall_ms']:.0f} ms)" if job["wall_ms"] is not None else "")
+            )
+    jobs.job_changed.connect(on_job_changed)
+    controller.save_queue.clip_ready.connect(lambda record: jobs.add(record["path"]))
+    sessions.replay_saved.connect(lambda name, path: jobs.add(path))
+    app.aboutToQuit.connect(jobs.shutdown)
+
+    server = ControlServer(controller, config, socket_path, sessions, jobs, parent=app)
+    server.message.connect(log_batcher.add)
+    if not server.listen():
+        log_batcher.flush()
+        return 1
+
+    # Optional background replay buffer, taken over by "start replay"
+    prewarmer = ReplayPrewarmer(controller, config, parent=app)
+    prewarmer.sync()
+
+    # Stop cleanly on Ctrl+C / SIGTERM
+    def shutdown(*args):
+        if controller.is_recording:
+            controller.stop()
+        sessions.stop_all()
+        prewarmer.set_paused(True)
+        server.close()
+        log_batcher.flush()
+        app.quit()
+
+    signal.signal(signal.SIGINT, shutdown)
+    signal.signal(signal.SIGTERM, shutdown)
+
+    # Let the Python interpreter run now and then so signal handlers fire
+    signal_timer = QTimer()
+    signal_timer.start(250)
+    signal_timer.timeout.connect(lambda: None)
+
+    status = app.exec()
+    log_batcher.flush()
+    return status
 
 def main():
     try:
+        args = parse_args(sys.argv)
+
+        if args.send:
+            sys.exit(send_command(args.socket, args.send))
+
+        if args.headless:
+            sys.exit(run_headless(args.socket))
+
+        from PyQt6.QtWidgets import QApplication
+
+        # Use relative import for local modules
+        # This assumes the file is in the src/ directory
+        from .MainWindow import GPUScreenRecorderGUI
+
         app = QApplication(sys.argv)
-        app.setApplicationName("GPU Screen Recorder")
-        app.setOrganizationName("GPUScreenRecorder")
-        app.setOrganizationDomain("github.com/gpu-screen-recorder")
-        
+        setup_application(app)
+
         # Enable KDE Plasma theme integration
         app.setStyle("fusion")  # Use Fusion style which adapts better to KDE themes
-        
+
         # Keep the app running when the window is closed
         app.setQuitOnLastWindowClosed(False)
-        
+
         # Create and show the main window
         window = GPUScreenRecorderGUI()
         window.show()
-        
+
         # Start the application event loop
         sys.exit(app.exec())
     except Exception as e:
@@ -34,4 +179,4 @@ def main():
         traceback.print_exc()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
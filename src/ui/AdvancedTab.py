@@ -9,10 +9,24 @@ from PyQt6.QtWidgets import (
 )
 
 class AdvancedTab(QWidget):
-    def __init__(self, settings):
+    def __init__(self, settings, config):
         super().__init__()
         self.settings = settings
+        self.config = config
         self.init_ui()
+        
+        # Keep the shared recorder config in step with the widgets
+        self.update_config()
+        for changed in (
+            self.codec_combo.currentTextChanged, self.frame_mode_combo.currentTextChanged,
+            self.audio_codec_combo.currentTextChanged, self.audio_bitrate_checkbox.toggled,
+            self.audio_bitrate_spinbox.valueChanged, self.bitrate_mode_combo.currentTextChanged,
+            self.cbr_spinbox.valueChanged, self.color_range_combo.currentTextChanged,
+            self.keyframe_spinbox.valueChanged, self.encoder_combo.currentTextChanged,
+            self.overclock_checkbox.toggled, self.portal_session_checkbox.toggled,
+            self.verbose_checkbox.toggled
+        ):
+            changed.connect(self.update_config)
     
     def init_ui(self):
         layout = QVBoxLayout(self)
@@ -424,48 +438,19 @@ class AdvancedTab(QWidget):
         self.settings.setValue("advanced/overclock", self.overclock_checkbox.isChecked())
         self.settings.setValue("advanced/verbose", self.verbose_checkbox.isChecked())
     
-    def build_command(self):
-        """Generate command line arguments for gpu-screen-recorder advanced options"""
-        command = []
-        
-        # Video codec
-        command.extend(["-k", self.get_codec()])
-        
-        # Frame rate mode
-        command.extend(["-fm", self.get_frame_mode()])
-        
-        # Audio codec
-        command.extend(["-ac", self.get_audio_codec()])
-        
-        # Audio bitrate
-        if not self.audio_bitrate_checkbox.isChecked():
-            command.extend(["-ab", str(self.audio_bitrate_spinbox.value())])
-        
-        # Bitrate mode
-        command.extend(["-bm", self.get_bitrate_mode()])
-        
-        # CBR bitrate
-        if self.get_bitrate_mode() == "cbr":
-            command.extend(["-q", str(self.cbr_spinbox.value())])
-        
-        # Color range
-        command.extend(["-cr", self.get_color_range()])
-        
-        # Keyframe interval
-        command.extend(["-keyint", str(self.keyframe_spinbox.value())])
-        
-        # Encoder
-        command.extend(["-encoder", self.get_encoder()])
-        
-        # Overclock
-        if self.overclock_checkbox.isChecked():
-            command.extend(["-oc", "yes"])
-        
-        # Portal session
-        if self.portal_session_checkbox.isChecked():
-            command.extend(["-restore-portal-session", "yes"])
-        
-        # Verbose
-        command.extend(["-v", "yes" if self.verbose_checkbox.isChecked() else "no"])
-        
-        return command
\ No newline at end of file
+    def update_config(self):
+        """Copy the widget values into the recorder config"""
+        config = self.config
+        config.video_codec = self.get_codec()
+        config.frame_mode = self.get_frame_mode()
+        config.audio_codec = self.get_audio_codec()
+        config.audio_auto_bitrate = self.audio_bitrate_checkbox.isChecked()
+        config.audio_bitrate = self.audio_bitrate_spinbox.value()
+        config.bitrate_mode = self.get_bitrate_mode()
+        config.cbr_bitrate = self.cbr_spinbox.value()
+        config.color_range = self.get_color_range()
+        config.keyframe_interval = self.keyframe_spinbox.value()
+        config.encoder = self.get_encoder()
+        config.overclock = self.overclock_checkbox.isChecked()
+        config.restore_portal_session = self.portal_session_checkbox.isChecked()
+        config.verbose = self.verbose_checkbox.isChecked()
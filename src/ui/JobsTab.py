@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import time
+from PyQt6.QtCore import Qt
+from PyQt6.QtGui import QFontDatabase
+from PyQt6.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLabel, QGroupBox,
+    QTableWidget, QTableWidgetItem, QHeaderView, QAbstractItemView, QPlainTextEdit
+)
+
+class JobsTab(QWidget):
+    COLUMNS = ["Clip", "State", "Attempts", "Wall Time", "Exit Status", "Queued"]
+
+    def __init__(self, queue):
+        super().__init__()
+        self.queue = queue
+        self.rows = {}  # Job id -> table row
+        self.init_ui()
+
+        self.queue.job_changed.connect(self.update_job)
+        self.queue.jobs_changed.connect(self.refresh)
+        self.refresh()
+
+    def init_ui(self):
+        layout = QVBoxLayout(self)
+
+        info_label = QLabel(
+            "Post-processing scripts run here, one queue for every saved replay. "
+            "Concurrency, priority, timeout and retries are set in the Replay tab."
+        )
+        info_label.setWordWrap(True)
+        layout.addWidget(info_label)
+
+        # Job table
+        self.table = QTableWidget(0, len(self.COLUMNS))
+        self.table.setHorizontalHeaderLabels(self.COLUMNS)
+        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.table.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
+        self.table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.table.verticalHeader().setVisible(False)
+        self.table.itemSelectionChanged.connect(self.on_selection_changed)
+        layout.addWidget(self.table)
+
+        # Buttons
+        button_layout = QHBoxLayout()
+        self.summary_label = QLabel()
+        self.retry_btn = QPushButton("Retry")
+        self.retry_btn.clicked.connect(lambda: self.queue.retry(self.selected()))
+        self.cancel_btn = QPushButton("Cancel")
+        self.cancel_btn.clicked.connect(lambda: self.queue.cancel(self.selected()))
+        self.clear_btn = QPushButton("Clear Finished")
+        self.clear_btn.clicked.connect(self.queue.clear_finished)
+
+        button_layout.addWidget(self.summary_label)
+        button_layout.addStretch()
+        button_layout.addWidget(self.retry_btn)
+        button_layout.addWidget(self.cancel_btn)
+        button_layout.addWidget(self.clear_btn)
+        layout.addLayout(button_layout)
+
+        # Output of the selected job
+        output_group = QGroupBox("Script Output")
+        output_layout = QVBoxLayout(output_group)
+        self.output_view = QPlainTextEdit()
+        self.output_view.setReadOnly(True)
+        self.output_view.setFont(QFontDatabase.systemFont(QFontDatabase.SystemFont.FixedFont))
+        self.output_view.setMaximumHeight(150)
+        output_layout.addWidget(self.output_view)
+        layout.addWidget(output_group)
+
+        self.update_buttons()
+
+    def refresh(self):
+        """Rebuild the table, newest job first"""
+        self.table.setRowCount(0)
+        self.rows = {}
+        for job in reversed(self.queue.jobs):
+            row = self.table.rowCount()
+            self.table.insertRow(row)
+            self.rows[job["id"]] = row
+            self.fill_row(row, job)
+        self.update_summary()
+
+    def update_job(self, job):
+        row = self.rows.get(job["id"])
+        if row is None:
+            self.refresh()
+            return
+        self.fill_row(row, job)
+        self.update_summary()
+        if job["id"] == self.selected():
+            self.on_selection_changed()
+
+    def fill_row(self, row, job):
+        if job["wall_ms"] is None:
+            wall = "-"
+        elif job["wall_ms"] >= 1000:
+            wall = f"{job['wall_ms'] / 1000:.1f} s"
+        else:
+            wall = f"{job['wall_ms']:.0f} ms"
+        if job["error"]:
+            status = job["error"]
+        elif job["exit_code"] is None:
+            status = "-"
+        else:
+            status = f"exit {job['exit_code']}"
+
+        values = [
+            os.path.basename(job["clip"]),
+            job["state"],
+            str(job["attempts"]),
+            wall,
+            status,
+            time.strftime("%H:%M:%S", time.localtime(job["queued_at"])),
+        ]
+        for column, value in enumerate(values):
+            item = QTableWidgetItem(value)
+            if column == 0:
+                item.setData(Qt.ItemDataRole.UserRole, job["id"])
+                item.setToolTip(job["clip"])
+            self.table.setItem(row, column, item)
+
+    def update_summary(self):
+        counts = self.queue.counts()
+        self.summary_label.setText(", ".join(f"{count} {state}" for state, count in sorted(counts.items())) or "No jobs")
+
+    def selected(self):
+        items = self.table.selectedItems()
+        if not items:
+            return None
+        return self.table.item(items[0].row(), 0).data(Qt.ItemDataRole.UserRole)
+
+    def on_selection_changed(self):
+        job_id = self.selected()
+        job = None
+        if job_id is not None:
+            try:
+                job = self.queue.get(job_id)
+            except ValueError:
+                pass
+        self.output_view.setPlainText("\n".join(job["output"]) if job else "")
+        self.update_buttons(job)
+
+    def update_buttons(self, job=None):
+        self.retry_btn.setEnabled(job is not None and job["state"] in self.queue.FINISHED)
+        self.cancel_btn.setEnabled(job is not None and job["state"] in ("queued", "running"))
@@ -0,0 +1,329 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import time
+from collections import OrderedDict
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex, QTimer, QUrl, QSize
+from PyQt6.QtGui import QDesktopServices, QPixmap
+from PyQt6.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLabel, QLineEdit,
+    QTableView, QHeaderView, QAbstractItemView, QMessageBox
+)
+
+def format_size(size):
+    for unit in ("B", "KB", "MB", "GB"):
+        if size < 1024:
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} TB"
+
+def format_duration(seconds):
+    if seconds is None:
+        return "-"
+    minutes, seconds = divmod(int(round(seconds)), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}:{minutes:02d}:{seconds:02d}" if hours else f"{minutes}:{seconds:02d}"
+
+class ClipTableModel(QAbstractTableModel):
+    """
+    One page of the replay library. Rows come from ReplayLibrary.page(), so
+    sorting and paging happen in SQLite and only page_size rows are ever
+    held here, however many clips are indexed.
+
+    Thumbnails and durations come from the ClipProcessor: rows the view
+    asks for are looked up in its cache and queued when missing, and fill
+    in when the result arrives. Painting never waits for a worker.
+    """
+
+    COLUMNS = [
+        ("name", "Name"),
+        ("created", "Saved"),
+        ("duration", "Duration"),
+        ("size", "Size"),
+        ("container", "Format"),
+        ("folder", "Folder"),
+    ]
+
+    THUMBNAIL_SIZE = QSize(96, 54)
+
+    def __init__(self, library, processor=None, page_size=200, pixmap_cache=500, parent=None):
+        super().__init__(parent)
+        self.library = library
+        self.processor = processor
+        self.page_size = page_size
+        self.info = {}  # Path -> processed metadata, or None while pending
+        self.pixmaps = OrderedDict()  # Path -> scaled thumbnail, least recently used first
+        self.pixmap_cache = pixmap_cache
+        if processor is not None:
+            processor.processed.connect(self.on_processed)
+        self.page_index = 0
+        self.sort_key = "created"
+        self.descending = True
+        self.filter_text = ""
+        self.rows = []
+        self.total = 0
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.COLUMNS)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return self.COLUMNS[section][1]
+        return None
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        row = self.rows[index.row()]
+        key = self.COLUMNS[index.column()][0]
+        if role == Qt.ItemDataRole.DecorationRole and key == "name":
+            self.ensure_info(row["path"])
+            pixmap = self.pixmaps.get(row["path"])
+            if pixmap is not None:
+                self.pixmaps.move_to_end(row["path"])
+            return pixmap
+        if role == Qt.ItemDataRole.DisplayRole:
+            value = row[key]
+            if key == "created":
+                return time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(value))
+            if key == "size":
+                return format_size(value)
+            if key == "duration":
+                if value is None:
+                    self.ensure_info(row["path"])
+                return format_duration(value)
+            return value
+        if role == Qt.ItemDataRole.ToolTipRole:
+            info = self.info.get(row["path"])
+            if not info:
+                return row["path"]
+            details = []
+            if info.get("width"):
+                details.append(f"{info['width']}x{info['height']}")
+            details += [info[codec] for codec in ("video_codec", "audio_codec") if info.get(codec)]
+            return row["path"] + ("\n" + ", ".join(details) if details else "")
+        if role == Qt.ItemDataRole.TextAlignmentRole and key in ("size", "duration"):
+            return int(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+        return None
+
+    def sort(self, column, order=Qt.SortOrder.AscendingOrder):
+        self.sort_key = self.COLUMNS[column][0]
+        self.descending = order == Qt.SortOrder.DescendingOrder
+        self.page_index = 0
+        self.reload()
+
+    def page_count(self):
+        return max(1, (self.total + self.page_size - 1) // self.page_size)
+
+    def set_page(self, page_index):
+        self.page_index = max(0, min(page_index, self.page_count() - 1))
+        self.reload()
+
+    def set_filter(self, text):
+        self.filter_text = text.strip()
+        self.page_index = 0
+        self.reload()
+
+    def reload(self):
+        self.beginResetModel()
+        self.total = self.library.count(self.filter_text)
+        self.page_index = min(self.page_index, self.page_count() - 1)
+        self.rows = self.library.page(
+            self.page_index * self.page_size, self.page_size,
+            self.sort_key, self.descending, self.filter_text
+        )
+        # A clip rewritten in place lost its duration, probe it again
+        for row in self.rows:
+            if row["duration"] is None and self.info.get(row["path"]):
+                del self.info[row["path"]]
+                self.pixmaps.pop(row["path"], None)
+        self.endResetModel()
+
+    def path(self, row):
+        return self.rows[row]["path"]
+
+    def ensure_info(self, path):
+        """Use the processor's cached result for a clip, or queue it"""
+        if self.processor is None or path in self.info:
+            return
+        info = self.processor.cached(path)
+        if info is None:
+            self.info[path] = None
+            self.processor.request(path, urgent=True)
+            return
+        self.apply_info(path, info)
+        # Probed before the library knew about it
+        for row in self.rows:
+            if row["path"] == path and row["duration"] is None and info.get("duration") is not None:
+                row["duration"] = info["duration"]
+                self.library.set_duration(path, info["duration"])
+
+    def apply_info(self, path, info):
+        self.info[path] = info
+        if info.get("thumbnail") and path not in self.pixmaps:
+            pixmap = QPixmap(info["thumbnail"])
+            if not pixmap.isNull():
+                self.pixmaps[path] = pixmap.scaled(
+                    self.THUMBNAIL_SIZE, Qt.AspectRatioMode.KeepAspectRatio,
+                    Qt.TransformationMode.SmoothTransformation
+                )
+                while len(self.pixmaps) > self.pixmap_cache:
+                    self.pixmaps.popitem(last=False)
+
+    def on_processed(self, path, info):
+        for row_index, row in enumerate(self.rows):
+            if row["path"] != path:
+                continue
+            self.apply_info(path, info)
+            if row["duration"] is None and info.get("duration") is not None:
+                row["duration"] = info["duration"]
+            self.dataChanged.emit(self.index(row_index, 0), self.index(row_index, len(self.COLUMNS) - 1))
+            break
+
+class LibraryTab(QWidget):
+    def __init__(self, library, roots=None, processor=None):
+        super().__init__()
+        self.library = library
+        self.roots = roots  # Returns the folders to index, they follow the settings
+        self.processor = processor
+        self.model = ClipTableModel(library, processor, parent=self)
+        self.init_ui()
+
+        # Reload the page at most this often while clips keep arriving,
+        # and not at all while the tab is hidden
+        self.stale = True
+        self.reload_timer = QTimer(self)
+        self.reload_timer.setSingleShot(True)
+        self.reload_timer.setInterval(300)
+        self.reload_timer.timeout.connect(self.reload)
+        self.library.changed.connect(self.on_library_changed)
+        self.library.scan_finished.connect(self.on_scan_finished)
+
+        self.filter_timer = QTimer(self)
+        self.filter_timer.setSingleShot(True)
+        self.filter_timer.setInterval(250)
+        self.filter_timer.timeout.connect(lambda: self.model.set_filter(self.filter_edit.text()))
+
+    def init_ui(self):
+        layout = QVBoxLayout(self)
+
+        # Filter and rescan
+        top_layout = QHBoxLayout()
+        self.filter_edit = QLineEdit()
+        self.filter_edit.setPlaceholderText("Filter by name")
+        self.filter_edit.textChanged.connect(lambda: self.filter_timer.start())
+        top_layout.addWidget(self.filter_edit)
+        self.rescan_btn = QPushButton("Rescan")
+        self.rescan_btn.clicked.connect(lambda: self.library.scan(force=True))
+        top_layout.addWidget(self.rescan_btn)
+        layout.addLayout(top_layout)
+
+        # Clip table
+        self.table = QTableView()
+        self.table.setModel(self.model)
+        self.table.setSortingEnabled(True)
+        self.table.horizontalHeader().setSortIndicator(1, Qt.SortOrder.DescendingOrder)
+        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.table.verticalHeader().setVisible(False)
+        if self.processor is not None and self.processor.extractor.makes_thumbnails:
+            self.table.setIconSize(ClipTableModel.THUMBNAIL_SIZE)
+            self.table.verticalHeader().setDefaultSectionSize(ClipTableModel.THUMBNAIL_SIZE.height() + 4)
+        self.table.doubleClicked.connect(lambda index: self.open_clip(index.row()))
+        self.table.selectionModel().selectionChanged.connect(self.update_buttons)
+        layout.addWidget(self.table)
+
+        # Paging and actions
+        bottom_layout = QHBoxLayout()
+        self.prev_btn = QPushButton("Previous")
+        self.prev_btn.clicked.connect(lambda: self.model.set_page(self.model.page_index - 1))
+        self.next_btn = QPushButton("Next")
+        self.next_btn.clicked.connect(lambda: self.model.set_page(self.model.page_index + 1))
+        self.page_label = QLabel()
+        self.open_btn = QPushButton("Open")
+        self.open_btn.clicked.connect(lambda: self.open_clip(self.selected_row()))
+        self.folder_btn = QPushButton("Show in Folder")
+        self.folder_btn.clicked.connect(self.show_in_folder)
+        self.delete_btn = QPushButton("Delete")
+        self.delete_btn.clicked.connect(self.delete_clip)
+
+        bottom_layout.addWidget(self.prev_btn)
+        bottom_layout.addWidget(self.page_label)
+        bottom_layout.addWidget(self.next_btn)
+        bottom_layout.addStretch()
+        bottom_layout.addWidget(self.open_btn)
+        bottom_layout.addWidget(self.folder_btn)
+        bottom_layout.addWidget(self.delete_btn)
+        layout.addLayout(bottom_layout)
+
+        self.model.modelReset.connect(self.update_page_label)
+        self.update_buttons()
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        if self.stale:
+            self.reload()
+        # Catch up with settings changes and anything the watcher missed while hidden
+        if self.roots is None or not self.library.set_roots(self.roots()):
+            self.library.scan()
+
+    def on_library_changed(self):
+        self.stale = True
+        if self.isVisible() and not self.reload_timer.isActive():
+            self.reload_timer.start()
+
+    def on_scan_finished(self, elapsed_ms):
+        self.page_label.setToolTip(f"Last scan took {elapsed_ms:.0f} ms")
+
+    def reload(self):
+        self.stale = False
+        self.model.reload()
+
+    def update_page_label(self):
+        count, size = self.library.totals(self.model.filter_text)
+        self.page_label.setText(
+            f"Page {self.model.page_index + 1} of {self.model.page_count()}  ({count} clips, {format_size(size)})"
+        )
+        self.prev_btn.setEnabled(self.model.page_index > 0)
+        self.next_btn.setEnabled(self.model.page_index < self.model.page_count() - 1)
+        self.update_buttons()
+
+    def selected_row(self):
+        rows = self.table.selectionModel().selectedRows()
+        return rows[0].row() if rows else None
+
+    def update_buttons(self):
+        selected = self.selected_row() is not None
+        self.open_btn.setEnabled(selected)
+        self.folder_btn.setEnabled(selected)
+        self.delete_btn.setEnabled(selected)
+
+    def open_clip(self, row):
+        if row is not None:
+            QDesktopServices.openUrl(QUrl.fromLocalFile(self.model.path(row)))
+
+    def show_in_folder(self):
+        row = self.selected_row()
+        if row is not None:
+            QDesktopServices.openUrl(QUrl.fromLocalFile(os.path.dirname(self.model.path(row))))
+
+    def delete_clip(self):
+        row = self.selected_row()
+        if row is None:
+            return
+        path = self.model.path(row)
+        reply = QMessageBox.question(
+            self, "Delete Clip", f"Delete {os.path.basename(path)} from disk?",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+        )
+        if reply != QMessageBox.StandardButton.Yes:
+            return
+        try:
+            self.library.remove(path, delete_file=True)
+        except OSError as e:
+            QMessageBox.critical(self, "Error", f"Could not delete {path}: {e}")
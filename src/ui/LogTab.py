@@ -1,73 +1,184 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, QAbstractListModel, QModelIndex, QTimer
+from PyQt6.QtGui import QFontDatabase
 from PyQt6.QtWidgets import (
-    QWidget, QVBoxLayout, QHBoxLayout, QPushButton, 
-    QTextEdit, QCheckBox
+    QWidget, QVBoxLayout, QHBoxLayout, QPushButton,
+    QListView, QCheckBox, QLabel, QSpinBox, QApplication,
+    QAbstractItemView
 )
 
+class LogModel(QAbstractListModel):
+    """
+    Fixed-capacity ring buffer of log lines.
+    Once full, every new line drops the oldest one, so memory stays flat
+    and appending never touches the lines already stored.
+    """
+
+    def __init__(self, max_lines=10000, parent=None):
+        super().__init__(parent)
+        self.max_lines = max(1, max_lines)
+        self._buffer = [None] * self.max_lines
+        self._start = 0  # Index of the oldest line in the buffer
+        self._count = 0
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return self._count
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and index.isValid():
+            row = index.row()
+            if 0 <= row < self._count:
+                return self._buffer[(self._start + row) % self.max_lines]
+        return None
+
+    def append_lines(self, lines):
+        """Append lines as a single model insert, evicting the oldest if needed"""
+        if not lines:
+            return
+        # Only the newest max_lines can ever be visible
+        if len(lines) > self.max_lines:
+            lines = lines[-self.max_lines:]
+
+        # Make room first
+        overflow = self._count + len(lines) - self.max_lines
+        if overflow > 0:
+            self.beginRemoveRows(QModelIndex(), 0, overflow - 1)
+            self._start = (self._start + overflow) % self.max_lines
+            self._count -= overflow
+            self.endRemoveRows()
+
+        first = self._count
+        self.beginInsertRows(QModelIndex(), first, first + len(lines) - 1)
+        for line in lines:
+            self._buffer[(self._start + self._count) % self.max_lines] = line
+            self._count += 1
+        self.endInsertRows()
+
+    def lines(self):
+        """Return all stored lines, oldest first"""
+        return [self._buffer[(self._start + i) % self.max_lines] for i in range(self._count)]
+
+    def clear(self):
+        """Drop all lines"""
+        self.beginResetModel()
+        self._buffer = [None] * self.max_lines
+        self._start = 0
+        self._count = 0
+        self.endResetModel()
+
+    def set_max_lines(self, max_lines):
+        """Change the capacity, keeping the newest lines"""
+        max_lines = max(1, max_lines)
+        if max_lines == self.max_lines:
+            return
+        kept = self.lines()[-max_lines:]
+        self.beginResetModel()
+        self.max_lines = max_lines
+        self._buffer = kept + [None] * (max_lines - len(kept))
+        self._start = 0
+        self._count = len(kept)
+        self.endResetModel()
+
 class LogTab(QWidget):
-    def __init__(self):
+    def __init__(self, settings, log_model=None):
         super().__init__()
+        self.settings = settings
+        self.log_model = log_model
+        self.scroll_pending = False
         self.init_ui()
-    
+
     def init_ui(self):
         layout = QVBoxLayout(self)
-        
-        # Log text area
-        self.log_edit = QTextEdit()
-        self.log_edit.setReadOnly(True)
-        self.log_edit.setLineWrapMode(QTextEdit.LineWrapMode.NoWrap)  # Don't wrap text
-        
+
+        # Log model, bounded so long sessions don't grow memory
+        if self.log_model is None:
+            self.log_model = LogModel(int(self.settings.value("log/max_lines", 10000)), self)
+
+        # Log view - only draws the visible rows
+        self.log_view = QListView()
+        self.log_view.setModel(self.log_model)
+        self.log_view.setUniformItemSizes(True)
+        self.log_view.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.log_view.setSelectionMode(QAbstractItemView.SelectionMode.ExtendedSelection)
+        self.log_view.setWordWrap(False)  # Don't wrap text
+
         # Use monospace font but don't set custom colors - let the system theme handle it
-        self.log_edit.setStyleSheet("""
-            QTextEdit {
-                font-family: monospace;
-            }
-        """)
-        
-        layout.addWidget(self.log_edit)
-        
+        self.log_view.setFont(QFontDatabase.systemFont(QFontDatabase.SystemFont.FixedFont))
+
+        layout.addWidget(self.log_view)
+
         # Button layout
         button_layout = QHBoxLayout()
-        
+
         # Auto-scroll checkbox
         self.autoscroll_checkbox = QCheckBox("Auto-Scroll")
         self.autoscroll_checkbox.setChecked(True)
         button_layout.addWidget(self.autoscroll_checkbox)
-        
+
+        # Line limit
+        self.max_lines_label = QLabel("Keep Last:")
+        self.max_lines_spinbox = QSpinBox()
+        self.max_lines_spinbox.setRange(100, 1000000)
+        self.max_lines_spinbox.setSingleStep(1000)
+        self.max_lines_spinbox.setValue(self.log_model.max_lines)
+        self.max_lines_spinbox.setSuffix(" lines")
+        self.max_lines_spinbox.valueChanged.connect(self.log_model.set_max_lines)
+        button_layout.addWidget(self.max_lines_label)
+        button_layout.addWidget(self.max_lines_spinbox)
+
         # Spacer
         button_layout.addStretch()
-        
+
         # Clear log button
         self.clear_button = QPushButton("Clear Log")
         self.clear_button.clicked.connect(self.clear_log)
         button_layout.addWidget(self.clear_button)
-        
+
         # Copy button
         self.copy_button = QPushButton("Copy to Clipboard")
         self.copy_button.clicked.connect(self.copy_log)
         button_layout.addWidget(self.copy_button)
-        
+
         # Add button layout
         layout.addLayout(button_layout)
-    
+
     def append_log(self, text):
         """Append text to log with auto-scroll"""
-        self.log_edit.append(text)
-        
-        # Auto-scroll if enabled
+        self.append_lines(text.splitlines() or [""])
+
+    def append_lines(self, lines):
+        """Append several lines in one insert with auto-scroll"""
+        self.log_model.append_lines(lines)
+
+        # Auto-scroll if enabled, once per event loop pass rather than per append
+        if self.autoscroll_checkbox.isChecked() and not self.scroll_pending:
+            self.scroll_pending = True
+            QTimer.singleShot(0, self.scroll_to_bottom)
+
+    def scroll_to_bottom(self):
+        self.scroll_pending = False
+        # Scrolling forces a layout of every row, skip it while nobody can see
+        # the log; showEvent catches up
+        if self.log_view.isVisible():
+            self.log_view.scrollToBottom()
+
+    def showEvent(self, event):
+        super().showEvent(event)
         if self.autoscroll_checkbox.isChecked():
-            scrollbar = self.log_edit.verticalScrollBar()
-            scrollbar.setValue(scrollbar.maximum())
-    
+            QTimer.singleShot(0, self.scroll_to_bottom)
+
     def clear_log(self):
         """Clear the log"""
-        self.log_edit.clear()
-    
+        self.log_model.clear()
+
     def copy_log(self):
         """Copy log content to clipboard"""
-        self.log_edit.selectAll()
-        self.log_edit.copy()
-        self.log_edit.moveCursor(self.log_edit.textCursor().MoveOperation.Start)  # Reset cursor
\ No newline at end of file
+        QApplication.clipboard().setText("\n".join(self.log_model.lines()))
+
+    def save_settings(self):
+        """Save all settings to QSettings"""
+        self.settings.setValue("log/max_lines", self.max_lines_spinbox.value())
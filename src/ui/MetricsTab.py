@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+from PyQt6.QtGui import QFontDatabase
+from PyQt6.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QFormLayout, QLabel, QGroupBox,
+    QPushButton, QFileDialog, QMessageBox, QListWidget
+)
+
+class MetricsTab(QWidget):
+    def __init__(self, save_tracker, save_queue=None):
+        super().__init__()
+        self.save_tracker = save_tracker
+        self.save_queue = save_queue
+        self.init_ui()
+        if save_queue is not None:
+            save_queue.save_changed.connect(self.update_saves)
+            self.update_saves()
+
+    def init_ui(self):
+        layout = QVBoxLayout(self)
+
+        # Capture performance
+        capture_group = QGroupBox("Capture Performance")
+        capture_layout = QFormLayout(capture_group)
+
+        self.fps_value = QLabel("-")
+        self.fps_average_value = QLabel("-")
+        self.fps_minimum_value = QLabel("-")
+        self.damage_fps_value = QLabel("-")
+        self.dropped_value = QLabel("-")
+
+        capture_layout.addRow("Capture FPS:", self.fps_value)
+        capture_layout.addRow("Average FPS:", self.fps_average_value)
+        capture_layout.addRow("Lowest FPS:", self.fps_minimum_value)
+        capture_layout.addRow("Damage FPS:", self.damage_fps_value)
+        capture_layout.addRow("Dropped Frames:", self.dropped_value)
+
+        layout.addWidget(capture_group)
+
+        # Encoder status
+        encoder_group = QGroupBox("Encoder")
+        encoder_layout = QFormLayout(encoder_group)
+
+        self.encoder_status_value = QLabel("-")
+        self.encoder_status_value.setWordWrap(True)
+        self.warnings_value = QLabel("0")
+        self.errors_value = QLabel("0")
+
+        encoder_layout.addRow("Last Status:", self.encoder_status_value)
+        encoder_layout.addRow("Warnings:", self.warnings_value)
+        encoder_layout.addRow("Errors:", self.errors_value)
+
+        layout.addWidget(encoder_group)
+
+        # Save replay latency
+        latency_group = QGroupBox("Save Replay Latency")
+        latency_layout = QVBoxLayout(latency_group)
+        latency_form = QFormLayout()
+
+        self.saves_value = QLabel("0")
+        self.save_last_value = QLabel("-")
+        self.save_p50_value = QLabel("-")
+        self.save_p95_value = QLabel("-")
+        self.save_max_value = QLabel("-")
+        self.save_signal_value = QLabel("-")
+
+        latency_form.addRow("Saves:", self.saves_value)
+        latency_form.addRow("Last (request to file):", self.save_last_value)
+        latency_form.addRow("Median:", self.save_p50_value)
+        latency_form.addRow("95th Percentile:", self.save_p95_value)
+        latency_form.addRow("Worst:", self.save_max_value)
+        latency_form.addRow("Request to Signal (median):", self.save_signal_value)
+        latency_layout.addLayout(latency_form)
+
+        # Histogram drawn as text bars
+        self.histogram_label = QLabel()
+        self.histogram_label.setFont(QFontDatabase.systemFont(QFontDatabase.SystemFont.FixedFont))
+        latency_layout.addWidget(self.histogram_label)
+
+        # Recent saves with their queue state
+        self.saves_list = QListWidget()
+        self.saves_list.setFont(QFontDatabase.systemFont(QFontDatabase.SystemFont.FixedFont))
+        self.saves_list.setMaximumHeight(100)
+        latency_layout.addWidget(QLabel("Recent Saves:"))
+        latency_layout.addWidget(self.saves_list)
+
+        export_layout = QHBoxLayout()
+        export_layout.addStretch()
+        self.export_button = QPushButton("Export...")
+        self.export_button.clicked.connect(self.export_save_latency)
+        export_layout.addWidget(self.export_button)
+        latency_layout.addLayout(export_layout)
+
+        layout.addWidget(latency_group)
+
+        # Notification dispatch
+        notification_group = QGroupBox("Notifications")
+        notification_layout = QFormLayout(notification_group)
+
+        self.notifications_value = QLabel("-")
+        self.notification_p50_value = QLabel("-")
+        self.notification_max_value = QLabel("-")
+
+        notification_layout.addRow("Shown:", self.notifications_value)
+        notification_layout.addRow("Dispatch (median):", self.notification_p50_value)
+        notification_layout.addRow("Dispatch (worst):", self.notification_max_value)
+
+        layout.addWidget(notification_group)
+
+        # Shortcut to action latency
+        shortcut_group = QGroupBox("Shortcut Latency")
+        shortcut_layout = QVBoxLayout(shortcut_group)
+        shortcut_form = QFormLayout()
+
+        self.shortcuts_value = QLabel("0")
+        self.shortcut_p50_value = QLabel("-")
+        self.shortcut_max_value = QLabel("-")
+        self.shortcut_frame_value = QLabel("-")
+
+        shortcut_form.addRow("Shortcuts:", self.shortcuts_value)
+        shortcut_form.addRow("Median:", self.shortcut_p50_value)
+        shortcut_form.addRow("Worst:", self.shortcut_max_value)
+        shortcut_form.addRow("Within One Frame:", self.shortcut_frame_value)
+        shortcut_layout.addLayout(shortcut_form)
+
+        self.shortcut_histogram_label = QLabel()
+        self.shortcut_histogram_label.setFont(QFontDatabase.systemFont(QFontDatabase.SystemFont.FixedFont))
+        shortcut_layout.addWidget(self.shortcut_histogram_label)
+
+        layout.addWidget(shortcut_group)
+
+        # Spacer at the bottom
+        layout.addStretch()
+
+    def update_metrics(self, metrics):
+        """Show the latest values from a RecorderMetrics instance"""
+        snapshot = metrics.snapshot()
+
+        def fmt(value):
+            return "-" if value is None else f"{value:.0f}"
+
+        target = snapshot["target_fps"]
+        self.fps_value.setText(f"{fmt(snapshot['fps'])} / {target}" if target else fmt(snapshot["fps"]))
+        self.fps_average_value.setText(fmt(snapshot["fps_average"]))
+        self.fps_minimum_value.setText(fmt(snapshot["fps_minimum"]))
+        self.damage_fps_value.setText(fmt(snapshot["damage_fps"]))
+        self.dropped_value.setText(str(snapshot["dropped_frames"]))
+        self.encoder_status_value.setText(snapshot["encoder_status"] or "-")
+        self.warnings_value.setText(str(snapshot["warnings"]))
+        self.errors_value.setText(str(snapshot["errors"]))
+
+    def update_save_latency(self):
+        """Show the latest save replay latency figures"""
+        def fmt(value):
+            return "-" if value is None else f"{value:.1f} ms"
+
+        summary = self.save_tracker.histogram.summary()
+        self.saves_value.setText(str(summary["count"]))
+        self.save_last_value.setText(fmt(summary["last_ms"]))
+        self.save_p50_value.setText(fmt(summary["p50_ms"]))
+        self.save_p95_value.setText(fmt(summary["p95_ms"]))
+        self.save_max_value.setText(fmt(summary["max_ms"]))
+        self.save_signal_value.setText(fmt(self.save_tracker.signal_histogram.summary()["p50_ms"]))
+        self.histogram_label.setText(self.save_tracker.histogram.format_text())
+
+    def update_saves(self, changed=None):
+        """List the queue's recent saves, newest first"""
+        self.saves_list.clear()
+        for save in reversed(self.save_queue.snapshot()):
+            text = f"#{save['id']:<4} {save['state']:<9} {save['source']:<10}"
+            if save["total_ms"] is not None:
+                text += f" {save['total_ms']:8.0f} ms (waited {save['wait_ms']:.0f} ms)"
+            if save["merged"]:
+                text += f", {save['merged']} merged"
+            if save["path"]:
+                text += f"  {os.path.basename(save['path'])}"
+            self.saves_list.addItem(text)
+
+    def update_notifications(self, notification_manager):
+        """Show the latest notification dispatch figures"""
+        def fmt(value):
+            return "-" if value is None else f"{value:.1f} ms"
+
+        stats = notification_manager.stats()
+        self.notifications_value.setText(
+            f"{stats['latency']['count']} via {stats['backend']}, "
+            f"{stats['coalesced']} coalesced, {stats['dropped']} dropped"
+        )
+        self.notification_p50_value.setText(fmt(stats["latency"]["p50_ms"]))
+        self.notification_max_value.setText(fmt(stats["latency"]["max_ms"]))
+
+    def update_shortcuts(self, dispatcher, fps):
+        """Show the latest shortcut to action latency figures"""
+        def fmt(value):
+            return "-" if value is None else f"{value:.2f} ms"
+
+        summary = dispatcher.histogram.summary()
+        dropped = sum(dispatcher.drops.values())
+        self.shortcuts_value.setText(f"{summary['count']} ({dropped} ignored within cooldown)")
+        self.shortcut_p50_value.setText(fmt(summary["p50_ms"]))
+        self.shortcut_max_value.setText(fmt(summary["max_ms"]))
+        frame_ms = 1000 / max(1, fps)
+        share = dispatcher.within(frame_ms)
+        self.shortcut_frame_value.setText(
+            "-" if share is None else f"{share * 100:.0f}% (frame at {fps} fps: {frame_ms:.1f} ms)"
+        )
+        self.shortcut_histogram_label.setText(dispatcher.histogram.format_text())
+
+    def export_save_latency(self):
+        """Export the recorded save latencies to CSV or JSON"""
+        file_path, _ = QFileDialog.getSaveFileName(
+            self,
+            "Export Save Latency",
+            "save-latency.csv",
+            "CSV Files (*.csv);;JSON Files (*.json)"
+        )
+        if file_path:
+            try:
+                self.save_tracker.export(file_path)
+            except OSError as e:
+                QMessageBox.critical(self, "Error", f"Could not export save latency: {e}")
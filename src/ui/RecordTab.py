@@ -3,18 +3,48 @@
 
 import os
 from pathlib import Path
-from PyQt6.QtCore import Qt, QSettings
+from PyQt6.QtCore import Qt, QSettings, QTimer
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLabel, 
     QComboBox, QSpinBox, QCheckBox, QGroupBox, QFileDialog,
     QLineEdit
 )
 
+from ..DeviceDiscovery import DeviceDiscovery, DiscoveryCache
+from ..StorageMonitor import check_space, format_minutes
+
 class RecordTab(QWidget):
-    def __init__(self, settings):
+    def __init__(self, settings, config):
         super().__init__()
         self.settings = settings
+        self.config = config
+        
+        # Device probes run in the background and fill the combos when done
+        self.discovery = DeviceDiscovery(
+            cache=DiscoveryCache(settings, ttl=int(settings.value("discovery/cache_ttl", 300))),
+            parent=self
+        )
+        self.discovery.probe_finished.connect(self.on_probe_finished)
+        self.discovery.probe_failed.connect(self.on_probe_failed)
+        self.discovery.all_finished.connect(self.update_refresh_buttons)
+        
         self.init_ui()
+        
+        # Fill the combos from the last known results, then re-probe stale entries
+        self.discovery.load_cached()
+        QTimer.singleShot(0, lambda: self.discovery.refresh(force=False))
+        
+        # Keep the shared recorder config in step with the widgets
+        self.update_config()
+        for changed in (
+            self.source_combo.currentTextChanged, self.resolution_width.valueChanged,
+            self.resolution_height.valueChanged, self.resolution_checkbox.toggled,
+            self.fps_spinbox.valueChanged, self.audio_combo.currentTextChanged,
+            self.cursor_checkbox.toggled, self.quality_combo.currentTextChanged,
+            self.output_path_edit.textChanged, self.container_combo.currentTextChanged,
+            self.auto_stop_checkbox.toggled
+        ):
+            changed.connect(self.update_config)
     
     def init_ui(self):
         layout = QVBoxLayout(self)
@@ -109,7 +139,11 @@ class RecordTab(QWidget):
             "System Sound + Microphone": "default_output|default_input"
         }
         
-        self.audio_combo.addItems(list(self.audio_map.keys()))
+        self.default_audio_sources = list(self.audio_map.keys())
+        self.audio_devices = []
+        self.application_audio = []
+        
+        self.audio_combo.addItems(self.default_audio_sources)
         self.audio_combo.setEditable(True)
         
         # Set current value from settings
@@ -208,6 +242,18 @@ class RecordTab(QWidget):
         container_layout.addStretch()
         output_layout.addLayout(container_layout)
         
+        # Free space at the output path
+        self.free_space_label = QLabel()
+        output_layout.addWidget(self.free_space_label)
+        
+        self.auto_stop_checkbox = QCheckBox("Stop Recording Before the Disk Is Full")
+        self.auto_stop_checkbox.setToolTip(
+            "Stops the recording about a minute before the output disk runs out of space, "
+            "so the file can still be finished properly."
+        )
+        self.auto_stop_checkbox.setChecked(self.settings.value("storage/auto_stop", True, type=bool))
+        output_layout.addWidget(self.auto_stop_checkbox)
+        
         layout.addWidget(output_group)
         
         # Connect signals
@@ -222,105 +268,113 @@ class RecordTab(QWidget):
         self.resolution_height.setEnabled(enabled)
     
     def refresh_capture_sources(self):
-        import subprocess
-        try:
-            # Run gpu-screen-recorder --list-capture-options
-            process = subprocess.Popen(
-                ["gpu-screen-recorder", "--list-capture-options"],
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE
-            )
-            stdout, stderr = process.communicate()
-            
-            # Process the output
-            monitors = []
-            for line in stdout.decode().strip().split('\n'):
-                if '|' in line:
-                    monitor_name = line.split('|')[0]
-                    resolution = line.split('|')[1]
-                    monitors.append(f"{monitor_name} ({resolution})")
-            
-            # Add monitors to the dropdown
-            current_text = self.source_combo.currentText()
-            self.source_combo.clear()
-            
-            # First add built-in options
-            self.source_combo.addItems(["Screen", "Current Window", "Select Area (Portal)"])
-            
-            # Then add monitors
-            if monitors:
-                self.source_combo.addItems(monitors)
-            
-            # Try to restore previous selection
-            index = self.source_combo.findText(current_text)
-            if index >= 0:
-                self.source_combo.setCurrentIndex(index)
-        except Exception as e:
-            print(f"Error refreshing capture sources: {e}")
+        """Refresh the monitor list in the background"""
+        self.refresh_source_btn.setEnabled(False)
+        self.discovery.refresh(["capture_options"])
     
     def refresh_audio_sources(self):
-        import subprocess
+        """Refresh audio devices and application audio in the background"""
+        self.refresh_audio_btn.setEnabled(False)
+        self.discovery.refresh(["audio_devices", "application_audio"])
+    
+    def on_probe_finished(self, name, output):
+        """Apply the result of a single probe as soon as it arrives"""
         try:
-            # Get the current selection
-            current_selection = self.audio_combo.currentText()
-            
-            # Add standard options
-            self.audio_combo.clear()
-            self.audio_combo.addItems(list(self.audio_map.keys()))
-            
-            # Run gpu-screen-recorder --list-audio-devices
-            process = subprocess.Popen(
-                ["gpu-screen-recorder", "--list-audio-devices"],
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE
-            )
-            stdout, stderr = process.communicate()
-            
-            # Process audio devices output
-            devices = []
-            for line in stdout.decode().strip().split('\n'):
-                if '|' in line:
-                    device_id = line.split('|')[0]
-                    device_name = line.split('|')[1]
-                    if device_id and device_name:
-                        devices.append(f"{device_name}")
-                        # Store the mapping
-                        self.audio_map[device_name] = device_id
-            
-            # Add devices to dropdown
-            if devices:
-                self.audio_combo.addItems(devices)
-            
-            # Run gpu-screen-recorder --list-application-audio
-            process = subprocess.Popen(
-                ["gpu-screen-recorder", "--list-application-audio"],
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE
-            )
-            stdout, stderr = process.communicate()
-            
-            # Process application audio output
-            apps = []
-            for line in stdout.decode().strip().split('\n'):
-                app_name = line.strip()
-                if app_name:
-                    app_display = f"App: {app_name}"
-                    apps.append(app_display)
-                    # Store the mapping
-                    self.audio_map[app_display] = f"app:{app_name}"
-            
-            # Add apps to dropdown
-            if apps:
-                self.audio_combo.addItems(apps)
-            
-            # Try to restore previous selection
-            index = self.audio_combo.findText(current_selection)
-            if index >= 0:
-                self.audio_combo.setCurrentIndex(index)
-            else:
-                self.audio_combo.setCurrentText(current_selection)
+            if name == "capture_options":
+                self.apply_capture_options(output)
+            elif name == "audio_devices":
+                self.audio_devices = self.parse_audio_devices(output)
+                self.rebuild_audio_combo()
+            elif name == "application_audio":
+                self.application_audio = self.parse_application_audio(output)
+                self.rebuild_audio_combo()
         except Exception as e:
-            print(f"Error refreshing audio sources: {e}")
+            print(f"Error applying {name} probe result: {e}")
+        self.update_refresh_buttons()
+    
+    def on_probe_failed(self, name, message):
+        print(f"Error refreshing {name}: {message}")
+        self.update_refresh_buttons()
+    
+    def update_refresh_buttons(self):
+        """Re-enable refresh buttons once their probes are done"""
+        self.refresh_source_btn.setEnabled(not self.discovery.is_running("capture_options"))
+        self.refresh_audio_btn.setEnabled(
+            not self.discovery.is_running("audio_devices")
+            and not self.discovery.is_running("application_audio")
+        )
+    
+    def apply_capture_options(self, output):
+        # Process the output
+        monitors = []
+        for line in output.strip().split('\n'):
+            if '|' in line:
+                monitor_name = line.split('|')[0]
+                resolution = line.split('|')[1]
+                monitors.append(f"{monitor_name} ({resolution})")
+        
+        # Add monitors to the dropdown
+        current_text = self.source_combo.currentText()
+        self.source_combo.clear()
+        
+        # First add built-in options
+        self.source_combo.addItems(["Screen", "Current Window", "Select Area (Portal)"])
+        
+        # Then add monitors
+        if monitors:
+            self.source_combo.addItems(monitors)
+        
+        # Try to restore previous selection
+        index = self.source_combo.findText(current_text)
+        if index < 0:
+            # The saved monitor may only show up once the list is known
+            index = self.source_combo.findText(
+                f"{self.settings.value('capture/source', '')} (",
+                Qt.MatchFlag.MatchStartsWith
+            )
+        if index >= 0:
+            self.source_combo.setCurrentIndex(index)
+    
+    def parse_audio_devices(self, output):
+        """Parse --list-audio-devices output into (display name, device id) pairs"""
+        devices = []
+        for line in output.strip().split('\n'):
+            if '|' in line:
+                device_id = line.split('|')[0]
+                device_name = line.split('|')[1]
+                if device_id and device_name:
+                    devices.append((device_name, device_id))
+        return devices
+    
+    def parse_application_audio(self, output):
+        """Parse --list-application-audio output into (display name, source) pairs"""
+        apps = []
+        for line in output.strip().split('\n'):
+            app_name = line.strip()
+            if app_name:
+                apps.append((f"App: {app_name}", f"app:{app_name}"))
+        return apps
+    
+    def rebuild_audio_combo(self):
+        """Rebuild the audio dropdown from the latest probe results"""
+        # Get the current selection
+        current_selection = self.audio_combo.currentText()
+        
+        # Add standard options
+        self.audio_combo.clear()
+        self.audio_combo.addItems(self.default_audio_sources)
+        
+        # Add devices and apps, storing the mapping
+        for display_name, value in self.audio_devices + self.application_audio:
+            self.audio_map[display_name] = value
+            self.audio_combo.addItem(display_name)
+        
+        # Try to restore previous selection
+        index = self.audio_combo.findText(current_selection)
+        if index >= 0:
+            self.audio_combo.setCurrentIndex(index)
+        else:
+            self.audio_combo.setCurrentText(current_selection)
     
     def browse_output_path(self):
         # This will be adjusted based on whether we're in replay mode
@@ -352,6 +406,7 @@ class RecordTab(QWidget):
         # Output settings
         self.settings.setValue("output/path", self.output_path_edit.text())
         self.settings.setValue("output/container", self.get_container_format())
+        self.settings.setValue("storage/auto_stop", self.auto_stop_checkbox.isChecked())
     
     def get_source(self):
         """Get the actual source value from the friendly name"""
@@ -401,34 +456,35 @@ class RecordTab(QWidget):
         # Default to mp4 if unknown
         return "mp4"
     
-    def build_command(self):
-        """Generate command line arguments for gpu-screen-recorder"""
-        command = []
-        
-        # Capture source
-        command.extend(["-w", self.get_source()])
-        
-        # Resolution
-        if not self.resolution_checkbox.isChecked():
-            width = self.resolution_width.value()
-            height = self.resolution_height.value()
-            if width > 0 and height > 0:
-                command.extend(["-s", f"{width}x{height}"])
-        
-        # FPS
-        command.extend(["-f", str(self.fps_spinbox.value())])
-        
-        # Audio source
-        audio_source = self.get_audio_source()
-        if audio_source:
-            command.extend(["-a", audio_source])
-        
-        # Show cursor
-        command.extend(["-cursor", "yes" if self.cursor_checkbox.isChecked() else "no"])
-        
-        # Video quality
-        command.extend(["-q", self.get_quality()])
-        
-        # Output path (this will be added by the main window)
-        
-        return command
\ No newline at end of file
+    def update_config(self):
+        """Copy the widget values into the recorder config"""
+        config = self.config
+        config.source = self.get_source()
+        config.width = self.resolution_width.value()
+        config.height = self.resolution_height.value()
+        config.original_resolution = self.resolution_checkbox.isChecked()
+        config.fps = self.fps_spinbox.value()
+        config.audio_source = self.get_audio_source()
+        config.show_cursor = self.cursor_checkbox.isChecked()
+        config.quality = self.get_quality()
+        config.output_path = self.output_path_edit.text()
+        config.container = self.get_container_format()
+        config.storage_auto_stop = self.auto_stop_checkbox.isChecked()
+        self.update_free_space()
+    
+    def update_free_space(self):
+        """Show the free space at the output path and the recording time it holds"""
+        kbps = self.config.estimated_bitrate_kbps()
+        space = check_space(self.config.output_path, kbps)
+        if space["free_bytes"] is None:
+            self.free_space_label.setText("Free space: unknown")
+            return
+        text = f"Free space: {space['free_bytes'] / 1024 ** 3:.1f} GB"
+        if space["seconds_left"] is not None:
+            text += f", about {format_minutes(space['seconds_left'])} at ~{kbps / 1000:.1f} Mbps"
+        self.free_space_label.setText(text)
+    
+    def showEvent(self, event):
+        # Bitrate settings live on other tabs
+        super().showEvent(event)
+        self.update_free_space()
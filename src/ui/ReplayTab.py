@@ -7,14 +7,29 @@ from PyQt6.QtCore import Qt, QSettings
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLabel, 
     QSpinBox, QCheckBox, QGroupBox, QFileDialog, QLineEdit,
-    QComboBox
+    QComboBox, QFormLayout
 )
 
 class ReplayTab(QWidget):
-    def __init__(self, settings):
+    def __init__(self, settings, config):
         super().__init__()
         self.settings = settings
+        self.config = config
         self.init_ui()
+        
+        # Keep the shared recorder config in step with the widgets
+        self.update_config()
+        for changed in (
+            self.enable_replay_checkbox.toggled, self.buffer_spinbox.valueChanged,
+            self.container_combo.currentTextChanged, self.restart_checkbox.toggled,
+            self.prewarm_checkbox.toggled, self.merge_spinbox.valueChanged,
+            self.date_folders_checkbox.toggled, self.output_dir_edit.textChanged,
+            self.script_enabled_checkbox.toggled, self.script_path_edit.textChanged,
+            self.concurrency_spinbox.valueChanged, self.nice_spinbox.valueChanged,
+            self.idle_io_checkbox.toggled, self.timeout_spinbox.valueChanged,
+            self.retries_spinbox.valueChanged
+        ):
+            changed.connect(self.update_config)
     
     def init_ui(self):
         layout = QVBoxLayout(self)
@@ -92,6 +107,39 @@ class ReplayTab(QWidget):
         restart_layout.addStretch()
         self.replay_options_layout.addLayout(restart_layout)
         
+        # Merge save requests
+        merge_layout = QHBoxLayout()
+        self.merge_label = QLabel("Merge Saves Within:")
+        self.merge_spinbox = QSpinBox()
+        self.merge_spinbox.setRange(0, 10000)
+        self.merge_spinbox.setSingleStep(100)
+        self.merge_spinbox.setSuffix(" ms")
+        self.merge_spinbox.setSpecialValueText("Off")
+        self.merge_spinbox.setToolTip(
+            "Saves are sent to the recorder one at a time. Pressing Save Replay again this soon "
+            "after the last press saves one clip instead of two overlapping ones."
+        )
+        self.merge_spinbox.setValue(int(self.settings.value("replay/save_merge_ms", 500)))
+        
+        merge_layout.addWidget(self.merge_label)
+        merge_layout.addWidget(self.merge_spinbox)
+        merge_layout.addStretch()
+        self.replay_options_layout.addLayout(merge_layout)
+        
+        # Pre-warm
+        prewarm_layout = QHBoxLayout()
+        self.prewarm_checkbox = QCheckBox("Keep Replay Buffer Ready in Background")
+        self.prewarm_checkbox.setToolTip(
+            "Starts the replay buffer ahead of time so it is active the moment you press Start. "
+            "Saved clips may then include footage from before Start was pressed. "
+            "Portal capture is only pre-warmed with 'Restore Portal Session' enabled."
+        )
+        self.prewarm_checkbox.setChecked(self.settings.value("replay/prewarm", False, type=bool))
+        
+        prewarm_layout.addWidget(self.prewarm_checkbox)
+        prewarm_layout.addStretch()
+        self.replay_options_layout.addLayout(prewarm_layout)
+        
         # Date folders
         date_folders_layout = QHBoxLayout()
         self.date_folders_checkbox = QCheckBox("Organize Replays in Date Folders")
@@ -143,12 +191,41 @@ class ReplayTab(QWidget):
         script_path_layout.addWidget(self.script_path_btn)
         self.post_processing_layout.addLayout(script_path_layout)
         
+        # Job queue limits
+        self.job_options_layout = QFormLayout()
+        self.concurrency_spinbox = QSpinBox()
+        self.concurrency_spinbox.setRange(1, 8)
+        self.concurrency_spinbox.setSuffix(" at a time")
+        self.concurrency_spinbox.setValue(int(self.settings.value("post_processing/concurrency", 1)))
+        self.nice_spinbox = QSpinBox()
+        self.nice_spinbox.setRange(0, 19)
+        self.nice_spinbox.setToolTip("nice level, 19 is the lowest CPU priority")
+        self.nice_spinbox.setValue(int(self.settings.value("post_processing/nice", 10)))
+        self.idle_io_checkbox = QCheckBox("Idle disk priority (ionice)")
+        self.idle_io_checkbox.setChecked(self.settings.value("post_processing/idle_io", True, type=bool))
+        self.timeout_spinbox = QSpinBox()
+        self.timeout_spinbox.setRange(0, 86400)
+        self.timeout_spinbox.setSuffix(" s")
+        self.timeout_spinbox.setSpecialValueText("No limit")
+        self.timeout_spinbox.setValue(int(self.settings.value("post_processing/timeout", 300)))
+        self.retries_spinbox = QSpinBox()
+        self.retries_spinbox.setRange(0, 5)
+        self.retries_spinbox.setValue(int(self.settings.value("post_processing/retries", 1)))
+        
+        self.job_options_layout.addRow("Run Jobs:", self.concurrency_spinbox)
+        self.job_options_layout.addRow("CPU Priority:", self.nice_spinbox)
+        self.job_options_layout.addRow("", self.idle_io_checkbox)
+        self.job_options_layout.addRow("Timeout:", self.timeout_spinbox)
+        self.job_options_layout.addRow("Retries:", self.retries_spinbox)
+        self.post_processing_layout.addLayout(self.job_options_layout)
+        
         # Script info
         script_info_layout = QHBoxLayout()
         script_info_label = QLabel(
             "The script will be called with two arguments:\n"
             "1. Path to the saved video file\n"
-            "2. Recording type ('replay')"
+            "2. Recording type ('replay')\n"
+            "Jobs are queued and shown in the Jobs tab."
         )
         script_info_label.setWordWrap(True)
         script_info_layout.addWidget(script_info_label)
@@ -190,6 +267,9 @@ class ReplayTab(QWidget):
         self.script_path_label.setEnabled(enabled)
         self.script_path_edit.setEnabled(enabled)
         self.script_path_btn.setEnabled(enabled)
+        for widget in (self.concurrency_spinbox, self.nice_spinbox, self.idle_io_checkbox,
+                       self.timeout_spinbox, self.retries_spinbox):
+            widget.setEnabled(enabled)
     
     def browse_output_dir(self):
         """Open file dialog to select output directory"""
@@ -231,6 +311,8 @@ class ReplayTab(QWidget):
         self.settings.setValue("replay/enabled", self.enable_replay_checkbox.isChecked())
         self.settings.setValue("replay/buffer_size", self.buffer_spinbox.value())
         self.settings.setValue("replay/restart_on_save", self.restart_checkbox.isChecked())
+        self.settings.setValue("replay/prewarm", self.prewarm_checkbox.isChecked())
+        self.settings.setValue("replay/save_merge_ms", self.merge_spinbox.value())
         self.settings.setValue("replay/date_folders", self.date_folders_checkbox.isChecked())
         self.settings.setValue("replay/output_dir", self.output_dir_edit.text())
         self.settings.setValue("replay/container", self.get_container_format())
@@ -238,34 +320,27 @@ class ReplayTab(QWidget):
         # Post-processing settings
         self.settings.setValue("post_processing/enabled", self.script_enabled_checkbox.isChecked())
         self.settings.setValue("post_processing/script", self.script_path_edit.text())
+        self.settings.setValue("post_processing/concurrency", self.concurrency_spinbox.value())
+        self.settings.setValue("post_processing/nice", self.nice_spinbox.value())
+        self.settings.setValue("post_processing/idle_io", self.idle_io_checkbox.isChecked())
+        self.settings.setValue("post_processing/timeout", self.timeout_spinbox.value())
+        self.settings.setValue("post_processing/retries", self.retries_spinbox.value())
     
-    def build_command(self):
-        """Generate command line arguments for gpu-screen-recorder in replay mode"""
-        if not self.enable_replay_checkbox.isChecked():
-            return []
-        
-        command = []
-        
-        # Replay buffer size
-        command.extend(["-r", str(self.buffer_spinbox.value())])
-        
-        # Container format is required for replay mode
-        container_format = self.get_container_format()
-        command.extend(["-c", container_format])
-        
-        # Restart replay on save
-        command.extend(["-restart-replay-on-save", 
-                       "yes" if self.restart_checkbox.isChecked() else "no"])
-        
-        # Date folders
-        if self.date_folders_checkbox.isChecked():
-            command.extend(["-df", "yes"])
-        
-        # Script
-        if self.script_enabled_checkbox.isChecked() and self.script_path_edit.text():
-            command.extend(["-sc", self.script_path_edit.text()])
-        
-        # Output path
-        command.extend(["-o", self.output_dir_edit.text()])
-        
-        return command
\ No newline at end of file
+    def update_config(self):
+        """Copy the widget values into the recorder config"""
+        config = self.config
+        config.replay_enabled = self.enable_replay_checkbox.isChecked()
+        config.replay_buffer_size = self.buffer_spinbox.value()
+        config.replay_container = self.get_container_format()
+        config.replay_restart_on_save = self.restart_checkbox.isChecked()
+        config.replay_prewarm = self.prewarm_checkbox.isChecked()
+        config.replay_save_merge_ms = self.merge_spinbox.value()
+        config.replay_date_folders = self.date_folders_checkbox.isChecked()
+        config.replay_output_dir = self.output_dir_edit.text()
+        config.post_processing_enabled = self.script_enabled_checkbox.isChecked()
+        config.post_processing_script = self.script_path_edit.text()
+        config.post_processing_concurrency = self.concurrency_spinbox.value()
+        config.post_processing_nice = self.nice_spinbox.value()
+        config.post_processing_idle_io = self.idle_io_checkbox.isChecked()
+        config.post_processing_timeout = self.timeout_spinbox.value()
+        config.post_processing_retries = self.retries_spinbox.value()
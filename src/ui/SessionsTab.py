@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from PyQt6.QtCore import Qt, QTimer
+from PyQt6.QtGui import QFontDatabase
+from PyQt6.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QFormLayout, QPushButton, QLabel,
+    QListWidget, QListWidgetItem, QPlainTextEdit, QDialog, QDialogButtonBox,
+    QLineEdit, QComboBox, QGroupBox, QMessageBox
+)
+
+class SessionsTab(QWidget):
+    def __init__(self, sessions, sources=None):
+        super().__init__()
+        self.sessions = sessions
+        self.sources = sources or []
+        self.init_ui()
+
+        self.sessions.sessions_changed.connect(self.refresh_list)
+        self.sessions.session_state_changed.connect(self.update_session)
+        self.sessions.session_line.connect(self.on_session_line)
+
+        # The log view is redrawn at most this often while a session is chatty,
+        # the timer only runs after a new line for the visible log
+        self.log_dirty = False
+        self.log_timer = QTimer(self)
+        self.log_timer.setSingleShot(True)
+        self.log_timer.setInterval(500)
+        self.log_timer.timeout.connect(self.refresh_log)
+
+        self.refresh_list()
+
+    def init_ui(self):
+        layout = QVBoxLayout(self)
+
+        info_label = QLabel(
+            "Extra recorders that run next to the main one, e.g. one replay buffer per monitor. "
+            "They use the settings from the other tabs, with their own source and output folder."
+        )
+        info_label.setWordWrap(True)
+        layout.addWidget(info_label)
+
+        # Session list
+        self.session_list = QListWidget()
+        self.session_list.currentItemChanged.connect(self.on_selection_changed)
+        layout.addWidget(self.session_list)
+
+        # Buttons
+        button_layout = QHBoxLayout()
+        self.add_btn = QPushButton("Add...")
+        self.add_btn.clicked.connect(self.add_session)
+        self.remove_btn = QPushButton("Remove")
+        self.remove_btn.clicked.connect(self.remove_session)
+        self.toggle_btn = QPushButton("Start")
+        self.toggle_btn.clicked.connect(self.toggle_session)
+        self.save_btn = QPushButton("Save Replay")
+        self.save_btn.clicked.connect(lambda: self.sessions.save_replay(self.selected(), "sessions tab"))
+
+        button_layout.addWidget(self.add_btn)
+        button_layout.addWidget(self.remove_btn)
+        button_layout.addStretch()
+        button_layout.addWidget(self.toggle_btn)
+        button_layout.addWidget(self.save_btn)
+        layout.addLayout(button_layout)
+
+        # Log of the selected session
+        log_group = QGroupBox("Session Log")
+        log_layout = QVBoxLayout(log_group)
+        self.log_view = QPlainTextEdit()
+        self.log_view.setReadOnly(True)
+        self.log_view.setMaximumBlockCount(2000)
+        self.log_view.setFont(QFontDatabase.systemFont(QFontDatabase.SystemFont.FixedFont))
+        log_layout.addWidget(self.log_view)
+        layout.addWidget(log_group)
+
+        self.update_buttons()
+
+    def selected(self):
+        item = self.session_list.currentItem()
+        return item.data(Qt.ItemDataRole.UserRole) if item else None
+
+    def describe(self, session):
+        mode = "Replay" if session.replay_mode else "Record"
+        source = session.overrides.get("source", "same as main")
+        return f"{session.name}  [{session.state_name()}]  {mode}, {source}"
+
+    def refresh_list(self):
+        current = self.selected()
+        self.session_list.clear()
+        for session in self.sessions.sessions.values():
+            item = QListWidgetItem(self.describe(session))
+            item.setData(Qt.ItemDataRole.UserRole, session.name)
+            self.session_list.addItem(item)
+            if session.name == current:
+                self.session_list.setCurrentItem(item)
+        self.update_buttons()
+
+    def update_session(self, name):
+        """Redraw one row after its state changed"""
+        for row in range(self.session_list.count()):
+            item = self.session_list.item(row)
+            if item.data(Qt.ItemDataRole.UserRole) == name:
+                item.setText(self.describe(self.sessions.get(name)))
+        if name == self.selected():
+            self.update_buttons()
+
+    def update_buttons(self):
+        name = self.selected()
+        session = self.sessions.sessions.get(name) if name else None
+        controller = session.controller if session else None
+        recording = controller is not None and controller.is_recording
+        finalizing = controller is not None and controller.is_finalizing
+        self.remove_btn.setEnabled(session is not None)
+        self.toggle_btn.setEnabled(session is not None and not finalizing)
+        self.toggle_btn.setText("Stop" if recording else "Start")
+        self.save_btn.setEnabled(recording and session.replay_mode)
+
+    def on_selection_changed(self, current, previous):
+        self.update_buttons()
+        self.log_dirty = True
+        self.refresh_log()
+
+    def on_session_line(self, name, text):
+        if name == self.selected():
+            self.log_dirty = True
+            if self.isVisible() and not self.log_timer.isActive():
+                self.log_timer.start()
+
+    def showEvent(self, event):
+        # Lines that came in while hidden
+        super().showEvent(event)
+        self.refresh_log()
+
+    def refresh_log(self):
+        if not self.log_dirty or not self.isVisible():
+            return
+        self.log_dirty = False
+        name = self.selected()
+        session = self.sessions.sessions.get(name) if name else None
+        self.log_view.setPlainText("\n".join(session.log) if session else "")
+        self.log_view.verticalScrollBar().setValue(self.log_view.verticalScrollBar().maximum())
+
+    def toggle_session(self):
+        name = self.selected()
+        if not name:
+            return
+        try:
+            self.sessions.toggle(name)
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Cannot start {name}: {e}")
+        self.update_session(name)
+
+    def remove_session(self):
+        name = self.selected()
+        if name:
+            self.sessions.remove(name)
+
+    def add_session(self):
+        """Ask for a name, source, mode and (optionally) output folder"""
+        dialog = QDialog(self)
+        dialog.setWindowTitle("Add Session")
+        form = QFormLayout(dialog)
+
+        name_edit = QLineEdit()
+        source_combo = QComboBox()
+        source_combo.setEditable(True)
+        source_combo.addItems(["screen", "focused", "portal"] + list(self.sources))
+        mode_combo = QComboBox()
+        mode_combo.addItems(["Replay Buffer", "Recording"])
+        output_edit = QLineEdit()
+        output_edit.setPlaceholderText("Default: a folder named after the session")
+
+        form.addRow("Name:", name_edit)
+        form.addRow("Source:", source_combo)
+        form.addRow("Mode:", mode_combo)
+        form.addRow("Output Folder:", output_edit)
+        buttons = QDialogButtonBox(QDialogButtonBox.StandardButton.Ok | QDialogButtonBox.StandardButton.Cancel)
+        buttons.accepted.connect(dialog.accept)
+        buttons.rejected.connect(dialog.reject)
+        form.addRow(buttons)
+
+        if dialog.exec() != QDialog.DialogCode.Accepted:
+            return
+
+        replay_mode = mode_combo.currentIndex() == 0
+        overrides = {"source": source_combo.currentText().split(" (")[0]}
+        if output_edit.text():
+            overrides["replay_output_dir" if replay_mode else "output_path"] = output_edit.text()
+        try:
+            self.sessions.add(name_edit.text(), replay_mode, overrides)
+        except ValueError as e:
+            QMessageBox.warning(self, "Add Session", str(e))
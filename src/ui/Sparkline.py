@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from PyQt6.QtCore import Qt, QPointF, QSize
+from PyQt6.QtGui import QPainter, QPen, QPolygonF
+from PyQt6.QtWidgets import QWidget
+
+class Sparkline(QWidget):
+    """
+    Small line chart for the status bar. Draws the values of one series as
+    a line and a second one (e.g. the average) as a dashed line, both scaled
+    to the largest value shown.
+    """
+
+    def __init__(self, width=120, parent=None):
+        super().__init__(parent)
+        self.line_width = width
+        self.values = []
+        self.reference = []
+        self.setMinimumWidth(width)
+
+    def sizeHint(self):
+        return QSize(self.line_width, self.fontMetrics().height())
+
+    def set_values(self, values, reference=None):
+        """
+        Replace the series shown.
+
+        Args:
+            values (list): Main series, oldest first
+            reference (list): Second series drawn dashed, same length (optional)
+        """
+        self.values = values
+        self.reference = reference or []
+        self.update()
+
+    def clear(self):
+        self.set_values([])
+
+    def paintEvent(self, event):
+        if len(self.values) < 2:
+            return
+        top = max(max(self.values), max(self.reference, default=0)) or 1
+        rect = self.rect().adjusted(1, 2, -1, -2)
+        step = rect.width() / (len(self.values) - 1)
+
+        def polygon(values):
+            return QPolygonF([
+                QPointF(rect.left() + i * step, rect.bottom() - value / top * rect.height())
+                for i, value in enumerate(values)
+            ])
+
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        color = self.palette().windowText().color()
+        if len(self.reference) == len(self.values):
+            color.setAlpha(120)
+            painter.setPen(QPen(color, 1, Qt.PenStyle.DashLine))
+            painter.drawPolyline(polygon(self.reference))
+        painter.setPen(QPen(self.palette().highlight().color(), 1.5))
+        painter.drawPolyline(polygon(self.values))
@@ -1,14 +1,5 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
-from .RecordTab import RecordTab
-from .ReplayTab import ReplayTab
-from .AdvancedTab import AdvancedTab
-from .LogTab import LogTab
-
-__all__ = [
-    'RecordTab',
-    'ReplayTab',
-    'AdvancedTab',
-    'LogTab'
-]
\ No newline at end of file
+# Tabs are imported from their modules (e.g. from .ui.RecordTab import RecordTab)
+# when first shown, so importing the package must not load any of them